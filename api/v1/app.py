@@ -3,13 +3,30 @@
 This sets up the app for the api of the project
 """
 from flask import Flask, Blueprint, request, make_response, jsonify
+from flask.json.provider import JSONProvider
 from os import getenv
 from models import storage
+from models.engine import codec
 from api.v1.views import app_views
+from api.v1.compression import compress
 from flask_cors import CORS
 
 
+class CodecJSONProvider(JSONProvider):
+    """ Encodes and decodes the JSON of the app with the codec of the
+    models, orjson when it is installed """
+
+    def dumps(self, obj, **kwargs):
+        """ Returns the JSON text of obj, with sorted keys """
+        return codec.dumps(obj, sort_keys=True)
+
+    def loads(self, s, **kwargs):
+        """ Returns the object of the JSON text s """
+        return codec.loads(s)
+
+
 app = Flask(__name__)
+app.json = CodecJSONProvider(app)
 app.register_blueprint(app_views, url_prefix="/api/v1")
 CORS(app, resources={r"/api/*": {"origins": "0.0.0.0"}})
 
@@ -25,6 +42,13 @@ def error_404(error):
         return error
 
 
+@app.after_request
+def compress_response(response):
+    """ Compresses the response in the content coding the client
+    accepts """
+    return compress(response)
+
+
 @app.teardown_appcontext
 def remove_session(exception):
     """ Ends a session """
@@ -0,0 +1,111 @@
+#!/usr/bin/python3
+"""
+Compression of the API responses: the content coding is negotiated from
+Accept-Encoding, small bodies are sent as they are, and large ones are
+compressed chunk by chunk as they are sent
+"""
+from flask import request
+from os import getenv
+import zlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# bodies smaller than this many bytes are not worth compressing
+min_size = int(getenv("HBNB_COMPRESS_MIN_SIZE") or 1024)
+# bodies of this many bytes or more are streamed: compressed and sent one
+# chunk at a time, without a Content-Length, instead of all at once
+stream_size = int(getenv("HBNB_COMPRESS_STREAM_SIZE") or 1024 * 1024)
+# bytes of the body compressed at a time when streaming
+chunk_size = 64 * 1024
+# compression level: 1 (fastest) to 9 (smallest) for gzip and deflate, and
+# the quality, 0 to 11, of brotli
+level = int(getenv("HBNB_COMPRESS_LEVEL") or 6)
+# media types compressed, the text/ ones included
+compressible = ("application/json", "application/javascript")
+
+
+class BrotliCompressor:
+    """A brotli compressor with the compress()/flush() methods of the
+    zlib ones"""
+
+    def __init__(self, quality):
+        """creates a compressor of quality"""
+        self.compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data):
+        """returns the compressed bytes of data ready so far"""
+        return self.compressor.process(data)
+
+    def flush(self):
+        """returns the rest of the compressed bytes"""
+        return self.compressor.finish()
+
+
+# content coding -> function of the level returning a new compressor, in
+# the order of preference among those a client accepts equally
+codings = {"gzip": lambda level: zlib.compressobj(level, zlib.DEFLATED, 31),
+           "deflate": lambda level: zlib.compressobj(level)}
+if brotli is not None:
+    codings = dict({"br": lambda level: BrotliCompressor(min(level, 11))},
+                   **codings)
+
+
+def negotiate(accept_encodings):
+    """returns the content coding of codings the Accept-Encoding values
+    prefer, or None for the identity coding"""
+    return accept_encodings.best_match(list(codings))
+
+
+def chunks(data, size):
+    """yields data size bytes at a time"""
+    view = memoryview(data)
+    for start in range(0, len(view), size):
+        yield view[start:start + size]
+
+
+def stream(body, compressor):
+    """yields the compressed bytes of the chunks of body as they come"""
+    for chunk in body:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def compress(response):
+    """ Compresses the body of response with the content coding the request
+    accepts, when its type is compressible and it is at least min_size
+    bytes; streams it when it is stream_size bytes or more """
+    mimetype = response.mimetype or ""
+    if not (mimetype.startswith("text/") or mimetype in compressible) or \
+            response.status_code < 200 or \
+            response.status_code in (204, 206, 304) or \
+            "Content-Encoding" in response.headers or \
+            response.direct_passthrough:
+        return response
+    response.vary.add("Accept-Encoding")
+    coding = negotiate(request.accept_encodings)
+    if coding is None:
+        return response
+    if response.is_streamed:
+        body = response.iter_encoded()
+    else:
+        data = response.get_data()
+        if len(data) < min_size:
+            return response
+        body = chunks(data, chunk_size)
+    compressor = codings[coding](level)
+    if response.is_streamed or len(data) >= stream_size:
+        response.response = stream(body, compressor)
+        response.headers.pop("Content-Length", None)
+    else:
+        response.set_data(compressor.compress(data) + compressor.flush())
+    response.headers["Content-Encoding"] = coding
+    # the compressed bytes differ, the representation does not
+    etag, weak = response.get_etag()
+    if etag is not None and not weak:
+        response.set_etag(etag, weak=True)
+    return response
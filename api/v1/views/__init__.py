@@ -2,10 +2,125 @@
 """
 Views for the api of the project
 """
-from flask import Blueprint
+from datetime import timezone
+from flask import Blueprint, abort, current_app, jsonify, make_response
+from flask import request
+from functools import wraps
+from hashlib import sha1
+from models import storage
+from models.engine.cache import LRUCache
+from os import getenv
+from urllib.parse import urlencode
 
 app_views = Blueprint("app_views", __name__)
 
+# largest page a list view returns, and its size when no limit is given
+max_limit = int(getenv("HBNB_API_MAX_LIMIT") or 1000)
+
+# rendered responses of the cached GET views: (path with its query string,
+# ETag) -> (body, status, headers); a write changes the ETag, so the
+# entries it outdates are never read again and age out
+responses = LRUCache(int(getenv("HBNB_API_CACHE_SIZE") or 256),
+                     float(getenv("HBNB_API_CACHE_TTL") or 300))
+
+
+def batched(view):
+    """ Runs a view inside storage.batch(): its saves are flushed once,
+    before the response is returned. If the view aborts, nothing is written:
+    in DB mode the session is rolled back, while in file mode the objects
+    it changed stay changed in memory until the next save writes them, so
+    the views abort before they change anything """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        """ Calls the view in a storage batch """
+        with storage.batch():
+            return view(*args, **kwargs)
+    return wrapper
+
+
+def conditional(*classes, cache=False):
+    """ Makes a GET view conditional on the storage version of the classes
+    it reads: the response carries an ETag and a Last-Modified derived from
+    them, and a request whose If-None-Match or If-Modified-Since still
+    holds gets a 304 without the view being called
+    With cache, the rendered 200 responses are kept in responses and
+    served again until one of the classes changes """
+    def decorator(view):
+        """ Wraps view """
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            """ Answers from the validators or the cache, else calls the
+            view """
+            tags = [request.full_path]
+            modified = None
+            for cls in classes:
+                tag, changed = storage.version(cls)
+                tags.append(tag)
+                if modified is None or changed > modified:
+                    modified = changed
+            etag = sha1("\n".join(tags).encode()).hexdigest()
+            modified = modified.astimezone(timezone.utc).replace(
+                microsecond=0)
+            if request.if_none_match:
+                fresh = request.if_none_match.contains_weak(etag)
+            else:
+                since = request.if_modified_since
+                fresh = since is not None and modified <= since
+            if fresh:
+                response = current_app.response_class(status=304)
+            else:
+                key = (request.full_path, etag)
+                cached = responses.get(key) if cache else None
+                if cached is not None:
+                    response = current_app.response_class(*cached)
+                else:
+                    response = make_response(view(*args, **kwargs))
+                    if cache and response.status_code == 200:
+                        responses.put(key, (response.get_data(),
+                                            response.status_code,
+                                            list(response.headers)))
+            response.set_etag(etag)
+            response.last_modified = modified
+            return response
+        return wrapper
+    return decorator
+
+
+def page_params():
+    """ Returns the (cursor, limit) of a list request, or None when it has
+    neither a limit nor a cursor query parameter and wants the whole list """
+    if "limit" not in request.args and "cursor" not in request.args:
+        return None
+    try:
+        limit = int(request.args.get("limit", max_limit))
+    except ValueError:
+        abort(400, description="Invalid limit")
+    if limit < 1:
+        abort(400, description="Invalid limit")
+    return request.args.get("cursor"), min(limit, max_limit)
+
+
+def page_response(objs, limit):
+    """ Returns the JSON list of the first limit objects of objs, with a
+    Link header to the next page when objs holds more of them """
+    response = jsonify([obj.to_dict(native=True) for obj in objs[:limit]])
+    if len(objs) > limit:
+        args = request.args.to_dict()
+        args.update(cursor=objs[limit - 1].id, limit=limit)
+        response.headers["Link"] = '<{}?{}>; rel="next"'.format(
+            request.base_url, urlencode(args))
+    return response, 200
+
+
+def paginate(cls, **predicates):
+    """ Returns the response of the page of cls objects asked for by the
+    request, read from storage in id order after the cursor id; predicates
+    keep only the matching objects, as in storage.filter() """
+    cursor, limit = page_params()
+    return page_response(storage.page(cls, cursor, limit + 1, **predicates),
+                         limit)
+
+
 from api.v1.views.index import *
 from api.v1.views.states import *
 from api.v1.views.cities import *
@@ -14,3 +129,4 @@ from api.v1.views.places import *
 from api.v1.views.places_reviews import *
 from api.v1.views.places_amenities import *
 from api.v1.views.users import *
+from api.v1.views.search import *
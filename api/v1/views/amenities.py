@@ -2,28 +2,33 @@
 """ A view for Amenity objects that handles
 all default RESTFul API actions
 """
-from api.v1.views import app_views
+from api.v1.views import app_views, batched, conditional, page_params
+from api.v1.views import paginate
 from models.amenity import Amenity
 from models import storage
 from flask import abort, request, jsonify
 
 
 @app_views.route("/amenities", methods=["GET"], strict_slashes=False)
+@conditional(Amenity, cache=True)
 def get_amenities():
     """
     Retrieves the list of all Amenity objects:
     GET /api/v1/amenities
     """
+    if page_params():
+        return paginate(Amenity)
     all_amenities = storage.all(Amenity)
     amenities_list = []
     for amenity in all_amenities.values():
-        amenities_list.append(amenity.to_dict())
+        amenities_list.append(amenity.to_dict(native=True))
 
     return jsonify(amenities_list), 200
 
 
 @app_views.route("/amenities/<amenity_id>",
                  methods=["GET"], strict_slashes=False)
+@conditional(Amenity)
 def get_amenity(amenity_id):
     """
     Retrieves a Amenity object: GET /api/v1/amenities/<amenity_id>
@@ -31,12 +36,13 @@ def get_amenity(amenity_id):
     amenity = storage.get(Amenity, amenity_id)
     if amenity is None:
         abort(404)
-    amenity_dict = amenity.to_dict()
+    amenity_dict = amenity.to_dict(native=True)
     return jsonify(amenity_dict), 200
 
 
 @app_views.route("/amenities/<amenity_id>",
                  methods=["DELETE"], strict_slashes=False)
+@batched
 def delete_amenity(amenity_id):
     """
     Deletes a Amenity object:: DELETE /api/v1/amenities/<amenity_id>
@@ -51,6 +57,7 @@ def delete_amenity(amenity_id):
 
 
 @app_views.route("/amenities", methods=["POST"], strict_slashes=False)
+@batched
 def create_amenity():
     """
     Creates a Amenity: POST /api/v1/amenities
@@ -64,12 +71,13 @@ def create_amenity():
 
     new_amenity = Amenity(**response)
     new_amenity.save()
-    new_amenity_dict = new_amenity.to_dict()
+    new_amenity_dict = new_amenity.to_dict(native=True)
     return jsonify(new_amenity_dict), 201
 
 
 @app_views.route("/amenities/<amenity_id>",
                  methods=["PUT"], strict_slashes=False)
+@batched
 def update_amenity(amenity_id):
     """
     Updates a Amenity object: PUT /api/v1/amenities/<amenity_id>
@@ -89,5 +97,5 @@ def update_amenity(amenity_id):
         if key not in attr_list:
             setattr(amenity, key, data)
     amenity.save()
-    amenity_dict = amenity.to_dict()
+    amenity_dict = amenity.to_dict(native=True)
     return jsonify(amenity_dict), 200
@@ -14,13 +14,15 @@ from flask import Flask, jsonify, abort, request
 from models.state import State
 from models.city import City
 from models import storage
-from api.v1.views import app_views
+from api.v1.views import app_views, batched, conditional, page_params
+from api.v1.views import paginate
 
 app = Flask(__name__)
 
 
 @app_views.route("/states/<state_id>/cities/", methods=['GET'],
                  strict_slashes=False)
+@conditional(State, City, cache=True)
 def get_cities_by_state(state_id):
     """ Get list of cities in state by state_id"""
     # Use the get method to get states based on state_id
@@ -30,12 +32,17 @@ def get_cities_by_state(state_id):
     if state is None:
         abort(404)
 
-    cities = [city.to_dict() for city in state.cities]
+    # One page of the cities when asked for with limit/cursor
+    if page_params():
+        return paginate(City, state_id=state.id)
+
+    cities = [city.to_dict(native=True) for city in state.cities]
     return jsonify(cities)
 
 
 @app_views.route("/cities/<city_id>", methods=['GET'],
                  strict_slashes=False)
+@conditional(City)
 def get_cities_by_id(city_id):
     """Gets a city by City id"""
     # Get city with get method in storage
@@ -45,11 +52,12 @@ def get_cities_by_id(city_id):
     if not city:
         abort(404)
 
-    return jsonify(city.to_dict())
+    return jsonify(city.to_dict(native=True))
 
 
 @app_views.route("/cities/<city_id>", methods=['DELETE'],
                  strict_slashes=False)
+@batched
 def delete_city_by_id(city_id):
     """Deletes a City object by City id"""
     # Get city objects with get method
@@ -68,6 +76,7 @@ def delete_city_by_id(city_id):
 
 @app_views.route("/states/<state_id>/cities/", methods=['POST'],
                  strict_slashes=False)
+@batched
 def create_city_in_state(state_id):
     """Creates a city in a state bu state id"""
     # Get state object by id using storeage.get() method
@@ -94,11 +103,12 @@ def create_city_in_state(state_id):
     storage.save()
 
     # Return the new City with the status code 201
-    return jsonify(new_city.to_dict()), 201
+    return jsonify(new_city.to_dict(native=True)), 201
 
 
 @app_views.route("/cities/<city_id>", methods=['PUT'],
                  strict_slashes=False)
+@batched
 def update_city(city_id):
     """Updates a City object"""
     city = storage.get(City, city_id)
@@ -115,4 +125,4 @@ def update_city(city_id):
             setattr(city, key, value)
 
     storage.save()
-    return jsonify(city.to_dict()), 200
+    return jsonify(city.to_dict(native=True)), 200
@@ -12,6 +12,10 @@ from models.state import State
 from models.user import User
 from models import storage
 
+# key of the count of each class in the /stats response
+stats_keys = {"amenities": Amenity, "cities": City, "places": Place,
+              "reviews": Review, "states": State, "users": User}
+
 
 @app_views.route("/status", strict_slashes=False)
 def status():
@@ -23,11 +27,8 @@ def status():
 @app_views.route("/stats", strict_slashes=False)
 def stats():
     """ Endpoint that retrieves the number of each objects by type """
+    counts = storage.counts()
     object_counts = {}
-    object_counts["amenities"] = storage.count(Amenity)
-    object_counts["cities"] = storage.count(City)
-    object_counts["places"] = storage.count(Place)
-    object_counts["reviews"] = storage.count(Review)
-    object_counts["states"] = storage.count(State)
-    object_counts["users"] = storage.count(User)
+    for key, cls in stats_keys.items():
+        object_counts[key] = counts.get(cls.__name__, 0)
     return (object_counts)
@@ -2,18 +2,22 @@
 """ A view for Place objects that handles
 all default RESTFul API actions
 """
-from api.v1.views import app_views
+from api.v1.views import app_views, batched, page_params, page_response
+from api.v1.views import conditional, max_limit, paginate
 from models.state import State
 from models.amenity import Amenity
 from models.city import City
 from models.place import Place
 from models.user import User
 from models import storage
+from models.engine.geo import coordinates
+from models.engine.search import PlaceSearch
 from flask import abort, request, jsonify
 
 
 @app_views.route("/cities/<city_id>/places",
                  methods=["GET"], strict_slashes=False)
+@conditional(City, Place, cache=True)
 def get_places(city_id):
     """
     Retrieves the list of all Place objects of a City:
@@ -22,13 +26,46 @@ def get_places(city_id):
     city = storage.get(City, city_id)
     if city is None:
         abort(404)
+    if page_params():
+        return paginate(Place, city_id=city.id)
     places = city.places
-    places_list = [place.to_dict() for place in places]
+    places_list = [place.to_dict(native=True) for place in places]
+    return jsonify(places_list), 200
+
+
+@app_views.route("/places/nearby", methods=["GET"], strict_slashes=False)
+@conditional(Place, cache=True)
+def get_places_nearby():
+    """
+    Retrieves the k Place objects nearest to a point, closest first, each
+    with its distance_km:
+    GET /api/v1/places/nearby?lat=<lat>&lng=<lng>[&k=<k>][&radius_km=<km>]
+    """
+    point = coordinates(request.args.get("lat"), request.args.get("lng"))
+    if point is None:
+        abort(400, description="Invalid lat or lng")
+    try:
+        k = int(request.args.get("k", 10))
+        radius_km = request.args.get("radius_km")
+        if radius_km is not None:
+            radius_km = float(radius_km)
+    except ValueError:
+        abort(400, description="Invalid k or radius_km")
+    if k < 1 or (radius_km is not None and not radius_km >= 0):
+        abort(400, description="Invalid k or radius_km")
+
+    places_list = []
+    for distance, place in storage.nearest(*point, min(k, max_limit),
+                                           radius_km):
+        place_dict = place.to_dict(native=True)
+        place_dict["distance_km"] = round(distance, 3)
+        places_list.append(place_dict)
     return jsonify(places_list), 200
 
 
 @app_views.route("/places/<place_id>",
                  methods=["GET"], strict_slashes=False)
+@conditional(Place)
 def get_place(place_id):
     """
     Retrieves a Place object. : GET /api/v1/places/<place_id>
@@ -36,11 +73,12 @@ def get_place(place_id):
     place = storage.get(Place, place_id)
     if place is None:
         abort(404)
-    return jsonify(place.to_dict()), 200
+    return jsonify(place.to_dict(native=True)), 200
 
 
 @app_views.route("/places/<place_id>",
                  methods=["DELETE"], strict_slashes=False)
+@batched
 def delete_place(place_id):
     """
     Deletes a Place object: DELETE /api/v1/places/<place_id>
@@ -56,6 +94,7 @@ def delete_place(place_id):
 
 @app_views.route("/cities/<city_id>/places", methods=["POST"],
                  strict_slashes=False)
+@batched
 def create_place(city_id):
     """
     Creates a Place: POST /api/v1/cities/<city_id>/places
@@ -82,11 +121,12 @@ def create_place(city_id):
     response["city_id"] = city_id
     place = Place(**response)
     place.save()
-    return jsonify(place.to_dict()), 201
+    return jsonify(place.to_dict(native=True)), 201
 
 
 @app_views.route("/places/<place_id>",
                  methods=["PUT"], strict_slashes=False)
+@batched
 def update_place(place_id):
     """
     Updates a Place object: PUT /api/v1/places/<place_id>
@@ -104,7 +144,7 @@ def update_place(place_id):
         if key not in attr_list:
             setattr(place, key, data)
     place.save()
-    return jsonify(place.to_dict()), 200
+    return jsonify(place.to_dict(native=True)), 200
 
 
 @app_views.route("/places_search/", methods=['POST'], strict_slashes=False)
@@ -114,46 +154,35 @@ def places_search():
     - states: list of State ids
     - cities: list of City ids
     - amenities: list of Amenity ids
+    and 2 optional areas:
+    - bbox: [south, west, north, east] in degrees
+    - near: [latitude, longitude] with radius_km: distance in km
+    optional bounds, both included:
+    - min_price, max_price, min_guests, max_guests, min_rooms, max_rooms,
+      min_bathrooms, max_bathrooms
+    and an optional order instead of the id one, reversed by a leading "-":
+    - sort: price, guests, rooms or bathrooms
     """
 
-    data = request.get_json()
+    data = request.get_json(silent=True)
 
     # Checks if data is JSON
-    if not data:
+    if not isinstance(data, dict):
         abort(400, 'Not a JSON')
 
-    places = []
-
-    states_ids = data.get("states", [])
-    cities_ids = data.get("cities", [])
-    amenities_ids = data.get("amenities", [])
-
-    # Checks if JSON keys has states, cities and/or amenities
-    # Retrieves all places if not
-    if not all(key in data for key in ["states", "cities", "amenities"]):
-        places = storage.all(Place).values()
-
-    else:
-        # Retrieve places based on states
-        for state_id in states_ids:
-            state = storage.get(State, state_id)
-            if state:
-                places.append(state.cities)
-
-        # Retrieve places based on cities
-        for city_id in cities_ids:
-            city = storage.get(City, city_id)
-            if city:
-                places.append(city.places)
-
-    # Filter places based on amenities
-    if amenities_ids:
-        amenities = [storage.get(Amenity, amenity_id)
-                     for amenity_id in amenities_ids]
-        places = [place for place in places if all(
-                  amenity in place.amenities for amenity in amenities
-                  )]
-
-    places_list = [place.to_dict() for place in places]
+    try:
+        search = PlaceSearch.from_json(data)
+    except ValueError as error:
+        abort(400, str(error))
+
+    # One page of the places, in id order, when asked for with limit/cursor
+    params = page_params()
+    if params:
+        cursor, limit = params
+        return page_response(storage.search(search, cursor, limit + 1),
+                             limit)
+
+    places_list = [place.to_dict(native=True)
+                   for place in storage.search(search)]
 
     return jsonify(places_list), 200
@@ -2,7 +2,7 @@
 """ A view for Place and Amenity objects that handles
 all default RESTFul API actions
 """
-from api.v1.views import app_views
+from api.v1.views import app_views, batched, conditional
 from models.place import Place
 from models.amenity import Amenity
 from models import storage, storage_t
@@ -11,6 +11,7 @@ from flask import abort, request, jsonify
 
 @app_views.route("/places/<place_id>/amenities",
                  methods=["GET"], strict_slashes=False)
+@conditional(Place, Amenity, cache=True)
 def get_amenities_of_a_place(place_id):
     """
     Retrieves the list of all Amenity objects of a Place:
@@ -22,7 +23,8 @@ def get_amenities_of_a_place(place_id):
 
     if storage_t == "db":
         amenities = place.amenities
-        amenities_list = [amenity.to_dict() for amenity in amenities]
+        amenities_list = [amenity.to_dict(native=True)
+                          for amenity in amenities]
         return jsonify(amenities_list), 200
     else:
         amenities_id = place.amenity_ids
@@ -31,6 +33,7 @@ def get_amenities_of_a_place(place_id):
 
 @app_views.route("/places/<place_id>/amenities/<amenity_id>",
                  methods=["DELETE"], strict_slashes=False)
+@batched
 def remove_amenity_from_place(place_id, amenity_id):
     """
     Deletes a Amenity object to a Place:
@@ -53,15 +56,18 @@ def remove_amenity_from_place(place_id, amenity_id):
                 return jsonify({}), 200
         abort(404)
     else:
-        for a_id in place.amenity_ids:
-            if a_id == amenity_id:
-                place.amenity_ids.remove(a_id)
-                return jsonify({}), 200
+        if amenity_id in place.amenity_ids:
+            # reassigned rather than mutated so the change is tracked
+            place.amenity_ids = [a_id for a_id in place.amenity_ids
+                                 if a_id != amenity_id]
+            place.save()
+            return jsonify({}), 200
         abort(404)
 
 
 @app_views.route("/places/<place_id>/amenities/<amenity_id>",
                  methods=["POST"], strict_slashes=False)
+@batched
 def link_amenity_to_place(place_id, amenity_id):
     """
     Link a Amenity object to a Place:
@@ -78,11 +84,13 @@ def link_amenity_to_place(place_id, amenity_id):
     if storage_t == "db":
         for linked_amenity in place.amenities:
             if linked_amenity.id == amenity.id:
-                return jsonify(amenity.to_dict()), 200
+                return jsonify(amenity.to_dict(native=True)), 200
         place.amenities.append(amenity)
-        return jsonify(amenity.to_dict()), 201
+        place.save()
+        return jsonify(amenity.to_dict(native=True)), 201
     else:
         if amenity_id in place.amenity_ids:
-            return jsonify(amenity.to_dict()), 200
-        place.amenity_ids.append(amenity_id)
-        return jsonify(amenity.to_dict()), 201
+            return jsonify(amenity.to_dict(native=True)), 200
+        place.amenity_ids = place.amenity_ids + [amenity_id]
+        place.save()
+        return jsonify(amenity.to_dict(native=True)), 201
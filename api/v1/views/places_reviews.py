@@ -2,7 +2,8 @@
 """ A view for Review objects that handles
 all default RESTFul API actions
 """
-from api.v1.views import app_views
+from api.v1.views import app_views, batched, conditional, page_params
+from api.v1.views import paginate
 from models.place import Place
 from models.review import Review
 from models.user import User
@@ -12,6 +13,7 @@ from flask import abort, request, jsonify
 
 @app_views.route("/places/<place_id>/reviews",
                  methods=["GET"], strict_slashes=False)
+@conditional(Place, Review, cache=True)
 def get_reviews(place_id):
     """
     Retrieves the list of all Review objects of a Place:
@@ -21,15 +23,19 @@ def get_reviews(place_id):
     if place is None:
         abort(404)
 
+    if page_params():
+        return paginate(Review, place_id=place.id)
+
     reviews = place.reviews
     review_list = []
     for review in reviews:
-        review_list.append(review.to_dict())
+        review_list.append(review.to_dict(native=True))
     return jsonify(review_list), 200
 
 
 @app_views.route("/reviews/<review_id>",
                  methods=["GET"], strict_slashes=False)
+@conditional(Review)
 def get_review(review_id):
     """
     Retrieves a Review object. : GET /api/v1/reviews/<review_id>
@@ -37,11 +43,12 @@ def get_review(review_id):
     review = storage.get(Review, review_id)
     if review is None:
         abort(404)
-    return jsonify(review.to_dict()), 200
+    return jsonify(review.to_dict(native=True)), 200
 
 
 @app_views.route("/reviews/<review_id>",
                  methods=["DELETE"], strict_slashes=False)
+@batched
 def delete_review(review_id):
     """
     Deletes a Review object: DELETE /api/v1/reviews/<review_id>
@@ -56,6 +63,7 @@ def delete_review(review_id):
 
 @app_views.route("/places/<place_id>/reviews",
                  methods=["POST"], strict_slashes=False)
+@batched
 def create_review(place_id):
     """
     Creates a Review: POST /api/v1/places/<place_id>/reviews
@@ -82,11 +90,12 @@ def create_review(place_id):
     response["place_id"] = place_id
     new_review = Review(**response)
     new_review.save()
-    return jsonify(new_review.to_dict()), 201
+    return jsonify(new_review.to_dict(native=True)), 201
 
 
 @app_views.route("/reviews/<review_id>",
                  methods=["PUT"], strict_slashes=False)
+@batched
 def update_review(review_id):
     """
     Updates a Review object: PUT /api/v1/reviews/<review_id>
@@ -104,4 +113,4 @@ def update_review(review_id):
         if key not in attr_list:
             setattr(review, key, data)
     review.save()
-    return jsonify(review.to_dict()), 200
+    return jsonify(review.to_dict(native=True)), 200
@@ -0,0 +1,34 @@
+#!/usr/bin/python3
+""" A view for the full-text search of Place and Review objects
+"""
+from api.v1.views import app_views, conditional, max_limit
+from models.place import Place
+from models.review import Review
+from models import storage
+from flask import abort, request, jsonify
+
+
+@app_views.route("/search", methods=["GET"], strict_slashes=False)
+@conditional(Place, Review, cache=True)
+def text_search():
+    """
+    Retrieves the Place and Review objects whose name, description or text
+    best match the words of q, best first, each with its score:
+    GET /api/v1/search?q=<words>[&limit=<limit>]
+    """
+    query = request.args.get("q", "")
+    if not query.strip():
+        abort(400, description="Missing q")
+    try:
+        limit = int(request.args.get("limit", 10))
+    except ValueError:
+        abort(400, description="Invalid limit")
+    if limit < 1:
+        abort(400, description="Invalid limit")
+
+    results = []
+    for score, obj in storage.text_search(query, min(limit, max_limit)):
+        obj_dict = obj.to_dict(native=True)
+        obj_dict["score"] = round(score, 4)
+        results.append(obj_dict)
+    return jsonify(results), 200
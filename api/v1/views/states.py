@@ -2,27 +2,32 @@
 """ A view for State objects that handles
 all default RESTFul API actions
 """
-from api.v1.views import app_views
+from api.v1.views import app_views, batched, conditional, page_params
+from api.v1.views import paginate
 from models.state import State
 from models import storage
 from flask import abort, request, jsonify
 
 
 @app_views.route("/states", methods=["GET"], strict_slashes=False)
+@conditional(State, cache=True)
 def get_states():
     """
     Retrieves the list of all State objects:
         GET /api/v1/states
     """
+    if page_params():
+        return paginate(State)
     all_states = storage.all(State)
     states_list = []
     for state in all_states.values():
-        states_list.append(state.to_dict())
+        states_list.append(state.to_dict(native=True))
     return jsonify(states_list), 200
 
 
 @app_views.route("/states/<state_id>", methods=["GET"],
                  strict_slashes=False)
+@conditional(State)
 def get_state(state_id):
     """
     Retrieves a State object:
@@ -31,12 +36,13 @@ def get_state(state_id):
     state = storage.get(State, state_id)
     if state is None:
         abort(404)
-    state_dict = state.to_dict()
+    state_dict = state.to_dict(native=True)
     return jsonify(state_dict), 200
 
 
 @app_views.route("/states/<state_id>", methods=["DELETE"],
                  strict_slashes=False)
+@batched
 def delete_states(state_id):
     """
     Deletes a State object:
@@ -51,6 +57,7 @@ def delete_states(state_id):
 
 
 @app_views.route("/states", methods=["POST"], strict_slashes=False)
+@batched
 def create_state():
     """ Add new State """
     response = request.get_json()
@@ -62,12 +69,13 @@ def create_state():
 
     new_state = State(**response)
     new_state.save()
-    new_state_dict = new_state.to_dict()
+    new_state_dict = new_state.to_dict(native=True)
     return jsonify(new_state_dict), 201
 
 
 @app_views.route("/states/<state_id>", methods=["PUT"],
                  strict_slashes=False)
+@batched
 def update_state(state_id):
     """ Updates a State object """
     attr_list = ['id', 'created_at', 'updated_at']
@@ -85,5 +93,5 @@ def update_state(state_id):
         if key not in attr_list:
             setattr(state, key, data)
     state.save()
-    state_dict = state.to_dict()
+    state_dict = state.to_dict(native=True)
     return jsonify(state_dict), 200
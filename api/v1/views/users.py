@@ -13,7 +13,8 @@ Creates a User: POST /api/v1/users
 from flask import Flask, jsonify, abort, request
 from models.user import User
 from models import storage
-from api.v1.views import app_views
+from api.v1.views import app_views, batched, conditional, page_params
+from api.v1.views import paginate
 import hashlib
 
 app = Flask(__name__)
@@ -21,8 +22,12 @@ app = Flask(__name__)
 
 @app_views.route("/users/", methods=['GET'],
                  strict_slashes=False)
+@conditional(User, cache=True)
 def get_all_users():
     """ Get list of user in User object"""
+    if page_params():
+        return paginate(User)
+
     # Use the get method to get states based on state_id
     users = storage.all(User)
 
@@ -30,11 +35,12 @@ def get_all_users():
     if users is None:
         abort(404)
 
-    allUser = [eachUser.to_dict() for eachUser in users.values()]
+    allUser = [eachUser.to_dict(native=True) for eachUser in users.values()]
     return jsonify(allUser), 200
 
 
 @app_views.route("/users/<user_id>/", methods=['GET'], strict_slashes=False)
+@conditional(User)
 def get_user(user_id):
     """Retrieves a User object based on user_id)"""
     # Use the get method to get user with user_id
@@ -44,10 +50,11 @@ def get_user(user_id):
     if not user:
         abort(404)
 
-    return jsonify(user.to_dict())
+    return jsonify(user.to_dict(native=True))
 
 
 @app_views.route("/users/<user_id>/", methods=['DELETE'], strict_slashes=False)
+@batched
 def del_user(user_id):
     """Deletes a User object"""
     # Use the get method to get the user with user_id
@@ -65,6 +72,7 @@ def del_user(user_id):
 
 
 @app_views.route("/users/", methods=['POST'], strict_slashes=False)
+@batched
 def create_user():
     """Creates a User and returns the user with a status code of 201"""
     # Get data for new user
@@ -88,10 +96,11 @@ def create_user():
     storage.new(new_user)
     storage.save()
 
-    return jsonify(new_user.to_dict()), 201
+    return jsonify(new_user.to_dict(native=True)), 201
 
 
 @app_views.route("/users/<user_id>", methods=['PUT'], strict_slashes=False)
+@batched
 def update_user(user_id):
     """Updates a User object bu usaer_id"""
     # Use the get method ot get user
@@ -114,4 +123,4 @@ def update_user(user_id):
             setattr(user, key, value)
 
     storage.save()
-    return jsonify(user.to_dict()), 200
+    return jsonify(user.to_dict(native=True)), 200
@@ -0,0 +1,68 @@
+#!/usr/bin/python3
+"""
+Bytes on the wire and CPU time per response of the API compression, for
+JSON lists of places of growing size, in each content coding and level
+Usage: python3 -m benchmarks.bench_compression [numbers of places...]
+"""
+import json
+import random
+import sys
+from time import process_time
+import uuid
+
+
+def places(n):
+    """returns the dicts of n places as the API sends them"""
+    from models.place import Place
+    random.seed(n)
+    words = ["cosy", "loft", "view", "garden", "quiet", "studio", "center",
+             "sea", "bright", "wifi", "parking", "family"]
+    return [Place(city_id=str(uuid.uuid4()), user_id=str(uuid.uuid4()),
+                  name=" ".join(random.sample(words, 3)),
+                  description=" ".join(random.choices(words, k=30)),
+                  number_rooms=random.randint(1, 6),
+                  number_bathrooms=random.randint(1, 3),
+                  max_guest=random.randint(1, 10),
+                  price_by_night=random.randint(20, 400),
+                  latitude=random.uniform(-60, 60),
+                  longitude=random.uniform(-180, 180)).to_dict()
+            for i in range(n)]
+
+
+def per_response(app, data, coding, level):
+    """returns the (bytes sent, CPU milliseconds) of one response of the
+    JSON text data compressed by compress() in coding at level, as the
+    mean of enough runs to compress some 20 MB"""
+    from api.v1 import compression
+    compression.level = level
+    headers = {"Accept-Encoding": coding} if coding else {}
+    runs = max(1, min(200, 20000000 // len(data)))
+    elapsed = 0
+    for i in range(runs):
+        with app.test_request_context(headers=headers):
+            response = app.response_class(data, mimetype="application/json")
+            start = process_time()
+            response = compression.compress(response)
+            sent = sum(len(chunk) for chunk in response.iter_encoded())
+            elapsed += process_time() - start
+    return sent, elapsed / runs * 1000
+
+
+if __name__ == "__main__":
+    from api.v1.app import app
+    from api.v1.compression import codings
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1, 10, 100, 1000, 10000]
+    runs = [(None, 0)] + [(coding, level) for coding in codings
+                          for level in (1, 6, 9)]
+
+    print("{:>8}{:>10}{:>6}{:>12}{:>8}{:>10}{:>10}".format(
+        "places", "coding", "level", "bytes", "ratio", "cpu ms", "MB/s"))
+    for n in sizes:
+        data = json.dumps(places(n)).encode()
+        raw = len(data)
+        for coding, level in runs:
+            sent, ms = per_response(app, data, coding, level)
+            speed = raw / 1e3 / ms if ms else float("inf")
+            print("{:>8}{:>10}{:>6}{:>12}{:>8.2f}{:>10.3f}{:>10.1f}".format(
+                n, coding or "identity", level or "-", sent, sent / raw,
+                ms, speed))
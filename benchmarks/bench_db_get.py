@@ -0,0 +1,68 @@
+#!/usr/bin/python3
+"""
+Latency of DBStorage.get() as the table grows, against the previous
+load-the-whole-table lookup, on a local SQLite stand-in for MySQL
+(or on the database of HBNB_DB_URL when it is set)
+Usage: python3 -m benchmarks.bench_db_get [table sizes...]
+"""
+from datetime import datetime
+import os
+import random
+import sys
+import tempfile
+from timeit import default_timer
+import uuid
+
+os.environ["HBNB_TYPE_STORAGE"] = "db"
+if not os.getenv("HBNB_DB_URL"):
+    os.environ["HBNB_DB_URL"] = "sqlite:///" + os.path.join(
+        tempfile.mkdtemp(), "hbnb_bench.db")
+
+from models import storage  # noqa: E402
+from models.state import State  # noqa: E402
+
+
+def scan_get(cls, id):
+    """the lookup DBStorage.get() used to do"""
+    for obj in storage._DBStorage__session.query(cls).all():
+        if id == obj.id:
+            return obj
+    return None
+
+
+def per_call(func, ids, cold):
+    """returns the mean milliseconds of func(State, id) over ids; a cold
+    call starts from a new session, with an empty identity map"""
+    elapsed = 0
+    for id in ids:
+        if cold:
+            storage.close()
+        start = default_timer()
+        assert func(State, id).id == id
+        elapsed += default_timer() - start
+    return 1000 * elapsed / len(ids)
+
+
+if __name__ == "__main__":
+    sizes = [int(n) for n in sys.argv[1:]] or [1000, 10000, 100000]
+    session = storage._DBStorage__session
+    session.query(State).delete()
+    ids = []
+    print("{:>8}{:>14}{:>14}{:>14}".format(
+        "rows", "get cold ms", "get warm ms", "scan ms"))
+    for size in sizes:
+        now = datetime.now()
+        rows = [{"id": str(uuid.uuid4()), "name": "State",
+                 "created_at": now, "updated_at": now}
+                for i in range(size - len(ids))]
+        session.execute(State.__table__.insert(), rows)
+        storage.save()
+        ids += [row["id"] for row in rows]
+        sample = random.sample(ids, min(200, len(ids)))
+        cold = per_call(storage.get, sample, True)
+        # the identity map only holds weak references
+        loaded = [storage.get(State, id) for id in sample]
+        warm = per_call(storage.get, sample, False)
+        scan = per_call(scan_get, sample[:3], True)
+        print("{:>8}{:>14.3f}{:>14.4f}{:>14.1f}".format(
+            size, cold, warm, scan))
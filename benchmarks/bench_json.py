@@ -0,0 +1,107 @@
+#!/usr/bin/python3
+"""
+JSON encoding and decoding of file.json records and of typical API
+responses with the models codec, against the json module calls they
+replace, for every codec installed
+Usage: python3 -m benchmarks.bench_json [number of objects]
+"""
+import json
+import random
+import sys
+from timeit import default_timer
+
+
+def dataset(n):
+    """returns n objects: states, cities, users, places and reviews in the
+    proportions of a small site"""
+    from models.city import City
+    from models.place import Place
+    from models.review import Review
+    from models.state import State
+    from models.user import User
+    random.seed(0)
+    words = ["cosy", "loft", "view", "garden", "quiet", "studio", "center",
+             "sea", "bright", "wifi", "parking", "family"]
+    states = [State(name="S{}".format(i)) for i in range(max(1, n // 100))]
+    cities = [City(name="C{}".format(i), state_id=random.choice(states).id)
+              for i in range(max(1, n // 20))]
+    users = [User(email="u{}@hbnb.io".format(i), password="pwd",
+                  first_name="F", last_name="L")
+             for i in range(max(1, n // 10))]
+    places = [Place(city_id=random.choice(cities).id,
+                    user_id=random.choice(users).id,
+                    name=" ".join(random.sample(words, 3)),
+                    description=" ".join(random.choices(words, k=30)),
+                    number_rooms=random.randint(1, 6),
+                    max_guest=random.randint(1, 10),
+                    price_by_night=random.randint(20, 400),
+                    latitude=random.uniform(-60, 60),
+                    longitude=random.uniform(-180, 180))
+              for i in range(max(1, n // 4))]
+    reviews = [Review(place_id=random.choice(places).id,
+                      user_id=random.choice(users).id,
+                      text=" ".join(random.choices(words, k=20)))
+               for i in range(n - len(states) - len(cities) - len(users) -
+                              len(places))]
+    return states + cities + users + places + reviews
+
+
+def bench(label, func, repeat):
+    """prints and returns the mean milliseconds of func() over repeat
+    calls"""
+    start = default_timer()
+    for i in range(repeat):
+        func()
+    elapsed = (default_timer() - start) / repeat * 1000
+    print("{:<44}{:>10.3f} ms".format(label, elapsed))
+    return elapsed
+
+
+if __name__ == "__main__":
+    from api.v1.app import app
+    from flask.json.provider import DefaultJSONProvider
+    from models.engine import codec
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    objs = dataset(n)
+    keys = [obj.__class__.__name__ + "." + obj.id for obj in objs]
+    text = json.dumps({key: obj.to_dict() for key, obj in zip(keys, objs)})
+    places = [obj for obj in objs
+              if obj.__class__.__name__ == "Place"][:100]
+    body = json.dumps(places[0].to_dict()).encode()
+    flask = DefaultJSONProvider(app)
+    names = ["json"] + (["orjson"] if codec.orjson is not None else [])
+
+    print("{} objects, file.json of {} bytes".format(n, len(text)))
+    base = bench("save: json.dumps(to_dict()) per object",
+                 lambda: [json.dumps(obj.to_dict()) for obj in objs], 3)
+    for name in names:
+        codec.name = name
+        fast = bench("save: {} dumps(to_dict(native))".format(name),
+                     lambda: [codec.dumps(obj.to_dict(native=True))
+                              for obj in objs], 3)
+        print("{:<44}{:>10.1f} x".format("", base / fast))
+    base = bench("reload: json.loads(file.json)",
+                 lambda: json.loads(text), 5)
+    for name in names:
+        codec.name = name
+        fast = bench("reload: {} loads(file.json)".format(name),
+                     lambda: codec.loads(text), 5)
+        print("{:<44}{:>10.1f} x".format("", base / fast))
+
+    print("responses of {} places of {} bytes".format(
+        len(places), len(flask.dumps([obj.to_dict() for obj in places]))))
+    base = bench("jsonify: flask provider, to_dict()",
+                 lambda: flask.dumps([obj.to_dict() for obj in places]), 500)
+    for name in names:
+        codec.name = name
+        fast = bench("jsonify: {} provider, to_dict(native)".format(name),
+                     lambda: app.json.dumps([obj.to_dict(native=True)
+                                             for obj in places]), 500)
+        print("{:<44}{:>10.1f} x".format("", base / fast))
+    base = bench("get_json: flask provider, 1 place",
+                 lambda: flask.loads(body), 20000)
+    for name in names:
+        codec.name = name
+        fast = bench("get_json: {} provider, 1 place".format(name),
+                     lambda: app.json.loads(body), 20000)
+        print("{:<44}{:>10.1f} x".format("", base / fast))
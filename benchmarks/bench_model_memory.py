@@ -0,0 +1,55 @@
+#!/usr/bin/python3
+"""
+Memory benchmark of file-storage Place instances, default layout against
+the compact (HBNB_COMPACT_MODELS=1) layout
+Usage: python3 -m benchmarks.bench_model_memory [number of places]
+"""
+import os
+import subprocess
+import sys
+import tracemalloc
+import uuid
+
+
+def records(n):
+    """returns n Place records as FileStorage.reload() reads them"""
+    city_ids = [str(uuid.uuid4()) for i in range(100)]
+    return [{"id": str(uuid.uuid4()),
+             "created_at": "2024-01-09T10:59:22.098861",
+             "updated_at": "2024-01-09T10:59:22.098861",
+             "city_id": city_ids[i % 100], "user_id": city_ids[i % 7],
+             "name": "Place {}".format(i), "description": "",
+             "number_rooms": i % 5, "number_bathrooms": 1,
+             "max_guest": i % 9, "price_by_night": i % 300,
+             "latitude": 6.45 + i / 1e6, "longitude": 3.39 + i / 1e6,
+             "__class__": "Place"} for i in range(n)]
+
+
+def measure(n):
+    """returns the bytes allocated per Place built from a record"""
+    from models.place import Place
+    rows = records(n)
+    tracemalloc.start()
+    places = [Place(**row) for row in rows]
+    size = tracemalloc.get_traced_memory()[0] - sys.getsizeof(places)
+    tracemalloc.stop()
+    assert places[0].to_dict() == rows[0]
+    return size / n
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    if len(sys.argv) > 2:
+        print(measure(n))
+        sys.exit()
+    print("{} places".format(n))
+    sizes = {}
+    for layout, flag in [("default", "0"), ("compact", "1")]:
+        env = dict(os.environ, HBNB_COMPACT_MODELS=flag)
+        env.pop("HBNB_TYPE_STORAGE", None)
+        out = subprocess.check_output([sys.executable, "-m", __spec__.name,
+                                       str(n), "child"], env=env)
+        sizes[layout] = float(out.decode().split()[-1])
+        print("{:<12}{:>10.1f} bytes/place".format(layout, sizes[layout]))
+    print("{:<12}{:>10.1f} %".format(
+        "saved", 100 * (1 - sizes["compact"] / sizes["default"])))
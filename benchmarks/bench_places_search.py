@@ -0,0 +1,145 @@
+#!/usr/bin/python3
+"""
+places_search latency with storage.search() against the previous
+Python-side filtering, in file storage and on a local SQLite stand-in for
+MySQL, with every place holding a few of the amenities
+Usage: python3 -m benchmarks.bench_places_search [places] [amenities]
+"""
+from datetime import datetime
+import os
+import random
+import subprocess
+import sys
+import tempfile
+from timeit import default_timer
+import uuid
+
+
+def dataset(n, m):
+    """returns the records of 20 states of 10 cities each, m amenities and
+    n places of 1 to 8 amenities, and the amenity ids of each place"""
+    random.seed(0)
+    now = datetime.now()
+    base = {"created_at": now, "updated_at": now}
+    states = [dict(base, id=str(uuid.uuid4()), name="S") for i in range(20)]
+    cities = [dict(base, id=str(uuid.uuid4()), name="C",
+                   state_id=states[i % 20]["id"]) for i in range(200)]
+    users = [dict(base, id=str(uuid.uuid4()), email="e", password="p")]
+    amenities = [dict(base, id=str(uuid.uuid4()), name="A")
+                 for i in range(m)]
+    places = [dict(base, id=str(uuid.uuid4()), name="P",
+                   city_id=random.choice(cities)["id"],
+                   user_id=users[0]["id"]) for i in range(n)]
+    having = {place["id"]: [amenity["id"] for amenity in
+                            random.sample(amenities, random.randint(1, 8))]
+              for place in places}
+    return states, cities, users, amenities, places, having
+
+
+def searches(states, cities, amenities):
+    """returns the benchmarked searches, by name"""
+    from models.engine.search import PlaceSearch
+    ids = [amenity["id"] for amenity in amenities]
+    return [("all places", PlaceSearch()),
+            ("1 amenity", PlaceSearch(amenities=ids[:1])),
+            ("3 amenities", PlaceSearch(amenities=ids[:3])),
+            ("2 states", PlaceSearch(states=[s["id"] for s in states[:2]])),
+            ("2 states 2 amenities",
+             PlaceSearch(states=[s["id"] for s in states[:2]],
+                         amenities=ids[:2])),
+            ("10 cities 1 amenity",
+             PlaceSearch(cities=[c["id"] for c in cities[:10]],
+                         amenities=ids[:1]))]
+
+
+def python_search(search):
+    """the search the places_search view used to run"""
+    from models import storage
+    from models.amenity import Amenity
+    from models.city import City
+    from models.place import Place
+    from models.state import State
+    if search.everywhere:
+        places = list(storage.all(Place).values())
+    else:
+        places = []
+        for state_id in search.states:
+            for city in storage.get(State, state_id).cities:
+                places.extend(city.places)
+        for city_id in search.cities:
+            places.extend(storage.get(City, city_id).places)
+    amenities = [storage.get(Amenity, id) for id in search.amenities]
+    return [place for place in places
+            if all(amenity in place.amenities for amenity in amenities)]
+
+
+def load(n, m):
+    """stores the dataset in the storage of the process"""
+    from models import storage, storage_t
+    from models.amenity import Amenity
+    from models.city import City
+    from models.place import Place
+    from models.state import State
+    from models.user import User
+    states, cities, users, amenities, places, having = dataset(n, m)
+    if storage_t == "db":
+        session = storage._DBStorage__session
+        for cls, rows in [(State, states), (City, cities), (User, users),
+                          (Amenity, amenities), (Place, places)]:
+            session.execute(cls.__table__.insert(), rows)
+        session.execute(Place.amenities.property.secondary.insert(),
+                        [{"place_id": id, "amenity_id": amenity_id}
+                         for id, ids in having.items() for amenity_id in ids])
+        storage.save()
+        storage.close()
+    else:
+        for cls, rows in [(State, states), (City, cities), (User, users),
+                          (Amenity, amenities), (Place, places)]:
+            for row in rows:
+                obj = cls(**row)
+                if cls is Place:
+                    obj.amenity_ids = having[row["id"]]
+                storage.new(obj)
+    return states, cities, amenities
+
+
+def child(n, m):
+    """prints the milliseconds of each search with both approaches"""
+    from models import storage, storage_t
+    rows = load(n, m)
+    print("{} storage, {} places, {} amenities".format(
+        storage_t or "file", n, m))
+    print("{:<24}{:>8}{:>12}{:>12}".format("search", "places",
+                                           "search ms", "python ms"))
+    for name, search in searches(*rows):
+        times = []
+        results = []
+        for func in (storage.search, python_search):
+            if storage_t == "db":
+                # start from an empty identity map
+                storage.close()
+            start = default_timer()
+            found = func(search)
+            times.append(1000 * (default_timer() - start))
+            results.append(sorted(place.id for place in found))
+        assert results[0] == results[1]
+        expected = results[0]
+        print("{:<24}{:>8}{:>12.1f}{:>12.1f}".format(name, len(expected),
+                                                     *times))
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    m = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    if len(sys.argv) > 3:
+        child(n, m)
+        sys.exit()
+    for storage_t in ("file", "db"):
+        env = dict(os.environ, HBNB_TYPE_STORAGE=storage_t)
+        if storage_t == "db" and not os.getenv("HBNB_DB_URL"):
+            env["HBNB_DB_URL"] = "sqlite:///" + os.path.join(
+                tempfile.mkdtemp(), "hbnb_bench.db")
+        sys.stdout.flush()
+        subprocess.check_call([sys.executable, "-m", __spec__.name,
+                               str(n), str(m), "child"], env=env)
+        print()
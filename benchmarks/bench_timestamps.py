@@ -0,0 +1,37 @@
+#!/usr/bin/python3
+"""
+Micro-benchmark of the model timestamp codec against strptime/strftime
+Usage: python3 -m benchmarks.bench_timestamps [number of records]
+"""
+from datetime import datetime, timedelta
+from models.base_model import format_time, parse_time, time
+import sys
+from timeit import default_timer
+
+
+def bench(label, func, values):
+    """times func over every value and returns the elapsed seconds"""
+    start = default_timer()
+    for value in values:
+        func(value)
+    elapsed = default_timer() - start
+    print("{:<28}{:>10.3f} s".format(label, elapsed))
+    return elapsed
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    origin = datetime(2024, 1, 9, 10, 59, 22, 98861)
+    dates = [origin + timedelta(microseconds=i * 7919) for i in range(n)]
+    strings = [date.strftime(time) for date in dates]
+    assert [parse_time(s) for s in strings[:1000]] == dates[:1000]
+    assert [format_time(d) for d in dates[:1000]] == strings[:1000]
+
+    print("{} timestamps".format(n))
+    slow = bench("datetime.strptime", lambda s: datetime.strptime(s, time),
+                 strings)
+    fast = bench("parse_time", parse_time, strings)
+    print("{:<28}{:>10.1f} x".format("parse speedup", slow / fast))
+    slow = bench("datetime.strftime", lambda d: d.strftime(time), dates)
+    fast = bench("format_time", format_time, dates)
+    print("{:<28}{:>10.1f} x".format("format speedup", slow / fast))
@@ -14,18 +14,71 @@ import hashlib
 
 time = "%Y-%m-%dT%H:%M:%S.%f"
 
+
+def parse_time(value):
+    """returns the datetime of a string in the time format"""
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return datetime.strptime(value, time)
+
+
+def format_time(value):
+    """returns the string of a datetime in the time format"""
+    if value.tzinfo is None and value.year >= 1000:
+        return value.isoformat(timespec="microseconds")
+    return value.strftime(time)
+
+
 if models.storage_t == "db":
     Base = declarative_base()
 else:
     Base = object
 
+# slotted model instances in file storage, see Layout
+compact = models.storage_t != "db" and getenv("HBNB_COMPACT_MODELS") == "1"
+# set - id() of the instances stored in file storage: only their attribute
+# changes are passed on to it, not those of an instance being built
+attached = set()
 
-class BaseModel:
+
+class Layout(type):
+    """Metaclass of the models in compact mode: the plain class attributes
+    of a model become __slots__ and their values the defaults of unset
+    slots, so instances carry no __dict__"""
+    def __new__(mcs, name, bases, namespace):
+        """creates a model class with its plain attributes as slots"""
+        defaults = {}
+        for base in reversed(bases):
+            defaults.update(getattr(base, "_defaults", {}))
+        slots = list(namespace.get("__slots__", ()))
+        for key, value in list(namespace.items()):
+            if key.startswith("_") or callable(value) or \
+               isinstance(value, (property, classmethod, staticmethod)):
+                continue
+            if key not in defaults:
+                slots.append(key)
+            defaults[key] = namespace.pop(key)
+        namespace["__slots__"] = tuple(slots)
+        namespace["_defaults"] = defaults
+        cls = super().__new__(mcs, name, bases, namespace)
+        cls._members = tuple((slot, getattr(cls, slot))
+                             for klass in reversed(cls.__mro__)
+                             for slot in vars(klass).get("__slots__", ())
+                             if slot != "_extra")
+        return cls
+
+
+class BaseModel(metaclass=Layout if compact else type):
     """The BaseModel class from which future classes will be derived"""
     if models.storage_t == "db":
         id = Column(String(60), primary_key=True)
         created_at = Column(DateTime, default=datetime.now)
-        updated_at = Column(DateTime, default=datetime.now)
+        # indexed: version() reads the latest one of every class
+        updated_at = Column(DateTime, default=datetime.now, index=True)
+    elif compact:
+        # attributes outside the slots go to the _extra dictionary
+        __slots__ = ("id", "created_at", "updated_at", "_extra")
 
     def __init__(self, *args, **kwargs):
         """Initialization of the base model"""
@@ -34,11 +87,14 @@ class BaseModel:
                 if key != "__class__":
                     setattr(self, key, value)
             if kwargs.get("created_at", None) and type(self.created_at) is str:
-                self.created_at = datetime.strptime(kwargs["created_at"], time)
+                self.created_at = parse_time(kwargs["created_at"])
             else:
                 self.created_at = datetime.now()
             if kwargs.get("updated_at", None) and type(self.updated_at) is str:
-                self.updated_at = datetime.strptime(kwargs["updated_at"], time)
+                if kwargs["updated_at"] == kwargs.get("created_at"):
+                    self.updated_at = self.created_at
+                else:
+                    self.updated_at = parse_time(kwargs["updated_at"])
             else:
                 self.updated_at = datetime.now()
             if kwargs.get("id", None) is None:
@@ -48,6 +104,81 @@ class BaseModel:
             self.created_at = datetime.now()
             self.updated_at = self.created_at
 
+    if models.storage_t != "db":
+        def __setattr__(self, name, value):
+            """sets an attribute and, once the instance is stored, lets the
+            storage update its indexes"""
+            if id(self) not in attached:
+                self.__assign(name, value)
+                return
+            old = getattr(self, name, None)
+            self.__assign(name, value)
+            models.storage.changed(self, name, old)
+
+        def __assign(self, name, value):
+            """sets an attribute, in _extra when it is not a slot of a
+            compact instance"""
+            try:
+                super().__setattr__(name, value)
+            except AttributeError:
+                if not compact or hasattr(type(self), name):
+                    raise
+                if getattr(self, "_extra", None) is None:
+                    super().__setattr__("_extra", {})
+                self._extra[name] = value
+
+    if compact:
+        def __getattr__(self, name):
+            """returns an attribute kept in _extra, or the class default of
+            an unset slot"""
+            if name in self._defaults:
+                return self._defaults[name]
+            extra = getattr(self, "_extra", None) if name != "_extra" else None
+            if extra is not None and name in extra:
+                return extra[name]
+            raise AttributeError("'{}' object has no attribute '{}'".format(
+                self.__class__.__name__, name))
+
+        @property
+        def __dict__(self):
+            """the attributes set on the instance, as a new dictionary"""
+            attrs = {}
+            for name, member in self._members:
+                try:
+                    attrs[name] = member.__get__(self)
+                except AttributeError:
+                    pass
+            extra = getattr(self, "_extra", None)
+            if extra:
+                attrs.update(extra)
+            return attrs
+
+        def __delattr__(self, name):
+            """deletes an attribute, from _extra when it is not a slot"""
+            try:
+                super().__delattr__(name)
+            except AttributeError:
+                extra = getattr(self, "_extra", None)
+                if name == "_extra" or not extra or name not in extra:
+                    raise
+                del extra[name]
+
+        def __getstate__(self):
+            """the attributes set on the instance, for copy and pickle: not
+            the class defaults of its unset slots"""
+            return self.__dict__
+
+        def __setstate__(self, state):
+            """sets the attributes of a copied or unpickled instance"""
+            for name, value in state.items():
+                self.__assign(name, value)
+
+        def __copy__(self):
+            """returns a shallow copy of the instance, with its own _extra"""
+            obj = self.__class__.__new__(self.__class__)
+            obj.__setstate__(self.__getstate__())
+            return obj
+
     def __str__(self):
         """String representation of the BaseModel class"""
         return "[{:s}] ({:s}) {}".format(self.__class__.__name__, self.id,
@@ -59,16 +190,25 @@ class BaseModel:
         models.storage.new(self)
         models.storage.save()
 
-    def to_dict(self):
-        """returns a dictionary containing all keys/values of the instance"""
+    def to_dict(self, native=False):
+        """returns a dictionary containing all keys/values of the instance
+        native keeps created_at and updated_at as datetimes, for the codec
+        to encode them itself"""
         new_dict = self.__dict__.copy()
-        if "created_at" in new_dict:
-            new_dict["created_at"] = new_dict["created_at"].strftime(time)
-        if "updated_at" in new_dict:
-            new_dict["updated_at"] = new_dict["updated_at"].strftime(time)
+        created_at = new_dict.get("created_at")
+        if "created_at" in new_dict and not native:
+            new_dict["created_at"] = format_time(created_at)
+        if "updated_at" in new_dict and not native:
+            if new_dict["updated_at"] == created_at:
+                new_dict["updated_at"] = new_dict["created_at"]
+            else:
+                new_dict["updated_at"] = format_time(new_dict["updated_at"])
         new_dict["__class__"] = self.__class__.__name__
         if "_sa_instance_state" in new_dict:
-            del new_dict["_sa_instance_state"]
+            # relationships loaded on the instance are not attributes of it
+            mapper = new_dict.pop("_sa_instance_state").mapper
+            for key in mapper.relationships.keys():
+                new_dict.pop(key, None)
         if "password" in new_dict:
             del new_dict["password"]
         return new_dict
@@ -0,0 +1,107 @@
+#!/usr/bin/python3
+"""
+Contains the Bitmaps class, the inverted indexes FileStorage keeps over
+list attributes such as Place.amenity_ids
+"""
+
+# tuple - the positions of the bits set in each byte value
+byte_members = tuple(tuple(bit for bit in range(8) if byte >> bit & 1)
+                     for byte in range(256))
+
+
+def members(bitmap):
+    """returns the positions of the bits set in bitmap, in order"""
+    data = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little")
+    return [8 * i + bit for i, byte in enumerate(data) if byte
+            for bit in byte_members[byte]]
+
+
+class Bitmaps:
+    """An inverted index of a list attribute: each value maps to a bitmap
+    of the keys whose list holds it, a Python int whose bit n stands for
+    the key of ordinal n
+    Ordinals are interned once per key and reused once their key is
+    dropped, so the bitmaps stay as short as the number of keys"""
+
+    def __init__(self):
+        """creates an empty index"""
+        # dictionary - key -> ordinal
+        self.ordinals = {}
+        # list - key of each ordinal, None when free
+        self.keys = []
+        # list - ordinals of dropped keys, to reuse
+        self.free = []
+        # dictionary - value -> bitmap of the ordinals holding it
+        self.bitmaps = {}
+        # dictionary - key -> values of its list, as last put
+        self.values = {}
+
+    def __len__(self):
+        """returns the number of keys"""
+        return len(self.ordinals)
+
+    def put(self, key, values):
+        """indexes key under each of values, in place of its old values"""
+        self.drop(key)
+        try:
+            values = frozenset(values or ())
+        except TypeError:
+            return
+        if not values:
+            return
+        if self.free:
+            ordinal = self.free.pop()
+            self.keys[ordinal] = key
+        else:
+            ordinal = len(self.keys)
+            self.keys.append(key)
+        self.ordinals[key] = ordinal
+        self.values[key] = values
+        bit = 1 << ordinal
+        for value in values:
+            self.bitmaps[value] = self.bitmaps.get(value, 0) | bit
+
+    def drop(self, key):
+        """removes key from the index, if it is there"""
+        ordinal = self.ordinals.pop(key, None)
+        if ordinal is None:
+            return
+        mask = ~(1 << ordinal)
+        for value in self.values.pop(key):
+            bitmap = self.bitmaps[value] & mask
+            if bitmap:
+                self.bitmaps[value] = bitmap
+            else:
+                del self.bitmaps[value]
+        self.keys[ordinal] = None
+        self.free.append(ordinal)
+
+    def select(self, values, within=None):
+        """returns the keys holding every one of values, only among the set
+        of keys within when it is given
+        The bitmaps are intersected from the sparsest, stopping as soon as
+        nothing is left, and only the result is turned back into keys; when
+        within is smaller than the sparsest bitmap, its keys are looked up
+        in the result instead"""
+        if not values:
+            return []
+        weights = sorted((self.bitmaps.get(value, 0).bit_count(), value)
+                         for value in values)
+        result = self.bitmaps.get(weights[0][1], 0)
+        for weight, value in weights[1:]:
+            if not result:
+                break
+            result &= self.bitmaps.get(value, 0)
+        if within is None:
+            return [self.keys[ordinal] for ordinal in members(result)]
+        if len(within) >= weights[0][0]:
+            return [self.keys[ordinal] for ordinal in members(result)
+                    if self.keys[ordinal] in within]
+        bits = result.to_bytes((result.bit_length() + 7) // 8, "little")
+        size = len(bits) * 8
+        keys = []
+        for key in within:
+            ordinal = self.ordinals.get(key, size)
+            if ordinal < size and bits[ordinal >> 3] >> (ordinal & 7) & 1:
+                keys.append(key)
+        return keys
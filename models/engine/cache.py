@@ -0,0 +1,96 @@
+#!/usr/bin/python3
+"""
+Contains the LRUCache class, the read-through object cache DBStorage keeps
+in front of get() and all()
+"""
+
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+
+
+class LRUCache:
+    """A mapping of at most size entries, each dropped ttl seconds after
+    it was put, the least recently used one being evicted to make room;
+    a size of 0 disables it
+    hits, misses, evictions and expirations count what happened to the
+    lookups and entries since the cache was created or cleared"""
+
+    def __init__(self, size=0, ttl=60.0, clock=monotonic):
+        """creates an empty cache of size entries living ttl seconds, as
+        measured by clock"""
+        self.size = size
+        self.ttl = ttl
+        self.clock = clock
+        # OrderedDict - key -> (expiry time, value), least recent first
+        self.entries = OrderedDict()
+        self.lock = Lock()
+        # int - number of invalidate() calls, see put()
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        """returns the number of entries"""
+        return len(self.entries)
+
+    def get(self, key):
+        """returns the value of key and marks it as the most recently used,
+        or None when it is not cached or expired"""
+        if not self.size:
+            return None
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] <= self.clock():
+                del self.entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, value, generation=None):
+        """caches value under key, evicting the least recently used entries
+        beyond size
+        With the generation the value was read at, the value is dropped if
+        invalidate() ran since: it may predate the change that did"""
+        if not self.size:
+            return
+        with self.lock:
+            if generation is not None and generation != self.generation:
+                return
+            self.entries[key] = (self.clock() + self.ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key):
+        """drops the entry of key, if there is one"""
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def invalidate(self, keys):
+        """drops the entries of keys and starts a new generation"""
+        with self.lock:
+            for key in keys:
+                self.entries.pop(key, None)
+            self.generation += 1
+
+    def clear(self):
+        """drops every entry and resets the counters"""
+        with self.lock:
+            self.entries.clear()
+            self.hits = self.misses = 0
+            self.evictions = self.expirations = 0
+
+    def stats(self):
+        """returns the counters and the number of entries"""
+        return {"size": len(self.entries), "hits": self.hits,
+                "misses": self.misses, "evictions": self.evictions,
+                "expirations": self.expirations}
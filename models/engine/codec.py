@@ -0,0 +1,55 @@
+#!/usr/bin/python3
+"""
+Contains the JSON codec of FileStorage and of the API: orjson when it is
+installed, else the json module, both encoding datetimes in the time
+format of the models
+"""
+
+from datetime import datetime
+import json
+from models.base_model import format_time
+from os import getenv
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# name of the codec in use: HBNB_JSON_CODEC=json keeps the json module
+# even when orjson is installed
+name = "orjson" if orjson is not None and \
+    getenv("HBNB_JSON_CODEC") != "json" else "json"
+
+
+def default(value):
+    """returns the JSON value of an object the codec cannot encode itself:
+    a datetime in the time format"""
+    if isinstance(value, datetime):
+        return format_time(value)
+    raise TypeError("Object of type {} is not JSON serializable".format(
+        type(value).__name__))
+
+
+# json encoders of dumps(), without and with sorted keys, as compact as
+# the text of orjson
+encoders = {False: json.JSONEncoder(default=default, separators=(",", ":")),
+            True: json.JSONEncoder(default=default, sort_keys=True,
+                                   separators=(",", ":"))}
+
+
+def dumps(obj, sort_keys=False):
+    """returns the JSON text of obj, datetimes in the time format with
+    every codec"""
+    if name == "orjson":
+        option = orjson.OPT_PASSTHROUGH_DATETIME
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=default, option=option).decode()
+    return encoders[sort_keys].encode(obj)
+
+
+def loads(text):
+    """returns the object of the JSON text, a str or bytes"""
+    if name == "orjson":
+        return orjson.loads(text)
+    return json.loads(text)
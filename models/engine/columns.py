@@ -0,0 +1,178 @@
+#!/usr/bin/python3
+"""
+Contains the Table class, the columns FileStorage keeps for filter()
+"""
+
+from array import array
+import operator
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# operators of the filter() keywords: attr__lte=... and so on
+comparators = {"eq": operator.eq, "lt": operator.lt, "lte": operator.le,
+               "gt": operator.gt, "gte": operator.ge}
+
+
+def parse_predicate(predicate, value):
+    """splits a filter() keyword such as price_by_night__lte into its
+    attribute and operator; a list, tuple or set value means "in" """
+    attr, sep, op = predicate.rpartition("__")
+    if not sep or (op not in comparators and op != "in"):
+        attr, op = predicate, "eq"
+    if op == "eq" and isinstance(value, (list, tuple, set, frozenset)):
+        op = "in"
+    return attr, op
+
+
+def matches(value, op, arg):
+    """tells if value satisfies the operator op against arg"""
+    try:
+        if op == "in":
+            return value in arg
+        return comparators[op](value, arg)
+    except TypeError:
+        return False
+
+
+class Table:
+    """The columns of one model class: a row per stored object, numbers as
+    float64 and other values as integer codes, held in NumPy arrays when
+    NumPy is installed and in array.array otherwise"""
+
+    def __init__(self, numbers=(), codes=()):
+        """creates empty columns for the attributes in numbers and codes"""
+        # list - <class name>.id of each row
+        self.keys = []
+        # dictionary - <class name>.id -> row
+        self.rows = {}
+        self.columns = {}
+        for attr in numbers:
+            self.columns[attr] = self.__array("d", 16)
+        for attr in codes:
+            self.columns[attr] = self.__array("q", 16)
+        # dictionary - attribute -> {value: code}, for the coded columns
+        self.codes = {attr: {} for attr in codes}
+        # int - number of rows the columns can hold
+        self.capacity = 16
+
+    def __len__(self):
+        """returns the number of rows"""
+        return len(self.keys)
+
+    def put(self, key, get):
+        """writes the row of key, get(attr) giving the value of attr"""
+        row = self.rows.get(key)
+        if row is None:
+            row = len(self.keys)
+            self.keys.append(key)
+            self.rows[key] = row
+            if row == self.capacity:
+                self.__grow()
+        for attr in self.columns:
+            self.__write(row, attr, get(attr))
+
+    def set(self, key, attr, value):
+        """writes attr of the row of key, if both exist"""
+        row = self.rows.get(key)
+        if row is not None and attr in self.columns:
+            self.__write(row, attr, value)
+
+    def drop(self, key):
+        """removes the row of key, moving the last row into its place"""
+        row = self.rows.pop(key, None)
+        if row is None:
+            return
+        last = len(self.keys) - 1
+        if row != last:
+            moved = self.keys[last]
+            self.keys[row] = moved
+            self.rows[moved] = row
+            for column in self.columns.values():
+                column[row] = column[last]
+        self.keys.pop()
+
+    def select(self, predicates):
+        """returns the keys of the rows matching the predicates the columns
+        can answer, and a dictionary of the predicates left over"""
+        tests = []
+        rest = {}
+        for predicate, value in predicates.items():
+            test = self.__test(*parse_predicate(predicate, value), value)
+            if test is None:
+                rest[predicate] = value
+            else:
+                tests.append(test)
+        n = len(self.keys)
+        if numpy is not None:
+            mask = numpy.ones(n, bool)
+            for column, op, arg in tests:
+                if op == "in":
+                    mask &= numpy.isin(column[:n], arg)
+                else:
+                    mask &= comparators[op](column[:n], arg)
+            rows = numpy.flatnonzero(mask).tolist()
+        else:
+            rows = range(n)
+            for column, op, arg in tests:
+                if op == "in":
+                    arg = set(arg)
+                rows = [row for row in rows
+                        if matches(column[row], op, arg)]
+        return [self.keys[row] for row in rows], rest
+
+    def __test(self, attr, op, value):
+        """returns (column, operator, argument) to evaluate a predicate on
+        the columns, or None when the columns cannot answer it"""
+        if attr not in self.columns:
+            return None
+        values = value if op == "in" else [value]
+        if attr in self.codes:
+            if op not in ("eq", "in"):
+                return None
+            codes = self.codes[attr]
+            try:
+                arg = [codes[v] for v in values if v in codes]
+            except TypeError:
+                return None
+            return (self.columns[attr], "in", arg)
+        try:
+            arg = [float(v) for v in values]
+        except (TypeError, ValueError):
+            return None
+        return (self.columns[attr], op, arg if op == "in" else arg[0])
+
+    def __write(self, row, attr, value):
+        """stores value in the cell of attr at row"""
+        codes = self.codes.get(attr)
+        if codes is None:
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                value = float("nan")
+        else:
+            try:
+                value = codes.setdefault(value, len(codes))
+            except TypeError:
+                value = -1
+        self.columns[attr][row] = value
+
+    def __grow(self):
+        """doubles the capacity of every column"""
+        self.capacity *= 2
+        for attr, column in self.columns.items():
+            if numpy is not None:
+                self.columns[attr] = numpy.concatenate(
+                    [column, numpy.zeros(len(column), column.dtype)])
+            else:
+                column.extend(self.__array(column.typecode, len(column)))
+
+    @staticmethod
+    def __array(typecode, size):
+        """returns a column of size zeroes of the array typecode"""
+        if numpy is not None:
+            return numpy.zeros(size, {"d": numpy.float64,
+                                      "q": numpy.int64}[typecode])
+        return array(typecode, [0]) * size
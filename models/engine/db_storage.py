@@ -3,27 +3,57 @@
 Contains the class DBStorage
 """
 
+from contextlib import contextmanager
+from datetime import datetime
+from itertools import chain
 import models
 from models.amenity import Amenity
 from models.base_model import BaseModel, Base
+from models.engine.cache import LRUCache
 from models.city import City
+from models.engine.columns import comparators, parse_predicate
+from models.engine.geo import circle_bounds, distance
+from models.engine.text_index import TextIndex, tokenize
 from models.place import Place
 from models.review import Review
 from models.state import State
 from models.user import User
 from os import getenv
 import sqlalchemy
-from sqlalchemy import create_engine
-from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy import and_, create_engine, event, func, literal, or_
+from sqlalchemy import select
+from sqlalchemy import union_all
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.orm import joinedload, scoped_session, selectinload
+from sqlalchemy.orm import make_transient_to_detached, sessionmaker
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.util import identity_key
+from time import monotonic
+from uuid import uuid4
 
 classes = {"Amenity": Amenity, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
 
+# loader options of the load= strategies: selectin runs one more SELECT
+# ... WHERE IN per relationship, joined a LEFT OUTER JOIN in the same query
+loaders = {"selectin": selectinload, "joined": joinedload}
+
 
 class DBStorage:
     """interaacts with the MySQL database"""
     __engine = None
     __session = None
+    # radius in km of the first circle nearest() reads
+    nearest_reach = float(getenv("HBNB_NEAREST_KM") or 10)
+    # attributes text_search() looks into, by class
+    texts = {Place: ("name", "description"), Review: ("text",)}
+    # entries of the read-through cache of get() and all(), 0 for none
+    cache_size = int(getenv("HBNB_CACHE_SIZE") or 0)
+    # seconds an entry of that cache lives
+    cache_ttl = float(getenv("HBNB_CACHE_TTL") or 60)
+    # seconds counts() answers from its counters before reading the exact
+    # numbers again, 0 to read them every time
+    count_ttl = float(getenv("HBNB_COUNT_TTL") or 60)
 
     def __init__(self):
         """Instantiate a DBStorage object"""
@@ -32,41 +62,452 @@ class DBStorage:
         HBNB_MYSQL_HOST = getenv('HBNB_MYSQL_HOST')
         HBNB_MYSQL_DB = getenv('HBNB_MYSQL_DB')
         HBNB_ENV = getenv('HBNB_ENV')
-        self.__engine = create_engine('mysql+mysqldb://{}:{}@{}/{}'.
+        # any SQLAlchemy URL, e.g. sqlite:// as a local stand-in for MySQL
+        HBNB_DB_URL = getenv('HBNB_DB_URL')
+        self.__engine = create_engine(HBNB_DB_URL or
+                                      'mysql+mysqldb://{}:{}@{}/{}'.
                                       format(HBNB_MYSQL_USER,
                                              HBNB_MYSQL_PWD,
                                              HBNB_MYSQL_HOST,
                                              HBNB_MYSQL_DB))
         if HBNB_ENV == "test":
             Base.metadata.drop_all(self.__engine)
+        # LRUCache - (class name, id) -> detached copy of the object, and
+        # (class name, None) -> ids of every object of the class
+        self.cache = LRUCache(self.cache_size, self.cache_ttl)
+        # dictionary - class name -> (number of commits writing its
+        # objects in this process, datetime of the last one)
+        self.__versions = {}
+        # string - token of this process in the tags of version()
+        self.__run = uuid4().hex[:8]
+        # datetime - the last change of a class no commit wrote yet
+        self.__started = datetime.now()
+        # dictionary - class name -> number of rows, as last read and moved
+        # by the commits of this process since, or None before the first
+        self.__counts = None
+        # float - monotonic time __counts was last read at
+        self.__counted = 0.0
 
-    def all(self, cls=None):
-        """query on the current database session"""
+    def all(self, cls=None, load=None):
+        """query on the current database session
+        load names the relationships to load with the objects, see
+        __options, instead of one lazy query per object on first access
+        Without load, the objects come from the cache when it holds all of
+        them"""
         new_dict = {}
         for clss in classes:
             if cls is None or cls is classes[clss] or cls is clss:
-                objs = self.__session.query(classes[clss]).all()
+                if load is None and self.__cacheable():
+                    objs = self.__cached_all(classes[clss])
+                else:
+                    query = self.__session.query(classes[clss])
+                    options = self.__options(classes[clss], load)
+                    objs = query.options(*options).all()
                 for obj in objs:
                     key = obj.__class__.__name__ + '.' + obj.id
                     new_dict[key] = obj
         return (new_dict)
 
-    def get(self, cls, id):
-        """retrieve one object of a class with its id"""
-        if cls is None or cls.__name__ not in classes:
+    def get(self, cls, id, load=None):
+        """retrieve one object of a class with its id
+        A primary key lookup: answered from the session's identity map when
+        the object is already loaded, else from the cache, else by a
+        single-row SELECT
+        load names relationships to load with it, as in all()"""
+        if isinstance(cls, str):
+            cls = classes.get(cls)
+        if cls is None or cls.__name__ not in classes or not id:
             return None
+        if load is None and self.__cacheable():
+            return self.__cached_get(cls, id)
+        options = self.__options(cls, load)
+        return self.__session.get(cls, id, options=options)
+
+    def __cacheable(self):
+        """tells if the cache may answer: it is enabled and the session has
+        no change waiting to be flushed or committed"""
+        session = self.__session
+        return bool(self.cache.size) and \
+            not session.info.get("written") and \
+            not (session.new or session.dirty or session.deleted)
+
+    def __cached_get(self, cls, id):
+        """returns get(cls, id) from the session, then the cache, then the
+        database, caching what it reads"""
+        obj = self.__session.identity_map.get(identity_key(cls, id))
+        if obj is not None:
+            return obj
+        snapshot = self.cache.get((cls.__name__, id))
+        if snapshot is not None:
+            return self.__attach(snapshot)
+        obj = self.__session.get(cls, id)
+        if obj is not None:
+            self.cache.put((cls.__name__, id), self.__snapshot(obj),
+                           self.__generation())
+        return obj
 
+    def __cached_all(self, cls):
+        """returns the list of every cls object from the cache when it
+        holds their ids and each of them, else from the database, caching
+        them when they fit"""
+        name = cls.__name__
+        ids = self.cache.get((name, None))
+        if ids is not None:
+            snapshots = [self.cache.get((name, id)) for id in ids]
+            if None not in snapshots:
+                return [self.__attach(snapshot) for snapshot in snapshots]
         objs = self.__session.query(cls).all()
-        for obj in objs:
-            if id == obj.id:
-                return obj
-        return None
+        if len(objs) < self.cache.size:
+            generation = self.__generation()
+            for obj in objs:
+                self.cache.put((name, obj.id), self.__snapshot(obj),
+                               generation)
+            self.cache.put((name, None), [obj.id for obj in objs],
+                           generation)
+        return objs
+
+    def __generation(self):
+        """returns the generation of the cache the transaction of the
+        session began at: what it reads is not cached once a commit
+        invalidated the cache since, the transaction possibly reading the
+        rows as they were before that commit"""
+        return self.__session.info.get("generation", -1)
+
+    @staticmethod
+    def __snapshot(obj):
+        """returns a detached copy of the columns of obj, for the cache"""
+        mapper = sqlalchemy.inspect(obj).mapper
+        snapshot = mapper.class_manager.new_instance()
+        for attr in mapper.column_attrs:
+            set_committed_value(snapshot, attr.key, getattr(obj, attr.key))
+        make_transient_to_detached(snapshot)
+        return snapshot
+
+    def __attach(self, snapshot):
+        """returns the object of the session for a cached copy: the one it
+        already holds, else a new one merged from the copy without a
+        SELECT, its relationships loading as usual"""
+        obj = self.__session.identity_map.get(
+            identity_key(instance=snapshot))
+        if obj is not None:
+            return obj
+        return self.__session.merge(snapshot, load=False)
+
+    def __begun(self, session, transaction, connection):
+        """notes the generation of the cache a transaction begins at"""
+        session.info["generation"] = self.cache.generation
+
+    def __flushed(self, session, context):
+        """drops from the cache the objects a flush writes, and marks the
+        session as written until it commits or rolls back"""
+        session.info["written"] = True
+        flushed = session.info.setdefault("flushed", set())
+        keys = session.info.setdefault("keys", set())
+        self.__tally(session, session.info.setdefault("counted", {}))
+        for obj in chain(session.new, session.dirty, session.deleted):
+            name = obj.__class__.__name__
+            flushed.add(name)
+            keys.update(((name, getattr(obj, "id", None)), (name, None)))
+            self.cache.pop((name, getattr(obj, "id", None)))
+            self.cache.pop((name, None))
+
+    def __committed(self, session):
+        """drops again from the cache the objects the session wrote, which
+        another session may have cached as they were before the commit,
+        counts a new version of their classes, then marks the session as
+        settled"""
+        keys = session.info.get("keys")
+        if keys:
+            self.cache.invalidate(keys)
+        for name in session.info.get("flushed", ()):
+            count = self.__versions.get(name, (0,))[0]
+            self.__versions[name] = (count + 1, datetime.now())
+        counts = self.__counts
+        if counts is not None:
+            for name, delta in session.info.get("counted", {}).items():
+                counts[name] += delta
+        self.__settled(session)
+
+    @staticmethod
+    def __settled(session, *args):
+        """marks the session as no longer written once it commits or rolls
+        back"""
+        session.info.pop("written", None)
+        session.info.pop("flushed", None)
+        session.info.pop("counted", None)
+        session.info.pop("keys", None)
+
+    @staticmethod
+    def __tally(session, deltas):
+        """adds to {class name: delta} the objects the session adds and
+        deletes"""
+        for objs, step in ((session.new, 1), (session.deleted, -1)):
+            for obj in objs:
+                name = obj.__class__.__name__
+                if name in classes:
+                    deltas[name] = deltas.get(name, 0) + step
+
+    def version(self, cls):
+        """returns the (tag, datetime of the last change) of the cls
+        objects: the tag changes whenever this process commits a write of
+        them, or any process saves one, as told by their latest updated_at,
+        read from the end of its index, or adds or deletes one, as told by
+        the counters of counts() once they are read again"""
+        if isinstance(cls, str):
+            cls = classes[cls]
+        self.counts()
+        count = self.__counts.get(cls.__name__, 0)
+        query = select(func.max(cls.updated_at))
+        latest = self.__session.execute(query).scalar()
+        commits, modified = self.__versions.get(cls.__name__,
+                                                (0, self.__started))
+        if latest is not None and latest > modified:
+            modified = latest
+        # the commits of another process are not counted here: a fresh
+        # process leaves them out of the tag so that processes agree
+        local = "{}.{}".format(self.__run, commits) if commits else ""
+        return "{}.{}.{}".format(local, count, latest), modified
+
+    def page(self, cls, after_id=None, limit=None, load=None, **predicates):
+        """returns the list of at most limit cls objects with an id greater
+        than after_id, in id order: the keyset page after after_id, read
+        from the primary key index with no OFFSET to skip
+        predicates keep only the matching objects, as in filter(), and load
+        names relationships to load with them, as in all()"""
+        if isinstance(cls, str):
+            cls = classes[cls]
+        query = self.__query(cls, predicates).order_by(cls.id)
+        query = query.options(*self.__options(cls, load))
+        if after_id is not None:
+            query = query.filter(cls.id > after_id)
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
+
+    def stream(self, cls=None, size=1000):
+        """yields the cls objects, or those of every class, in id order,
+        fetching the rows size at a time from the database cursor"""
+        for clss in classes:
+            if cls is None or cls is classes[clss] or cls == clss:
+                query = self.__session.query(classes[clss])
+                yield from query.order_by(classes[clss].id).yield_per(size)
+
+    def search(self, search, after_id=None, limit=None):
+        """returns the list of at most limit places of the PlaceSearch
+        search after the place of id after_id, in id order or in the order
+        of search.sort, from a single query: places joined to their cities
+        for the states and cities, and kept when place_amenity holds all of
+        the amenities (GROUP BY place HAVING COUNT = number of amenities)
+        The area is a range on the (latitude, longitude) index; the places
+        of its box outside the circle of near are then dropped here
+        The ranges and the order are read from the indexes of the numbers;
+        a sorted page starts after the (value, id) of the place after_id"""
+        query = self.__session.query(Place)
+        if not search.everywhere:
+            query = query.join(City, Place.city_id == City.id).filter(
+                or_(City.state_id.in_(search.states),
+                    City.id.in_(search.cities)))
+        if search.amenities:
+            amenities = set(search.amenities)
+            place_amenity = Place.amenities.property.secondary
+            having = select(place_amenity.c.place_id).where(
+                place_amenity.c.amenity_id.in_(amenities)).group_by(
+                place_amenity.c.place_id).having(
+                func.count() == len(amenities))
+            query = query.filter(Place.id.in_(having))
+        if search.located:
+            query = query.filter(self.__within(search.bounds()))
+        for attr, (low, high) in search.ranges.items():
+            column = getattr(Place, attr)
+            if low is not None:
+                query = query.filter(column >= low)
+            if high is not None:
+                query = query.filter(column <= high)
+        if search.sort is not None:
+            query = self.__sort(query, search, after_id)
+            if query is None:
+                return []
+        else:
+            if after_id is not None:
+                query = query.filter(Place.id > after_id)
+            query = query.order_by(Place.id)
+        if search.near is None:
+            return query.all() if limit is None else query.limit(limit).all()
+        places = [place for place in query
+                  if search.contains(place.latitude, place.longitude)]
+        return places if limit is None else places[:limit]
+
+    def nearest(self, latitude, longitude, k=10, radius_km=None):
+        """returns the list of (distance in km, place) of the k places
+        nearest to the point (latitude, longitude), closest first, only
+        those within radius_km when it is given
+        The box around a circle is read from the (latitude, longitude)
+        index, and the circle grown until it holds k places"""
+        # half the circumference of the Earth: a circle holding it all
+        limit = 20016.0 if radius_km is None else radius_km
+        reach = min(self.nearest_reach, limit)
+        while True:
+            box = circle_bounds(latitude, longitude, reach)
+            places = self.__session.query(Place).filter(self.__within(box))
+            found = sorted(
+                ((d, place) for d, place in
+                 ((distance(latitude, longitude, place.latitude,
+                            place.longitude), place) for place in places)
+                 if d <= reach), key=lambda item: (item[0], item[1].id))
+            if len(found) >= k or reach >= limit:
+                return found[:k]
+            reach = min(reach * 4, limit)
+
+    def __sort(self, query, search, after_id):
+        """returns query ordered by (search.sort, id), or their reverse, and
+        starting after the place of id after_id, or None when there is no
+        such place"""
+        column = getattr(Place, search.sort)
+        if after_id is not None:
+            after = self.__session.get(Place, after_id)
+            if after is None:
+                return None
+            value = getattr(after, search.sort)
+            if search.descending:
+                query = query.filter(or_(column < value, and_(
+                    column == value, Place.id < after_id)))
+            else:
+                query = query.filter(or_(column > value, and_(
+                    column == value, Place.id > after_id)))
+        if search.descending:
+            return query.order_by(column.desc(), Place.id.desc())
+        return query.order_by(column, Place.id)
+
+    def text_search(self, query, limit=10):
+        """returns the list of (score, obj) of the at most limit places and
+        reviews whose words best match query, best first
+        MySQL ranks them with its FULLTEXT indexes; other databases return
+        the rows holding a word of query, ranked with BM25 like in file
+        storage, the average document length being that of those rows"""
+        words = set(tokenize(query))
+        if not words or limit < 1:
+            return []
+        if self.__engine.dialect.name == "mysql":
+            return self.__fulltext(query, limit)
+        index = TextIndex()
+        found = {}
+        for cls, attrs in self.texts.items():
+            columns = [getattr(cls, attr) for attr in attrs]
+            rows = self.__session.query(cls).filter(or_(
+                *[column.ilike("%{}%".format(word))
+                  for column in columns for word in words]))
+            for obj in rows:
+                key = "{}.{}".format(cls.__name__, obj.id)
+                found[key] = obj
+                texts = (getattr(obj, attr) for attr in attrs)
+                index.put(key, " ".join(text for text in texts
+                                        if isinstance(text, str)))
+        documents = sum(self.count(cls) for cls in self.texts)
+        return [(score, found[key])
+                for score, key in index.search(query, limit, documents)]
+
+    def __fulltext(self, query, limit):
+        """returns text_search() from MATCH ... AGAINST on the FULLTEXT
+        indexes of the texts"""
+        found = []
+        for cls, attrs in self.texts.items():
+            score = match(*[getattr(cls, attr) for attr in attrs],
+                          against=query)
+            rows = self.__session.query(cls, score).filter(score > 0) \
+                .order_by(score.desc()).limit(limit)
+            found.extend((float(relevance), obj) for obj, relevance in rows)
+        found.sort(key=lambda item: item[0], reverse=True)
+        return found[:limit]
+
+    @staticmethod
+    def __within(bounds):
+        """returns the clause keeping the places in the (south, west, north,
+        east) box, which crosses the antimeridian when west > east"""
+        south, west, north, east = bounds
+        latitude = Place.latitude.between(south, north)
+        if west <= east:
+            return and_(latitude, Place.longitude.between(west, east))
+        return and_(latitude,
+                    or_(Place.longitude >= west, Place.longitude <= east))
+
+    def filter(self, cls, **predicates):
+        """returns the list of cls objects matching every predicate:
+        attr=value, attr=[values] or attr__lt, __lte, __gt, __gte=number"""
+        return self.__query(cls, predicates).all()
+
+    @staticmethod
+    def __options(cls, load):
+        """returns the loader options of load for a query of cls
+        load is a list of relationship paths such as "cities" or
+        "places.amenities", loaded with selectin, or a dictionary of such
+        paths to their strategy in loaders; paths not starting with a
+        relationship of cls are skipped, so all() can load them per class"""
+        if not load:
+            return []
+        if not isinstance(load, dict):
+            load = dict.fromkeys(load, "selectin")
+        options = []
+        for path, strategy in load.items():
+            attrs = path.split(".")
+            if not hasattr(cls, attrs[0]):
+                continue
+            option = None
+            klass = cls
+            for attr in attrs:
+                relationship = getattr(klass, attr)
+                if option is None:
+                    option = loaders[strategy](relationship)
+                else:
+                    option = getattr(option, strategy + "load")(relationship)
+                klass = relationship.property.mapper.class_
+            options.append(option)
+        return options
+
+    def __query(self, cls, predicates):
+        """returns the query of the cls objects matching the predicates"""
+        query = self.__session.query(cls)
+        for predicate, value in predicates.items():
+            attr, op = parse_predicate(predicate, value)
+            column = getattr(cls, attr)
+            if op == "in":
+                query = query.filter(column.in_(value))
+            else:
+                query = query.filter(comparators[op](column, value))
+        return query
 
     def count(self, cls=None):
-        """count the number of objects in storage"""
-        objs = self.all(cls)
-        all_count = len(objs)
-        return (all_count)
+        """count the number of objects in storage, as counts() does; 0 for
+        a class that is not stored, such as BaseModel, or an unknown name"""
+        if cls is None:
+            return sum(self.counts().values())
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        return self.counts().get(cls, 0)
+
+    def counts(self):
+        """returns {class name: number of objects} for every class, from
+        counters the commits of this process keep up to date, plus the
+        changes of the session not committed yet
+        Every count_ttl seconds the counters are read again, from a single
+        UNION ALL of SELECT COUNT(*) queries, to take in the writes of other
+        processes"""
+        session = self.__session()
+        if self.__counts is None or \
+                monotonic() - self.__counted >= self.count_ttl:
+            query = union_all(*[select(literal(name), func.count())
+                                .select_from(classes[name].__table__)
+                                for name in classes])
+            # the query flushes the session first: what it flushed is not
+            # committed yet, so it is taken back out of the counters
+            counts = dict(session.execute(query).all())
+            for name, delta in session.info.get("counted", {}).items():
+                counts[name] -= delta
+            self.__counts = counts
+            self.__counted = monotonic()
+        deltas = dict(session.info.get("counted", {}))
+        self.__tally(session, deltas)
+        return {name: count + deltas.get(name, 0)
+                for name, count in self.__counts.items()}
 
     def new(self, obj):
         """add the object to the current database session"""
@@ -74,7 +515,28 @@ class DBStorage:
 
     def save(self):
         """commit all changes of the current database session"""
-        self.__session.commit()
+        if not self.__session.info.get("batches"):
+            self.__session.commit()
+
+    @contextmanager
+    def batch(self):
+        """defers every save() inside the block to a single commit when the
+        outermost block exits; rolls the session back if it raises
+        The depth of the blocks is kept in the session, which belongs to
+        the thread, so the batches of concurrent requests do not mix"""
+        info = self.__session.info
+        batches = info.get("batches", 0)
+        info["batches"] = batches + 1
+        try:
+            yield self
+        except BaseException:
+            info["batches"] = batches
+            if not batches:
+                self.__session.rollback()
+            raise
+        info["batches"] = batches
+        if not batches:
+            self.save()
 
     def delete(self, obj=None):
         """delete from the current database session obj if not None"""
@@ -84,10 +546,36 @@ class DBStorage:
     def reload(self):
         """reloads data from the database"""
         Base.metadata.create_all(self.__engine)
+        self.migrate()
         sess_factory = sessionmaker(bind=self.__engine, expire_on_commit=False)
+        event.listen(sess_factory, "after_begin", self.__begun)
+        event.listen(sess_factory, "after_flush", self.__flushed)
+        event.listen(sess_factory, "after_commit", self.__committed)
+        event.listen(sess_factory, "after_soft_rollback", self.__settled)
         Session = scoped_session(sess_factory)
         self.__session = Session
 
+    def migrate(self):
+        """creates the indexes declared on the models that the tables of an
+        existing schema lack, create_all() only indexing the tables it
+        creates; returns the names of the indexes created"""
+        created = []
+        inspector = sqlalchemy.inspect(self.__engine)
+        for table in Base.metadata.sorted_tables:
+            existing = {index["name"]
+                        for index in inspector.get_indexes(table.name)}
+            missing = [index for index in table.indexes
+                       if index.name not in existing]
+            for index in missing:
+                index.create(self.__engine)
+            if missing:
+                # the indexes of other dialects are skipped by create()
+                after = sqlalchemy.inspect(self.__engine).get_indexes(
+                    table.name)
+                created.extend(sorted({index["name"] for index in after} -
+                                      existing))
+        return created
+
     def close(self):
         """call remove() method on the private session attribute"""
         self.__session.remove()
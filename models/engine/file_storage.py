@@ -3,14 +3,26 @@
 Contains the FileStorage class
 """
 
-import json
+from bisect import bisect_right
+from contextlib import contextmanager
+from datetime import datetime
+from itertools import chain, islice
 from models.amenity import Amenity
-from models.base_model import BaseModel
+from models.base_model import BaseModel, attached
 from models.city import City
+from models.engine import codec
+from models.engine.bitmaps import Bitmaps
+from models.engine.columns import Table, matches, parse_predicate
+from models.engine.geo import Grid
+from models.engine.sorted_index import SortedIndex
+from models.engine.text_index import TextIndex
 from models.place import Place
 from models.review import Review
 from models.state import State
 from models.user import User
+from os import getenv, path, remove, replace, stat
+from threading import local
+from uuid import uuid4
 
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
@@ -23,88 +35,253 @@ class FileStorage:
     __file_path = "file.json"
     # dictionary - empty but will store all objects by <class name>.id
     __objects = {}
+    # dictionary - <class name> -> {<class name>.id: obj}, mirrors __objects
+    __classes = {}
+    # dictionary - (<class name>, <attribute>) -> {<parent id>: {key: None}}
+    __children = {}
+    # dictionary - <class name> -> sorted list of the keys of the class,
+    # rebuilt by page() after an object of the class is added or removed
+    __order = {}
+    # dictionary - <class name> -> Table of the attributes in columns
+    __tables = {}
+    # dictionary - (<class name>, <attribute>) -> Bitmaps of the attributes
+    # in inverted
+    __inverted = {}
+    # dictionary - <class name> -> Grid of the points in located
+    __grids = {}
+    # dictionary - (<class name>, <attribute>) -> SortedIndex of the
+    # attributes in ordered
+    __sorted = {}
+    # dictionary - (<class name>, <attribute>) -> {<class name>.id: value,
+    # None once dropped} of the ordered numbers reload() builds their
+    # SortedIndex from at once; None outside reload()
+    __pending = None
+    # TextIndex - the words of the attributes in texts, by <class name>.id
+    __text = TextIndex()
+    # set - <class name>.id of the documents read from the text index file
+    # by reload, which their objects need not tokenize again
+    __preindexed = set()
+    # string - generation of the text index file last read or written
+    __generation = None
+    # int - number of records of that generation in the text index journal
+    __text_journaled = 0
+    # dictionary - <class name> -> {<class name>.id: record} of the objects
+    # read by a lazy reload but not built yet
+    __raw = {}
+    # dictionary - <class name> -> {<class name>.id: None} of the raw
+    # records whose Table row, Bitmaps, Grid point, SortedIndex and
+    # TextIndex entries are built by the first query that needs them
+    __unindexed = {}
+    # dictionary - <class name>.id -> obj, or None once deleted, since save
+    __changes = {}
+    # dictionary - <class name>.id -> (obj, JSON text of obj.to_dict())
+    __encoded = {}
+    # int - number of records in the journal file
+    __journaled = 0
+    # tuple - stat of the JSON file and journal when last read or written
+    __stamp = None
+    # local - per thread, batches: depth of the batch() blocks save() is
+    # deferred by in that thread
+    __local = local()
+    # dictionary - <class name> -> (number of changes, datetime of the
+    # last one) of its objects, as version() reports them
+    __versions = {}
+    # string - token of this process in the tags of version()
+    __run = uuid4().hex[:8]
+    # datetime - when this process started, the last change of a class
+    # that never changed
+    __started = datetime.now()
+    # append changes to a journal next to __file_path instead of rewriting it
+    journal = getenv("HBNB_FILE_JOURNAL") == "1"
+    # number of journal records after which save() writes a new snapshot
+    journal_limit = int(getenv("HBNB_JOURNAL_LIMIT") or 10000)
+    # keep reloaded records raw and build objects on first access
+    lazy = getenv("HBNB_FILE_LAZY") == "1"
+    # attributes kept in a Table for filter(), by class name: the numbers,
+    # then the values only compared for equality
+    columns = {"City": ((), ("state_id",)),
+               "Place": (("number_rooms", "number_bathrooms", "max_guest",
+                          "price_by_night", "latitude", "longitude"),
+                         ("city_id", "user_id")),
+               "Review": ((), ("place_id", "user_id"))}
+    # foreign keys kept in __children, by class name
+    foreign_keys = {"City": ("state_id",),
+                    "Place": ("city_id", "user_id"),
+                    "Review": ("place_id", "user_id")}
+    # lists of ids kept in an inverted index of Bitmaps, by class name
+    inverted = {"Place": ("amenity_ids",)}
+    # (latitude, longitude) attributes kept in a Grid, by class name
+    located = {"Place": ("latitude", "longitude")}
+    # side in degrees of the cells of the Grids
+    grid_size = float(getenv("HBNB_GRID_SIZE") or 0.1)
+    # numbers kept in a SortedIndex for ranges and orders, by class name
+    ordered = {"Place": ("price_by_night", "max_guest", "number_rooms",
+                         "number_bathrooms")}
+    # attributes whose words are kept in the TextIndex, by class name
+    texts = {"Place": ("name", "description"), "Review": ("text",)}
 
-    def all(self, cls=None):
-        """returns the dictionary __objects"""
-        if cls is not None:
-            new_dict = {}
-            for key, value in self.__objects.items():
-                if cls == value.__class__ or cls == value.__class__.__name__:
-                    new_dict[key] = value
-            return new_dict
-        return self.__objects
-    '''
-
-    def all(self, cls=None):
-        """Returns a dictionary of models currently in storage"""
+    def all(self, cls=None, load=None):
+        """returns the dictionary __objects, or a new dictionary of the
+        objects of one class when cls is given, which its caller may change
+        or delete objects of storage while walking
+        load is accepted for DBStorage compatibility: relationships are
+        index lookups here, with no query per object to save"""
         if cls is None:
+            for name in self.__raw:
+                self.__hydrate_all(name)
             return self.__objects
-        cls_name = cls.__name__
-        dct = {}
-        for key in self.__objects.keys():
-            if key.split('.')[0] == cls_name:
-                dct[key] = self.__objects[key]
-        return dct
-    '''
+        name = self.__name(cls)
+        self.__hydrate_all(name)
+        return dict(self.__classes.get(name, {}))
 
     def new(self, obj):
         """sets in __objects the obj with key <obj class name>.id"""
         if obj is not None:
             key = obj.__class__.__name__ + "." + obj.id
-            self.__objects[key] = obj
+            self.__add(key, obj)
+            self.__changes[key] = obj
 
     def save(self):
-        """serializes __objects to the JSON file (path: __file_path)"""
-        json_objects = {}
-        for key in self.__objects:
-            json_objects[key] = self.__objects[key].to_dict()
-        with open(self.__file_path, 'w') as f:
-            json.dump(json_objects, f)
+        """serializes __objects to the JSON file (path: __file_path)
+        In journal mode, only appends the objects changed since the last
+        save and compacts once the journal reaches journal_limit records"""
+        if getattr(self.__local, "batches", 0):
+            return
+        if not self.journal:
+            self.compact()
+            return
+        if not self.__changes:
+            return
+        with open(self.__file_path + ".log", 'a', encoding='utf-8') as f:
+            for key, obj in self.__changes.items():
+                text = "null" if obj is None else self.__encode(key, obj)
+                f.write('{"key": ' + codec.dumps(key) +
+                        ', "obj": ' + text + '}\n')
+        self.__journaled += len(self.__changes)
+        self.__changes.clear()
+        if self.__journaled >= self.journal_limit:
+            self.compact()
+        else:
+            self.__stamp = self.__stat()
+
+    @contextmanager
+    def batch(self):
+        """defers every save() inside the block to a single one when the
+        outermost block exits; nothing is written if it raises"""
+        batches = getattr(self.__local, "batches", 0)
+        self.__local.batches = batches + 1
+        try:
+            yield self
+        finally:
+            self.__local.batches = batches
+        if not batches and self.__changes:
+            self.save()
+
+    def compact(self):
+        """writes every object to a new snapshot of __file_path and drops
+        the journal it supersedes
+        Only objects changed since they were last written are encoded again,
+        the others reuse their cached JSON text"""
+        parts = []
+        raw = (records.items() for records in self.__raw.values())
+        for key, obj in chain(self.__objects.items(), *raw):
+            cached = self.__encoded.get(key)
+            if cached is None or cached[0] is not obj or key in self.__changes:
+                text = self.__encode(key, obj)
+            else:
+                text = cached[1]
+            parts.append(codec.dumps(key) + ": " + text)
+        with open(self.__file_path + ".tmp", 'w', encoding='utf-8') as f:
+            f.write("{" + ", ".join(parts) + "}")
+        replace(self.__file_path + ".tmp", self.__file_path)
+        if path.exists(self.__file_path + ".log"):
+            remove(self.__file_path + ".log")
+        self.__journaled = 0
+        self.__changes.clear()
+        self.__stamp = self.__stat()
+        self.__write_text()
+
+    def version(self, cls):
+        """returns the (tag, datetime of the last change) of the cls
+        objects, the tag changing whenever one of them is added, deleted or
+        set an attribute"""
+        name = self.__name(cls)
+        count, modified = self.__versions.get(name, (0, self.__started))
+        return "{}.{}".format(self.__run, count), modified
+
+    def dirty_count(self):
+        """returns the number of objects changed or deleted since the last
+        save, i.e. what the next save() has to encode"""
+        return len(self.__changes)
 
     def reload(self):
-        """deserializes the JSON file to __objects"""
+        """deserializes the JSON file to __objects, then replays the
+        journal on top of it
+        In lazy mode the records are kept as read and an object is only
+        built when it is first asked for; in both modes the Tables, Bitmaps,
+        Grids, SortedIndexes and TextIndex entries of what is read are only
+        built by the first query that needs them
+        Nothing is read when the files are unchanged since they were last
+        read or written and no object has changed in the meantime"""
+        stamp = self.__stat()
+        if stamp == self.__stamp and not self.__changes:
+            return
+        self.__stamp = stamp
         try:
-            with open(self.__file_path, 'r') as f:
-                jo = json.load(f)
-            for key in jo:
-                self.__objects[key] = classes[jo[key]["__class__"]](**jo[key])
+            with open(self.__file_path, 'r', encoding='utf-8') as f:
+                jo = codec.loads(f.read())
+        except Exception as e:
+            jo = {}
+        replayed = self.__replay()
+        if not len(self.__text):
+            self.__read_text(stamp[0], replayed)
+        jo.update(replayed)
+        self.__pending = {}
+        try:
+            for key, value in jo.items():
+                self.__changes.pop(key, None)
+                if value is None:
+                    self.__discard(key)
+                elif self.lazy:
+                    self.__discard(key)
+                    self.__stash(key, value)
+                else:
+                    self.__add(key, classes[value["__class__"]](**value),
+                               indexed=False)
         except Exception as e:
             pass
+        self.__build_sorted()
+        self.__preindexed.intersection_update(
+            chain.from_iterable(self.__unindexed.values()))
 
     def delete(self, obj=None):
         """delete obj from __objects if it’s inside"""
         if obj is not None:
             key = obj.__class__.__name__ + '.' + obj.id
             if key in self.__objects:
-                del self.__objects[key]
+                self.__remove(key)
+                self.__changes[key] = None
 
     def close(self):
         """call reload() method for deserializing the JSON file to objects"""
         self.reload()
 
-    def get(self, cls, id):
+    def get(self, cls, id, load=None):
         """retrieves and returns an object based on ID
         Or None if not found
         cls: class
-        id: string representation of object ID"""
-        dct = {}
+        id: string representation of object ID
+        load: ignored, as in all()"""
         # Checks if id has been provided
-        if not id:
+        if not id or cls is None:
             return None
 
         # Checks if class exists
-        if cls.__name__ not in classes.keys():
+        name = self.__name(cls)
+        if name not in classes:
             return None
 
-        try:
-            for key, value in self.__objects.items():
-                if value.__class__ == cls and value.id == id:
-                    return value
-
-        except Exception as e:
-            pass
-
-        return None
+        return self.__load("{}.{}".format(name, id))
 
     def count(self, cls=None):
         """
@@ -112,19 +289,542 @@ class FileStorage:
         Returns the number of objects in storage matching the given class.
         If no class is passed, returns the count of all objects in storage.
         """
-        # Initialize counter to zero
-        count = 0
-
-        # If class name is not defined, count all objects in storage
         if cls is None:
-            for objs in self.__objects:
-                return len(self.__objects)
+            raw = sum(len(records) for records in self.__raw.values())
+            return len(self.__objects) + raw
+        name = self.__name(cls)
+        raw = len(self.__raw.get(name, {}))
+        return len(self.__classes.get(name, {})) + raw
+
+    def counts(self):
+        """returns {class name: number of objects} for every class"""
+        return {name: self.count(name) for name in classes}
+
+    def page(self, cls, after_id=None, limit=None, load=None, **predicates):
+        """returns the list of at most limit cls objects with an id greater
+        than after_id, in id order: the keyset page after after_id
+        predicates keep only the matching objects, as in filter(); load is
+        ignored, as in all()"""
+        name = self.__name(cls)
+        if predicates:
+            objs = sorted(self.filter(name, **predicates),
+                          key=lambda obj: obj.id)
+            if after_id is not None:
+                objs = [obj for obj in objs if obj.id > after_id]
+            return objs if limit is None else objs[:limit]
+        return self.__slice(name, self.__keys(name), after_id, limit)
+
+    def stream(self, cls=None, size=1000):
+        """yields the cls objects, or those of every class, in id order,
+        building them size at a time"""
+        for name in classes if cls is None else [self.__name(cls)]:
+            after_id = None
+            while True:
+                objs = self.page(name, after_id, size)
+                yield from objs
+                if len(objs) < size:
+                    break
+                after_id = objs[-1].id
+
+    def related(self, cls, attr, value):
+        """returns the list of cls objects whose attribute attr is value,
+        e.g. related(City, "state_id", state.id) for the cities of a state,
+        or holds value when it is an inverted list such as amenity_ids"""
+        name = self.__name(cls)
+        if attr in self.inverted.get(name, ()):
+            self.__index(name)
+            index = self.__inverted.get((name, attr))
+            return self.__load_all(index.select([value]) if index else [])
+        if attr not in self.foreign_keys.get(name, ()):
+            self.__hydrate_all(name)
+            return [obj for obj in self.__classes.get(name, {}).values()
+                    if getattr(obj, attr, None) == value]
+        keys = self.__children.get((name, attr), {}).get(value, {})
+        return self.__load_all(keys)
+
+    def search(self, search, after_id=None, limit=None):
+        """returns the list of at most limit places of the PlaceSearch
+        search after the place of id after_id, in id order or in the order
+        of search.sort
+        The places of the amenities come from intersecting their bitmaps,
+        the cities of the states and their places from the foreign key
+        indexes, the places of the area from the cells of the Grid it
+        covers, the places of the ranges and their order from the sorted
+        indexes; only the places returned are built"""
+        self.__index("Place")
+        keys = None
+        if not search.everywhere:
+            cities = set(search.cities)
+            states = self.__children.get(("City", "state_id"), {})
+            for state_id in search.states:
+                cities.update(key[5:] for key in states.get(state_id, {}))
+            places = self.__children.get(("Place", "city_id"), {})
+            keys = {key for city_id in cities
+                    for key in places.get(city_id, {})}
+        if search.located:
+            grid = self.__grids.get("Place")
+            inside = grid.within(*search.bounds()) if grid else []
+            inside = {key for key in inside
+                      if search.contains(*grid.points[key][:2])}
+            keys = inside if keys is None else keys & inside
+        for attr, (low, high) in search.ranges.items():
+            index = self.__sorted.get(("Place", attr), SortedIndex())
+            keys = set(index.range(low, high, keys))
+        if search.amenities:
+            index = self.__inverted.get(("Place", "amenity_ids"))
+            keys = index.select(search.amenities, keys) if index else []
+        if search.sort is not None:
+            index = self.__sorted.get(("Place", search.sort), SortedIndex())
+            after = None if after_id is None else "Place." + after_id
+            found = index.walk(after, search.descending)
+            if keys is not None:
+                keys = set(keys)
+                found = (key for key in found if key in keys)
+            return self.__load_all(islice(found, limit))
+        if keys is None:
+            keys = self.__keys("Place")
+        else:
+            keys = sorted(keys)
+        return self.__slice("Place", keys, after_id, limit)
+
+    def nearest(self, latitude, longitude, k=10, radius_km=None):
+        """returns the list of (distance in km, place) of the k places
+        nearest to the point (latitude, longitude), closest first, only
+        those within radius_km when it is given
+        Only the cells of the Grid around the point are visited, ring after
+        ring, until no place further out can be nearer"""
+        self.__index("Place")
+        grid = self.__grids.get("Place")
+        if grid is None:
+            return []
+        found = grid.nearest(latitude, longitude, k, radius_km)
+        return [(d, place) for d, place in
+                ((d, self.__load(key)) for d, key in found)
+                if place is not None]
+
+    def text_search(self, query, limit=10):
+        """returns the list of (score, obj) of the at most limit places and
+        reviews whose words best match query, best first, ranked with BM25
+        from the postings of the words of query only"""
+        for name in self.texts:
+            self.__index(name)
+        found = ((score, self.__load(key))
+                 for score, key in self.__text.search(query, limit))
+        return [(score, obj) for score, obj in found if obj is not None]
+
+    def filter(self, cls, **predicates):
+        """returns the list of cls objects matching every predicate:
+        attr=value, attr=[values] or attr__lt, __lte, __gt, __gte=number
+        The predicates on columns are evaluated over the whole Table at once
+        and only the matching objects are built; the others are checked on
+        those objects"""
+        name = self.__name(cls)
+        self.__index(name)
+        table = self.__tables.get(name)
+        if table is None:
+            self.__hydrate_all(name)
+            objs = list(self.__classes.get(name, {}).values())
+        else:
+            keys, predicates = table.select(predicates)
+            objs = self.__load_all(keys)
+        tests = [parse_predicate(p, v) + (v,) for p, v in predicates.items()]
+        return [obj for obj in objs
+                if all(matches(getattr(obj, attr, None), op, value)
+                       for attr, op, value in tests)]
+
+    def changed(self, obj, attr, old):
+        """called by BaseModel when attr of obj is set; records the change
+        and moves a stored object to its new parent in the reverse indexes"""
+        name = obj.__class__.__name__
+        key = "{}.{}".format(name, getattr(obj, "id", None))
+        if self.__objects.get(key) is not obj:
+            return
+        self.__changes[key] = obj
+        self.__touch(name)
+        if key in self.__unindexed.get(name, {}):
+            if attr in self.texts.get(name, ()):
+                self.__preindexed.discard(key)
+        elif name in self.__tables:
+            self.__tables[name].set(key, attr, getattr(obj, attr, None))
+        if attr in self.inverted.get(name, ()):
+            self.__inverted.setdefault((name, attr), Bitmaps()).put(
+                key, getattr(obj, attr, None))
+        if attr in self.located.get(name, ()):
+            self.__locate(name, key, vars(obj))
+        if attr in self.ordered.get(name, ()):
+            self.__sorted.setdefault((name, attr), SortedIndex()).put(
+                key, getattr(obj, attr, None))
+        if attr in self.texts.get(name, ()):
+            self.__index_text(name, key, lambda attr: getattr(obj, attr, None))
+        if attr not in self.foreign_keys.get(name, ()):
+            return
+        self.__unlink(name, attr, old, key)
+        self.__link(name, attr, getattr(obj, attr, None), key)
+
+    def __encode(self, key, obj):
+        """returns the JSON text of obj.to_dict(), or of a raw record, and
+        caches it under key"""
+        text = codec.dumps(obj if type(obj) is dict else
+                           obj.to_dict(native=True))
+        self.__encoded[key] = (obj, text)
+        return text
 
-        # Else, iterate and check class name of individual objects and compare
+    def __load(self, key):
+        """returns the object stored under key, building it if it is still
+        a raw record, or None"""
+        obj = self.__objects.get(key)
+        if obj is None and key in self.__raw.get(key.split(".", 1)[0], {}):
+            obj = self.__hydrate(key)
+        return obj
+
+    def __keys(self, name):
+        """returns the sorted list of the keys of the class called name,
+        which is their id order"""
+        keys = self.__order.get(name)
+        if keys is None:
+            keys = sorted(chain(self.__classes.get(name, {}),
+                                self.__raw.get(name, {})))
+            self.__order[name] = keys
+        return keys
+
+    def __slice(self, name, keys, after_id, limit):
+        """returns the objects of the at most limit keys after the key of
+        after_id in keys, sorted keys of the class called name"""
+        start = 0
+        if after_id is not None:
+            start = bisect_right(keys, "{}.{}".format(name, after_id))
+        end = len(keys) if limit is None else start + limit
+        return self.__load_all(keys[start:end])
+
+    def __load_all(self, keys):
+        """returns the objects stored under keys, skipping the keys that
+        hold none"""
+        objs = (self.__load(key) for key in keys)
+        return [obj for obj in objs if obj is not None]
+
+    def __hydrate(self, key):
+        """builds the object of a raw record; it keeps the record's place
+        in the reverse indexes"""
+        name = key.split(".", 1)[0]
+        record = self.__raw[name].pop(key)
+        obj = classes[record["__class__"]](**record)
+        self.__objects[key] = obj
+        attached.add(id(obj))
+        self.__classes.setdefault(name, {})[key] = obj
+        return obj
+
+    def __hydrate_all(self, name):
+        """builds every raw record of the class called name"""
+        for key in list(self.__raw.get(name, {})):
+            self.__hydrate(key)
+
+    def __stash(self, key, record):
+        """stores a raw record under key and links it in the reverse
+        indexes; the other indexes wait for __index()"""
+        name = key.split(".", 1)[0]
+        self.__raw.setdefault(name, {})[key] = record
+        self.__order.pop(name, None)
+        self.__touch(name)
+        for attr in self.foreign_keys.get(name, ()):
+            self.__link(name, attr, self.__value(record, attr), key)
+        self.__unindexed.setdefault(name, {})[key] = None
+
+    def __discard(self, key):
+        """drops key, whether it holds an object or a raw record"""
+        name = key.split(".", 1)[0]
+        if key in self.__objects:
+            self.__remove(key)
+        elif key in self.__raw.get(name, {}):
+            record = self.__raw[name].pop(key)
+            self.__encoded.pop(key, None)
+            self.__order.pop(name, None)
+            self.__touch(name)
+            for attr in self.foreign_keys.get(name, ()):
+                self.__unlink(name, attr, self.__value(record, attr), key)
+            self.__unindex(name, key)
+
+    @staticmethod
+    def __value(record, attr):
+        """returns attr of a raw record as its object would have it"""
+        if attr in record:
+            return record[attr]
+        cls = classes[record["__class__"]]
+        if hasattr(cls, "_defaults"):
+            return cls._defaults.get(attr)
+        return getattr(cls, attr, None)
+
+    def __stat(self):
+        """returns the (mtime, size) of the JSON file and of the journal"""
+        stamp = ()
+        for name in (self.__file_path, self.__file_path + ".log"):
+            try:
+                st = stat(name)
+                stamp += ((st.st_mtime_ns, st.st_size),)
+            except OSError:
+                stamp += (None,)
+        return stamp
+
+    def __replay(self):
+        """returns the journal records as {key: object dict or None},
+        last record winning, and counts them in __journaled"""
+        records = {}
+        self.__journaled = 0
+        if not path.exists(self.__file_path + ".log"):
+            return records
+        with open(self.__file_path + ".log", 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = codec.loads(line)
+                except ValueError:
+                    continue
+                records[record["key"]] = record["obj"]
+                self.__journaled += 1
+        return records
+
+    @staticmethod
+    def __name(cls):
+        """returns the class name of cls, which may be a class or a string"""
+        if isinstance(cls, str):
+            return cls
+        return cls.__name__
+
+    def __add(self, key, obj, indexed=True):
+        """stores obj under key in __objects and in the indexes, the
+        reverse indexes only when indexed is False: __index() builds the
+        others once a query needs them"""
+        old = self.__objects.get(key)
+        if old is obj:
+            return
+        name = key.split(".", 1)[0]
+        self.__touch(name)
+        if old is None:
+            self.__discard(key)
+            self.__order.pop(name, None)
+        attrs = self.foreign_keys.get(name, ())
+        if old is not None:
+            attached.discard(id(old))
+            for attr in attrs:
+                self.__unlink(name, attr, getattr(old, attr, None), key)
+        self.__objects[key] = obj
+        attached.add(id(obj))
+        self.__classes.setdefault(name, {})[key] = obj
+        for attr in attrs:
+            self.__link(name, attr, getattr(obj, attr, None), key)
+        if not indexed:
+            if old is not None:
+                self.__unindex(name, key)
+            self.__unindexed.setdefault(name, {})[key] = None
+            return
+        if self.__unindexed.get(name, {}).pop(key, 0) is None:
+            self.__preindexed.discard(key)
+        self.__tabulate(name, key, lambda attr: getattr(obj, attr, None),
+                        vars(obj))
+
+    def __remove(self, key):
+        """drops key from __objects and from the indexes"""
+        obj = self.__objects.pop(key)
+        attached.discard(id(obj))
+        self.__encoded.pop(key, None)
+        name = key.split(".", 1)[0]
+        self.__classes.get(name, {}).pop(key, None)
+        self.__order.pop(name, None)
+        self.__touch(name)
+        for attr in self.foreign_keys.get(name, ()):
+            self.__unlink(name, attr, getattr(obj, attr, None), key)
+        self.__unindex(name, key)
+
+    def __touch(self, name):
+        """counts a new version of the objects of class name"""
+        count = self.__versions.get(name, (0,))[0]
+        self.__versions[name] = (count + 1, datetime.now())
+
+    def __index(self, name):
+        """builds at once the indexes __stash() left out of the records of
+        the class called name, and of the objects built from them since"""
+        keys = self.__unindexed.pop(name, None)
+        if not keys:
+            return
+        records = self.__raw.get(name, {})
+        self.__pending = {}
+        for key in keys:
+            if key in records:
+                record = records[key]
+                self.__tabulate(name, key,
+                                lambda attr: self.__value(record, attr),
+                                record)
+            else:
+                obj = self.__objects[key]
+                self.__tabulate(name, key,
+                                lambda attr: getattr(obj, attr, None),
+                                vars(obj))
+        self.__build_sorted()
+
+    def __unindex(self, name, key):
+        """drops key from the indexes, unless they left it out"""
+        if self.__unindexed.get(name, {}).pop(key, 0) is None:
+            self.__preindexed.discard(key)
         else:
-            for key, value in self.__objects.items():
-                objs_cls = key.split(".")[0]
-                if cls.__name__ == objs_cls:
-                    count += 1
+            self.__untabulate(name, key)
+
+    def __build_sorted(self):
+        """builds each SortedIndex from its values in __pending at once,
+        then ends __pending"""
+        pending, self.__pending = self.__pending, None
+        for (name, attr), values in pending.items():
+            self.__sorted.setdefault((name, attr), SortedIndex()).build(
+                values.items())
+
+    def __tabulate(self, name, key, get, values):
+        """writes the row of key in the Table of its class, if it has one,
+        its inverted lists in their Bitmaps, its point in its Grid and its
+        ordered numbers in their SortedIndex, or in __pending while it is
+        open, and its words in the TextIndex
+        get(attr) gives the value of attr, class defaults included, values
+        only the attributes set on key: its record or its object's vars"""
+        for attr in self.inverted.get(name, ()):
+            self.__inverted.setdefault((name, attr), Bitmaps()).put(
+                key, get(attr))
+        for attr in self.ordered.get(name, ()):
+            if self.__pending is not None:
+                self.__pending.setdefault((name, attr), {})[key] = get(attr)
+            else:
+                self.__sorted.setdefault((name, attr), SortedIndex()).put(
+                    key, get(attr))
+        if name in self.located:
+            self.__locate(name, key, values)
+        if name in self.texts:
+            if key in self.__preindexed:
+                self.__preindexed.discard(key)
+            else:
+                self.__index_text(name, key, get)
+        if name not in self.columns:
+            return
+        if name not in self.__tables:
+            self.__tables[name] = Table(*self.columns[name])
+        self.__tables[name].put(key, get)
+
+    def __untabulate(self, name, key):
+        """drops key from the Table of its class, from its Bitmaps, its
+        Grid, its SortedIndex and the TextIndex"""
+        for attr in self.inverted.get(name, ()):
+            if (name, attr) in self.__inverted:
+                self.__inverted[(name, attr)].drop(key)
+        for attr in self.ordered.get(name, ()):
+            if self.__pending is not None:
+                self.__pending.setdefault((name, attr), {})[key] = None
+            elif (name, attr) in self.__sorted:
+                self.__sorted[(name, attr)].drop(key)
+        if name in self.texts:
+            self.__text.drop(key)
+            self.__preindexed.discard(key)
+        if name in self.__grids:
+            self.__grids[name].drop(key)
+        if name in self.__tables:
+            self.__tables[name].drop(key)
+
+    def __locate(self, name, key, values):
+        """puts key at its point in the Grid of its class, from values, the
+        attributes set on key: the default 0.0 coordinates of a Place that
+        was never located are no point, as the NULL ones in the database"""
+        if name not in self.__grids:
+            self.__grids[name] = Grid(self.grid_size)
+        latitude, longitude = self.located[name]
+        self.__grids[name].put(key, values.get(latitude),
+                               values.get(longitude))
+
+    def __index_text(self, name, key, get):
+        """puts the words of the texts of key in the TextIndex"""
+        words = (get(attr) for attr in self.texts[name])
+        self.__text.put(key, " ".join(text for text in words
+                                      if isinstance(text, str)))
+
+    def __write_text(self):
+        """writes the documents of the TextIndex changed since it was last
+        written next to __file_path, then the stamp tying it to the JSON
+        file
+        The changed documents are appended to the journal of the index; the
+        whole index is written under a new generation, and its journal
+        dropped, only when there is none yet or the journal would reach
+        journal_limit records. The stamp comes last, so a crash in between
+        leaves a stamp the index does not match"""
+        text = self.__text
+        if self.__generation is None or \
+                self.__text_journaled + len(text.changes) >= \
+                self.journal_limit:
+            self.__generation = str(uuid4())
+            with open(self.__file_path + ".text.tmp", 'w',
+                      encoding='utf-8') as f:
+                f.write('{"generation": ' + codec.dumps(self.__generation) +
+                        ', "terms": ' + text.dumps() + '}')
+            replace(self.__file_path + ".text.tmp",
+                    self.__file_path + ".text")
+            if path.exists(self.__file_path + ".text.log"):
+                remove(self.__file_path + ".text.log")
+            self.__text_journaled = 0
+        elif text.changes:
+            generation = codec.dumps(self.__generation)
+            with open(self.__file_path + ".text.log", 'a',
+                      encoding='utf-8') as f:
+                for key in text.changes:
+                    f.write('{"generation": ' + generation + ', "key": ' +
+                            codec.dumps(key) + ', "terms": ' +
+                            text.encode(key) + '}\n')
+            self.__text_journaled += len(text.changes)
+        text.changes.clear()
+        text.changed = False
+        with open(self.__file_path + ".text.stamp", 'w',
+                  encoding='utf-8') as f:
+            f.write(codec.dumps({"generation": self.__generation,
+                                 "snapshot": self.__stamp[0]}))
+
+    def __read_text(self, snapshot, replayed):
+        """fills the empty TextIndex from the text index file and the records
+        of its generation in its journal when its stamp matches snapshot,
+        the stat of the JSON file being read; the keys of the journal
+        records replayed are left to be tokenized again"""
+        try:
+            with open(self.__file_path + ".text.stamp", 'r',
+                      encoding='utf-8') as f:
+                stamp = codec.loads(f.read())
+            if snapshot is None or stamp["snapshot"] != list(snapshot):
+                return
+            with open(self.__file_path + ".text", 'r', encoding='utf-8') as f:
+                index = codec.loads(f.read())
+            if index["generation"] != stamp["generation"]:
+                return
+        except Exception as e:
+            return
+        terms = index["terms"]
+        self.__text_journaled = 0
+        if path.exists(self.__file_path + ".text.log"):
+            with open(self.__file_path + ".text.log", 'r',
+                      encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = codec.loads(line)
+                    except ValueError:
+                        continue
+                    if record["generation"] == index["generation"]:
+                        terms[record["key"]] = record["terms"]
+                        self.__text_journaled += 1
+        for key, document in terms.items():
+            if key not in replayed and document is not None:
+                self.__text.load(key, document)
+                self.__preindexed.add(key)
+        self.__generation = index["generation"]
+        self.__text.changes.clear()
+        self.__text.changed = False
+
+    def __link(self, name, attr, value, key):
+        """adds key to the children of value in the (name, attr) index"""
+        parents = self.__children.setdefault((name, attr), {})
+        parents.setdefault(value, {})[key] = None
 
-        return count
+    def __unlink(self, name, attr, value, key):
+        """removes key from the children of value in the (name, attr) index"""
+        parents = self.__children.get((name, attr), {})
+        keys = parents.get(value)
+        if keys is not None:
+            keys.pop(key, None)
+            if not keys:
+                del parents[value]
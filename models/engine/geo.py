@@ -0,0 +1,204 @@
+#!/usr/bin/python3
+"""
+Contains the geographic helpers of place searches and the Grid class, the
+spatial index FileStorage keeps over Place.latitude and Place.longitude
+"""
+
+import heapq
+from math import asin, cos, floor, radians, sin, sqrt
+
+# float - mean radius of the Earth in km
+earth_radius = 6371.0088
+# float - length of a degree of latitude in km
+degree_km = earth_radius * radians(1)
+
+
+def distance(lat1, lon1, lat2, lon2):
+    """returns the great-circle distance in km between two points, from
+    the haversine formula"""
+    dlat = radians(lat2 - lat1)
+    dlon = radians(lon2 - lon1)
+    a = sin(dlat / 2) ** 2 + \
+        cos(radians(lat1)) * cos(radians(lat2)) * sin(dlon / 2) ** 2
+    return 2 * earth_radius * asin(min(1.0, sqrt(a)))
+
+
+def circle_bounds(lat, lon, radius_km):
+    """returns the (south, west, north, east) box holding every point
+    within radius_km of (lat, lon); west > east when it crosses the
+    antimeridian"""
+    dlat = radius_km / degree_km
+    south, north = lat - dlat, lat + dlat
+    if south <= -90 or north >= 90:
+        return max(south, -90.0), -180.0, min(north, 90.0), 180.0
+    dlon = dlat / cos(radians(max(abs(south), abs(north))))
+    if dlon >= 180:
+        return south, -180.0, north, 180.0
+    west, east = lon - dlon, lon + dlon
+    if west < -180:
+        west += 360
+    if east > 180:
+        east -= 360
+    return south, west, north, east
+
+
+def in_bounds(lat, lon, south, west, north, east):
+    """tells if (lat, lon) is inside the box, which crosses the
+    antimeridian when west > east"""
+    if not south <= lat <= north:
+        return False
+    if west <= east:
+        return west <= lon <= east
+    return lon >= west or lon <= east
+
+
+def coordinates(lat, lon):
+    """returns (lat, lon) as floats, or None when they are not a point"""
+    try:
+        lat, lon = float(lat), float(lon)
+    except (TypeError, ValueError):
+        return None
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        return None
+    return lat, lon
+
+
+class Grid:
+    """A uniform grid of cells of size degrees on each side, holding the
+    point of each key in its cell, so a box or the neighbourhood of a
+    point is found by visiting the few cells around it"""
+
+    def __init__(self, size=0.1):
+        """creates an empty grid of cells of size degrees"""
+        self.size = size
+        # int - number of cells around a parallel
+        self.columns = int(round(360 / size))
+        # dictionary - (row, column) -> {key: (lat, lon)}
+        self.cells = {}
+        # dictionary - key -> (lat, lon, cell)
+        self.points = {}
+
+    def __len__(self):
+        """returns the number of points"""
+        return len(self.points)
+
+    def cell(self, lat, lon):
+        """returns the (row, column) of the cell holding (lat, lon)"""
+        return (floor(lat / self.size),
+                floor((lon + 180) / self.size) % self.columns)
+
+    def put(self, key, lat, lon):
+        """places key at (lat, lon), or drops it when that is no point"""
+        self.drop(key)
+        point = coordinates(lat, lon)
+        if point is None:
+            return
+        cell = self.cell(*point)
+        self.cells.setdefault(cell, {})[key] = point
+        self.points[key] = point + (cell,)
+
+    def drop(self, key):
+        """removes key from the grid, if it is there"""
+        point = self.points.pop(key, None)
+        if point is None:
+            return
+        keys = self.cells[point[2]]
+        del keys[key]
+        if not keys:
+            del self.cells[point[2]]
+
+    def within(self, south, west, north, east):
+        """returns the keys of the points inside the box, which crosses the
+        antimeridian when west > east"""
+        first, last = floor(south / self.size), floor(north / self.size)
+        span = east - west if west <= east else east + 360 - west
+        if span >= 360 - self.size:
+            width = self.columns
+        else:
+            width = (self.cell(0, east)[1] - self.cell(0, west)[1]) % \
+                self.columns + 1
+        if (last - first + 1) * width > len(self.cells):
+            cells = [cell for cell in self.cells
+                     if first <= cell[0] <= last]
+        else:
+            start = self.cell(south, west)[1]
+            cells = [(row, (start + i) % self.columns)
+                     for row in range(first, last + 1) for i in range(width)]
+        keys = []
+        for cell in cells:
+            for key, point in self.cells.get(cell, {}).items():
+                if in_bounds(point[0], point[1], south, west, north, east):
+                    keys.append(key)
+        return keys
+
+    def nearest(self, lat, lon, k, radius_km=None):
+        """returns up to k (distance in km, key) of the points nearest to
+        (lat, lon), closest first, and only those within radius_km when it
+        is given
+        The rings of cells around the cell of (lat, lon) are visited one
+        after the other, until the k-th distance found is closer than any
+        point beyond the rings can be"""
+        best = []
+        if k < 1 or not self.points:
+            return best
+        row, column = self.cell(lat, lon)
+        visited = 0
+        ring = 0
+        while True:
+            if (2 * ring + 1) ** 2 >= 2 * len(self.cells):
+                # the rings cover more cells than are used: check them all
+                cells = [cell for cell in self.cells
+                         if max(abs(cell[0] - row),
+                                self.__gap(cell[1], column)) >= ring]
+                self.__keep(best, k, lat, lon, cells)
+                break
+            cells = self.__ring(row, column, ring)
+            visited += self.__keep(best, k, lat, lon, cells)
+            # any point outside the rings is at least this far away
+            margin = ring * self.size
+            edge = min(90.0, abs(lat) + margin)
+            reach = margin * degree_km * min(1.0, cos(radians(edge)))
+            if len(best) == k and -best[0][0] <= reach:
+                break
+            if radius_km is not None and reach > radius_km:
+                break
+            if visited == len(self.points):
+                break
+            ring += 1
+        found = sorted((-d, key) for d, key in best)
+        if radius_km is not None:
+            found = [(d, key) for d, key in found if d <= radius_km]
+        return found
+
+    def __ring(self, row, column, ring):
+        """returns the cells at Chebyshev distance ring of (row, column)"""
+        if ring == 0:
+            return [(row, column)]
+        cells = []
+        for i in range(-ring, ring + 1):
+            cells.append((row - ring, (column + i) % self.columns))
+            cells.append((row + ring, (column + i) % self.columns))
+        for i in range(-ring + 1, ring):
+            cells.append((row + i, (column - ring) % self.columns))
+            cells.append((row + i, (column + ring) % self.columns))
+        return set(cells)
+
+    def __gap(self, a, b):
+        """returns the distance in columns between columns a and b, around
+        the parallel"""
+        gap = abs(a - b) % self.columns
+        return min(gap, self.columns - gap)
+
+    def __keep(self, best, k, lat, lon, cells):
+        """adds the points of cells to best, a heap of the k nearest
+        (-distance, key), and returns the number of points seen"""
+        seen = 0
+        for cell in cells:
+            for key, point in self.cells.get(cell, {}).items():
+                seen += 1
+                item = (-distance(lat, lon, point[0], point[1]), key)
+                if len(best) < k:
+                    heapq.heappush(best, item)
+                elif item > best[0]:
+                    heapq.heapreplace(best, item)
+        return seen
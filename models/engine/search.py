@@ -0,0 +1,133 @@
+#!/usr/bin/python3
+"""
+Contains the PlaceSearch class, the criteria of a places_search request
+that each storage answers with its search() method
+"""
+
+from models.engine.geo import circle_bounds, coordinates, distance, in_bounds
+
+
+class PlaceSearch:
+    """The places asked for by places_search: those of the cities in states
+    or in cities (every place when both are empty) that have every amenity
+    in amenities, lie in the bbox (south, west, north, east) and within
+    radius_km of the point near (latitude, longitude) when they are given,
+    and whose numbers are within ranges, {attribute: (low, high)} with None
+    for an open end
+    The places are in id order, or ordered by the attribute sort, then id,
+    in reverse when descending"""
+
+    # keys of the request JSON, each a list of ids
+    keys = ("states", "cities", "amenities")
+    # range keys of the request JSON: key -> (attribute, 0 low or 1 high)
+    limits = {"min_price": ("price_by_night", 0),
+              "max_price": ("price_by_night", 1),
+              "min_guests": ("max_guest", 0),
+              "max_guests": ("max_guest", 1),
+              "min_rooms": ("number_rooms", 0),
+              "max_rooms": ("number_rooms", 1),
+              "min_bathrooms": ("number_bathrooms", 0),
+              "max_bathrooms": ("number_bathrooms", 1)}
+    # values of the sort key of the request JSON -> attribute, "-" before
+    # the value reversing the order
+    sorts = {"price": "price_by_night", "guests": "max_guest",
+             "rooms": "number_rooms", "bathrooms": "number_bathrooms"}
+
+    def __init__(self, states=(), cities=(), amenities=(), bbox=None,
+                 near=None, radius_km=None, ranges=None, sort=None,
+                 descending=False):
+        """creates the search of the places matching the lists of ids, the
+        area and the ranges"""
+        self.states = list(states)
+        self.cities = list(cities)
+        self.amenities = list(amenities)
+        self.bbox = None if bbox is None else tuple(bbox)
+        self.near = None if near is None else tuple(near)
+        self.radius_km = radius_km
+        self.ranges = dict(ranges or {})
+        self.sort = sort
+        self.descending = descending
+
+    @classmethod
+    def from_json(cls, data):
+        """returns the search of a places_search request body; raises
+        ValueError when a key does not hold a list of ids, the bbox or the
+        circle are not valid coordinates, a bound is not a number or sort
+        is unknown"""
+        criteria = {}
+        for key in cls.keys:
+            ids = data.get(key)
+            if ids is None:
+                ids = []
+            if not isinstance(ids, list) or \
+               not all(isinstance(id, str) for id in ids):
+                raise ValueError("{} must be a list of ids".format(key))
+            criteria[key] = ids
+        bbox = data.get("bbox")
+        if bbox is not None:
+            if not isinstance(bbox, list) or len(bbox) != 4 or \
+               coordinates(*bbox[:2]) is None or \
+               coordinates(*bbox[2:]) is None or bbox[0] > bbox[2]:
+                raise ValueError("bbox must be [south, west, north, east]")
+            criteria["bbox"] = [float(value) for value in bbox]
+        near, radius_km = data.get("near"), data.get("radius_km")
+        if near is not None or radius_km is not None:
+            if not isinstance(near, list) or len(near) != 2 or \
+               coordinates(*near) is None:
+                raise ValueError("near must be [latitude, longitude]")
+            if isinstance(radius_km, bool) or \
+               not isinstance(radius_km, (int, float)) or not radius_km >= 0:
+                raise ValueError("radius_km must be a positive number")
+            criteria["near"] = [float(value) for value in near]
+            criteria["radius_km"] = float(radius_km)
+        ranges = {}
+        for key, (attr, end) in cls.limits.items():
+            value = data.get(key)
+            if value is None:
+                continue
+            if isinstance(value, bool) or \
+               not isinstance(value, (int, float)) or value != value:
+                raise ValueError("{} must be a number".format(key))
+            ranges.setdefault(attr, [None, None])[end] = value
+        criteria["ranges"] = {attr: tuple(ends)
+                              for attr, ends in ranges.items()}
+        sort = data.get("sort")
+        if sort is not None:
+            if not isinstance(sort, str) or sort.lstrip("-") not in cls.sorts:
+                raise ValueError("sort must be one of {}".format(
+                    ", ".join(sorted(cls.sorts))))
+            criteria["sort"] = cls.sorts[sort.lstrip("-")]
+            criteria["descending"] = sort.startswith("-")
+        return cls(**criteria)
+
+    @property
+    def everywhere(self):
+        """True when the search is not limited to some states or cities"""
+        return not self.states and not self.cities
+
+    @property
+    def located(self):
+        """True when the search is limited to a bbox or a circle"""
+        return self.bbox is not None or self.near is not None
+
+    def bounds(self):
+        """returns the (south, west, north, east) box the places searched
+        lie in, the bbox or the box around the circle, or None"""
+        if self.bbox is not None:
+            return self.bbox
+        if self.near is not None:
+            return circle_bounds(self.near[0], self.near[1], self.radius_km)
+        return None
+
+    def contains(self, latitude, longitude):
+        """tells if the point (latitude, longitude) is in the bbox and in
+        the circle"""
+        point = coordinates(latitude, longitude)
+        if point is None:
+            return False
+        if self.bbox is not None and not in_bounds(*point + self.bbox):
+            return False
+        if self.near is not None and \
+           distance(*point + self.near) > self.radius_km:
+            return False
+        return True
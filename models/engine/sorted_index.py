@@ -0,0 +1,112 @@
+#!/usr/bin/python3
+"""
+Contains the SortedIndex class, the secondary indexes FileStorage keeps
+over numeric attributes such as Place.price_by_night
+"""
+
+from bisect import bisect_left, bisect_right
+
+
+def number(value):
+    """returns value as a float, or None when it is not a number"""
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if value != value else value
+
+
+class SortedIndex:
+    """An index of a numeric attribute: the keys ordered by (value, key),
+    in two parallel lists searched with bisect, so a range of values is a
+    slice and the keys come out sorted by value, then id"""
+
+    def __init__(self):
+        """creates an empty index"""
+        # list - the values, in order
+        self.values = []
+        # list - the key of each value, in (value, key) order
+        self.keys = []
+        # dictionary - key -> its value
+        self.of = {}
+
+    def __len__(self):
+        """returns the number of keys"""
+        return len(self.keys)
+
+    def put(self, key, value):
+        """indexes key under value, in place of its old value; a value that
+        is not a number leaves key out of the index"""
+        self.drop(key)
+        value = number(value)
+        if value is None:
+            return
+        position = self.position(key, value)
+        self.values.insert(position, value)
+        self.keys.insert(position, key)
+        self.of[key] = value
+
+    def build(self, pairs):
+        """indexes each key of the (key, value) pairs under its value, in
+        place of its old value, and sorts the lists once: n keys cost
+        O(n log n) where n put() would move the lists n times; a value that
+        is not a number leaves its key out of the index"""
+        for key, value in pairs:
+            value = number(value)
+            if value is None:
+                self.of.pop(key, None)
+            else:
+                self.of[key] = value
+        order = sorted(zip(self.of.values(), self.of))
+        self.values = [value for value, key in order]
+        self.keys = [key for value, key in order]
+
+    def drop(self, key):
+        """removes key from the index, if it is there"""
+        value = self.of.pop(key, None)
+        if value is None:
+            return
+        position = self.position(key, value)
+        del self.values[position]
+        del self.keys[position]
+
+    def position(self, key, value):
+        """returns the position of (value, key) in the lists, where it is
+        or would be inserted"""
+        low = bisect_left(self.values, value)
+        high = bisect_right(self.values, value, low)
+        return bisect_left(self.keys, key, low, high)
+
+    def range(self, low=None, high=None, within=None):
+        """returns the keys of the values from low to high, both included
+        and either one open when None, in (value, key) order; only those in
+        the set within, in no order, when it is given
+        When within is smaller than the range, its keys are looked up in
+        the values instead"""
+        start = 0 if low is None else bisect_left(self.values, low)
+        end = len(self.values) if high is None else \
+            bisect_right(self.values, high)
+        if within is None:
+            return self.keys[start:end]
+        if len(within) < end - start:
+            return [key for key in within if key in self.of and
+                    (low is None or self.of[key] >= low) and
+                    (high is None or self.of[key] <= high)]
+        return [key for key in self.keys[start:end] if key in within]
+
+    def walk(self, after=None, reverse=False):
+        """yields the keys in (value, key) order, or the reverse one, from
+        the key after the key after; nothing when after is not indexed"""
+        if after is None:
+            start = len(self.keys) - 1 if reverse else 0
+        elif after in self.of:
+            start = self.position(after, self.of[after])
+            start += -1 if reverse else 1
+        else:
+            return
+        if reverse:
+            for i in range(start, -1, -1):
+                yield self.keys[i]
+        else:
+            for i in range(start, len(self.keys)):
+                yield self.keys[i]
@@ -0,0 +1,131 @@
+#!/usr/bin/python3
+"""
+Contains the tokenizer and the TextIndex class, the full-text index of
+Place.name, Place.description and Review.text ranked with BM25
+"""
+
+from collections import Counter
+import heapq
+from math import log
+from models.engine import codec
+import re
+
+# pattern - the words of a text: runs of letters and digits
+word = re.compile(r"[^\W_]+")
+# float - BM25 saturation of the term frequency
+k1 = 1.2
+# float - BM25 normalization by the document length
+b = 0.75
+
+
+def tokenize(text):
+    """returns the lowercase words of text, in order"""
+    if not isinstance(text, str):
+        return []
+    return word.findall(text.lower())
+
+
+class TextIndex:
+    """An inverted index of documents: the postings of each term, {key:
+    number of times the term is in the document of key}, and the length of
+    each document, to rank the documents of a query with BM25"""
+
+    def __init__(self):
+        """creates an empty index"""
+        # dictionary - term -> {key: term frequency}
+        self.postings = {}
+        # dictionary - key -> {term: term frequency}, the document of key
+        self.terms = {}
+        # dictionary - key -> number of words of the document of key
+        self.lengths = {}
+        # int - number of words of every document
+        self.total = 0
+        # dictionary - key -> JSON text of terms[key], as last dumped
+        self.encoded = {}
+        # bool - whether a document was put or dropped since changed was
+        # last reset
+        self.changed = False
+        # set - keys of the documents put or dropped since changes was last
+        # emptied
+        self.changes = set()
+
+    def __len__(self):
+        """returns the number of documents"""
+        return len(self.terms)
+
+    def put(self, key, text):
+        """indexes the words of text as the document of key, in place of
+        its old document"""
+        words = tokenize(text)
+        self.load(key, Counter(words), len(words))
+
+    def load(self, key, terms, length=None):
+        """indexes the {term: frequency} terms as the document of key,
+        without tokenizing it again"""
+        self.drop(key)
+        if not terms:
+            return
+        terms = dict(terms)
+        self.changed = True
+        self.changes.add(key)
+        self.terms[key] = terms
+        self.lengths[key] = sum(terms.values()) if length is None else length
+        self.total += self.lengths[key]
+        for term, frequency in terms.items():
+            self.postings.setdefault(term, {})[key] = frequency
+
+    def drop(self, key):
+        """removes the document of key, if it is there"""
+        terms = self.terms.pop(key, None)
+        if terms is None:
+            return
+        self.encoded.pop(key, None)
+        self.changed = True
+        self.changes.add(key)
+        self.total -= self.lengths.pop(key)
+        for term in terms:
+            keys = self.postings[term]
+            del keys[key]
+            if not keys:
+                del self.postings[term]
+
+    def search(self, query, limit=10, documents=None):
+        """returns the (score, key) of the at most limit documents with the
+        most relevant words of query, best first; documents is the number
+        of documents the inverse document frequencies count, the indexed
+        ones when None"""
+        n = len(self.terms) if documents is None else documents
+        if not self.terms or limit < 1:
+            return []
+        average = self.total / len(self.terms)
+        scores = {}
+        for term in set(tokenize(query)):
+            keys = self.postings.get(term)
+            if not keys:
+                continue
+            idf = log(1 + (n - len(keys) + 0.5) / (len(keys) + 0.5))
+            for key, frequency in keys.items():
+                norm = k1 * (1 - b + b * self.lengths[key] / average)
+                scores[key] = scores.get(key, 0) + \
+                    idf * frequency * (k1 + 1) / (frequency + norm)
+        best = heapq.nlargest(limit, scores.items(),
+                              key=lambda item: (item[1], item[0]))
+        return [(score, key) for key, score in best]
+
+    def encode(self, key):
+        """returns the JSON text of the {term: frequency} document of key,
+        null when there is none, encoding it again only once it changed"""
+        terms = self.terms.get(key)
+        if terms is None:
+            return "null"
+        text = self.encoded.get(key)
+        if text is None:
+            text = codec.dumps(terms)
+            self.encoded[key] = text
+        return text
+
+    def dumps(self):
+        """returns the JSON text of {key: {term: frequency}}, encoding again
+        only the documents changed since the last call"""
+        return "{" + ",".join(codec.dumps(key) + ":" + self.encode(key)
+                              for key in self.terms) + "}"
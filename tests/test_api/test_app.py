@@ -0,0 +1,84 @@
+#!/usr/bin/python3
+"""
+Contains the TestAppDocs and TestCodecJSONProvider classes
+"""
+
+import inspect
+import json
+import models
+from api.v1 import app as app_module
+from models.base_model import parse_time
+from models.engine import codec
+from models.state import State
+import pep8
+import unittest
+app = app_module.app
+
+
+class TestAppDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the app module"""
+    def test_pep8_conformance_app(self):
+        """Test that api/v1/app.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/app.py',
+                                    'tests/test_api/test_app.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_app_docstrings(self):
+        """Test for the docstrings of the module, its functions and
+        CodecJSONProvider"""
+        self.assertTrue(len(app_module.__doc__) >= 1)
+        for func in inspect.getmembers(app_module, inspect.isfunction):
+            if func[1].__module__ == app_module.__name__:
+                self.assertTrue(len(func[1].__doc__) >= 1,
+                                "{:s} needs a docstring".format(func[0]))
+        for func in inspect.getmembers(app_module.CodecJSONProvider,
+                                       inspect.isfunction):
+            if func[1].__qualname__.startswith("CodecJSONProvider."):
+                self.assertTrue(len(func[1].__doc__) >= 1,
+                                "{:s} needs a docstring".format(func[0]))
+
+
+class TestCodecJSONProvider(unittest.TestCase):
+    """Test the app encodes and decodes its JSON with the models codec"""
+    def setUp(self):
+        """Store a state"""
+        self.client = app.test_client()
+        self.state = State(name="Niger")
+        self.state.save()
+        self.ids = [self.state.id]
+
+    def tearDown(self):
+        """Delete the state and those the tests created"""
+        for id in self.ids:
+            models.storage.delete(models.storage.get(State, id))
+        models.storage.save()
+
+    def test_response_json(self):
+        """Test a response is the compact, sorted codec text of the object,
+        its datetimes in the time format"""
+        response = self.client.get("/api/v1/states/" + self.state.id)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, "application/json")
+        text = response.get_data(as_text=True).strip()
+        self.assertEqual(text, codec.dumps(self.state.to_dict(),
+                                           sort_keys=True))
+        data = json.loads(text)
+        self.assertEqual(list(data), sorted(data))
+        self.assertEqual(data, self.state.to_dict())
+        self.assertEqual(parse_time(data["updated_at"]),
+                         self.state.updated_at)
+
+    def test_request_json(self):
+        """Test a request body is decoded by the codec, and one that is not
+        JSON is refused"""
+        response = self.client.post("/api/v1/states",
+                                    data='{"name": "Kwara"}',
+                                    content_type="application/json")
+        self.assertEqual(response.status_code, 201)
+        self.ids.append(response.get_json()["id"])
+        self.assertEqual(response.get_json()["name"], "Kwara")
+        response = self.client.post("/api/v1/states", data="{nope",
+                                    content_type="application/json")
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,118 @@
+#!/usr/bin/python3
+"""
+Contains the TestCompressionDocs and TestCompression classes
+"""
+
+import gzip
+import inspect
+import models
+from api.v1 import compression
+from api.v1.app import app
+from models.state import State
+import pep8
+import unittest
+from unittest import mock
+import zlib
+
+
+class TestCompressionDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the compression
+    module"""
+    def test_pep8_conformance_compression(self):
+        """Test that api/v1/compression.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/compression.py',
+                                    'tests/test_api/test_compression.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_compression_docstrings(self):
+        """Test for the docstrings of the module and its functions"""
+        self.assertTrue(len(compression.__doc__) >= 1)
+        for func in inspect.getmembers(compression, inspect.isfunction):
+            if func[1].__module__ == compression.__name__:
+                self.assertTrue(len(func[1].__doc__) >= 1,
+                                "{:s} needs a docstring".format(func[0]))
+
+
+class TestCompression(unittest.TestCase):
+    """Test the responses of the app are compressed as negotiated"""
+    def setUp(self):
+        """Store enough states for a list worth compressing"""
+        self.client = app.test_client()
+        self.states = [State(name="Compressed state {:02d}".format(i))
+                       for i in range(30)]
+        for state in self.states:
+            models.storage.new(state)
+        models.storage.save()
+        self.path = "/api/v1/states"
+
+    def tearDown(self):
+        """Delete the states"""
+        for state in self.states:
+            models.storage.delete(state)
+        models.storage.save()
+
+    def get(self, coding=None, path=None):
+        """Returns the response to a GET of path, the list of states by
+        default, accepting coding"""
+        headers = {"Accept-Encoding": coding} if coding else {}
+        return self.client.get(path or self.path, headers=headers)
+
+    def test_identity(self):
+        """Test a client accepting no coding gets the body as it is, and
+        the response varies on Accept-Encoding"""
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("Content-Encoding", response.headers)
+        self.assertIn("Accept-Encoding", response.vary)
+        self.assertGreaterEqual(len(response.get_data()),
+                                compression.min_size)
+
+    def test_gzip_and_deflate(self):
+        """Test each coding is negotiated, with q-values, and decodes to
+        the identity body"""
+        body = self.get().get_data()
+        decoders = {"gzip": gzip.decompress, "deflate": zlib.decompress}
+        for coding, decode in decoders.items():
+            with self.subTest(coding=coding):
+                response = self.get(coding)
+                self.assertEqual(response.headers["Content-Encoding"],
+                                 coding)
+                self.assertIn("Accept-Encoding", response.vary)
+                self.assertEqual(decode(response.get_data()), body)
+                self.assertLess(len(response.get_data()), len(body))
+        response = self.get("gzip;q=0.5, deflate;q=0.9")
+        self.assertEqual(response.headers["Content-Encoding"], "deflate")
+        response = self.get("gzip;q=0, identity")
+        self.assertNotIn("Content-Encoding", response.headers)
+
+    def test_weak_etag(self):
+        """Test a compressed response keeps the ETag as a weak one, which
+        still validates the request"""
+        etag = self.get().get_etag()
+        response = self.get("gzip")
+        self.assertEqual(response.get_etag(), (etag[0], True))
+        response = self.client.get(self.path, headers={
+            "Accept-Encoding": "gzip",
+            "If-None-Match": response.headers["ETag"]})
+        self.assertEqual(response.status_code, 304)
+        self.assertNotIn("Content-Encoding", response.headers)
+
+    def test_small_body(self):
+        """Test a body under min_size is sent as it is"""
+        response = self.get("gzip", "/api/v1/status")
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("Content-Encoding", response.headers)
+        self.assertEqual(response.get_json(), {"status": "OK"})
+
+    def test_stream(self):
+        """Test a body of stream_size bytes or more is streamed in chunks,
+        without a Content-Length"""
+        body = self.get().get_data()
+        with mock.patch.object(compression, "stream_size", 1024), \
+                mock.patch.object(compression, "chunk_size", 512):
+            response = self.get("gzip")
+            self.assertTrue(response.is_streamed)
+            self.assertNotIn("Content-Length", response.headers)
+            self.assertEqual(gzip.decompress(response.get_data()), body)
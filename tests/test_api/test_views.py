@@ -0,0 +1,243 @@
+#!/usr/bin/python3
+"""
+Contains the TestViewsDocs and TestViews classes, and the TestPagination,
+TestConditional, TestPlaceAmenities, TestPlacesNearby and TestTextSearch
+classes of the views
+"""
+
+from api.v1 import views
+from api.v1.app import app
+import models
+from models.amenity import Amenity
+from models.base_model import parse_time
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+import pep8
+import unittest
+from unittest import mock
+from urllib.parse import urlsplit
+
+
+class TestViewsDocs(unittest.TestCase):
+    """Tests to check the style of the views tests"""
+    def test_pep8_conformance_test_views(self):
+        """Test that tests/test_api/test_views.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_api/test_views.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+
+class TestViews(unittest.TestCase):
+    """Stores a state, a city, a user, places in Paris, Versailles and
+    London, and a review, and deletes them after each test"""
+    # (name, latitude, longitude) of the places
+    points = [("Paris", 48.8566, 2.3522), ("Versailles", 48.8049, 2.1204),
+              ("London", 51.5072, -0.1276)]
+
+    def setUp(self):
+        """Store the objects"""
+        self.client = app.test_client()
+        self.objs = []
+        self.state = self.store(State(name="Ile"))
+        self.city = self.store(City(name="Paris", state_id=self.state.id))
+        self.user = self.store(User(email="a@b.c", password="pwd"))
+        self.places = [self.store(Place(name=name, city_id=self.city.id,
+                                        user_id=self.user.id,
+                                        description="Zyzzyva loft",
+                                        latitude=lat, longitude=lng))
+                       for name, lat, lng in self.points]
+        self.review = self.store(Review(place_id=self.places[0].id,
+                                        user_id=self.user.id,
+                                        text="Zyzzyva, zyzzyva everywhere"))
+        models.storage.save()
+
+    def tearDown(self):
+        """Delete the stored objects"""
+        for obj in reversed(self.objs):
+            models.storage.delete(obj)
+        models.storage.save()
+
+    def store(self, obj):
+        """Adds obj to the storage and returns it"""
+        models.storage.new(obj)
+        self.objs.append(obj)
+        return obj
+
+
+class TestPagination(TestViews):
+    """Test the limit and cursor pages of the list views"""
+    def walk(self, path):
+        """Returns the ids of every page of path, following the Link
+        headers, and the number of pages"""
+        ids, pages = [], 0
+        while path:
+            response = self.client.get(path)
+            self.assertEqual(response.status_code, 200)
+            ids += [obj["id"] for obj in response.get_json()]
+            pages += 1
+            link = response.headers.get("Link")
+            if link is None:
+                break
+            self.assertTrue(link.endswith('>; rel="next"'))
+            url = urlsplit(link[1:link.index(">")])
+            path = url.path + "?" + url.query
+        return ids, pages
+
+    def test_link_pages(self):
+        """Test the pages follow each other in id order, through the
+        cursor of each Link, and end without a Link"""
+        path = "/api/v1/cities/{}/places?limit=2".format(self.city.id)
+        ids, pages = self.walk(path)
+        self.assertEqual(ids, sorted(place.id for place in self.places))
+        self.assertEqual(pages, 2)
+        everything = self.client.get("/api/v1/states").get_json()
+        ids, pages = self.walk("/api/v1/states?limit=1")
+        self.assertEqual(ids, sorted(state["id"] for state in everything))
+        self.assertEqual(pages, len(everything))
+
+    def test_cursor(self):
+        """Test a cursor starts the page after its id"""
+        ids = sorted(place.id for place in self.places)
+        response = self.client.get("/api/v1/cities/{}/places?cursor={}"
+                                   .format(self.city.id, ids[0]))
+        self.assertEqual([place["id"] for place in response.get_json()],
+                         ids[1:])
+        self.assertNotIn("Link", response.headers)
+
+    def test_invalid_limit(self):
+        """Test a limit that is not a positive number is refused"""
+        for limit in ("0", "-1", "ten"):
+            with self.subTest(limit=limit):
+                response = self.client.get("/api/v1/states?limit=" + limit)
+                self.assertEqual(response.status_code, 400)
+
+
+class TestConditional(TestViews):
+    """Test the validators and the response cache of the GET views"""
+    def test_not_modified(self):
+        """Test a request whose validators still hold gets a 304, and one
+        after a change the new version"""
+        path = "/api/v1/states/" + self.state.id
+        response = self.client.get(path)
+        etag = response.headers["ETag"]
+        modified = response.headers["Last-Modified"]
+        response = self.client.get(path, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.get_data(), b"")
+        response = self.client.get(path,
+                                   headers={"If-Modified-Since": modified})
+        self.assertEqual(response.status_code, 304)
+        response = self.client.put(path, json={"name": "Centre"})
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(path, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers["ETag"], etag)
+        self.assertEqual(response.get_json()["name"], "Centre")
+
+    def test_response_cache(self):
+        """Test a list is rendered once until one of its classes
+        changes"""
+        path = "/api/v1/cities/{}/places".format(self.city.id)
+        views.responses.clear()
+        with mock.patch.object(Place, "to_dict", autospec=True,
+                               side_effect=Place.to_dict) as to_dict:
+            first = self.client.get(path)
+            calls = to_dict.call_count
+            self.assertEqual(calls, 3)
+            second = self.client.get(path)
+            self.assertEqual(to_dict.call_count, calls)
+            self.assertEqual(second.get_data(), first.get_data())
+            self.assertEqual(second.headers["ETag"], first.headers["ETag"])
+            self.places[2].name = "Londres"
+            self.places[2].save()
+            third = self.client.get(path)
+            self.assertGreater(to_dict.call_count, calls)
+        self.assertIn("Londres", [place["name"]
+                                  for place in third.get_json()])
+
+
+class TestPlaceAmenities(TestViews):
+    """Test the amenities of a place follow their links"""
+    def updated_at(self):
+        """Returns the updated_at of the first place, as the API sends it"""
+        response = self.client.get("/api/v1/places/" + self.places[0].id)
+        return parse_time(response.get_json()["updated_at"])
+
+    def test_link_updates_place(self):
+        """Test linking and unlinking an amenity updates the place, which
+        the validators of every process see, and a conditional request of
+        the amenities of the place"""
+        amenity = self.store(Amenity(name="Sauna"))
+        amenity.save()
+        path = "/api/v1/places/{}/amenities".format(self.places[0].id)
+        for method, status, count in (("post", 201, 1), ("delete", 200, 0)):
+            with self.subTest(method=method):
+                etag = self.client.get(path).headers["ETag"]
+                updated_at = self.updated_at()
+                response = getattr(self.client, method)(path + "/" +
+                                                        amenity.id)
+                self.assertEqual(response.status_code, status)
+                self.assertGreater(self.updated_at(), updated_at)
+                response = self.client.get(path,
+                                           headers={"If-None-Match": etag})
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(len(response.get_json()), count)
+
+
+class TestPlacesNearby(TestViews):
+    """Test the /places/nearby view"""
+    def test_nearest_first(self):
+        """Test the places come closest first, with their distance"""
+        response = self.client.get("/api/v1/places/nearby?lat=48.85&"
+                                   "lng=2.35&k=100&radius_km=400")
+        self.assertEqual(response.status_code, 200)
+        mine = {place.id for place in self.places}
+        found = [place for place in response.get_json()
+                 if place["id"] in mine]
+        self.assertEqual([place["name"] for place in found],
+                         ["Paris", "Versailles", "London"])
+        self.assertLess(found[0]["distance_km"], 1)
+        self.assertAlmostEqual(found[2]["distance_km"], 344, delta=2)
+
+    def test_radius(self):
+        """Test only the places within radius_km are returned"""
+        response = self.client.get("/api/v1/places/nearby?lat=51.5&"
+                                   "lng=-0.12&radius_km=5")
+        self.assertEqual([place["name"] for place in response.get_json()],
+                         ["London"])
+
+    def test_invalid_point(self):
+        """Test a point or k that is not valid is refused"""
+        for query in ("lat=91&lng=0", "lat=0", "lat=a&lng=0",
+                      "lat=0&lng=0&k=0", "lat=0&lng=0&radius_km=-1"):
+            with self.subTest(query=query):
+                response = self.client.get("/api/v1/places/nearby?" + query)
+                self.assertEqual(response.status_code, 400)
+
+
+class TestTextSearch(TestViews):
+    """Test the /search view"""
+    def test_best_first(self):
+        """Test the places and reviews matching q come best first, with
+        their score"""
+        response = self.client.get("/api/v1/search?q=zyzzyva&limit=10")
+        self.assertEqual(response.status_code, 200)
+        found = response.get_json()
+        self.assertEqual(found[0]["id"], self.review.id)
+        self.assertCountEqual([obj["id"] for obj in found[1:4]],
+                              [place.id for place in self.places])
+        scores = [obj["score"] for obj in found]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        response = self.client.get("/api/v1/search?q=zyzzyva&limit=1")
+        self.assertEqual(len(response.get_json()), 1)
+
+    def test_invalid_query(self):
+        """Test a missing q or a limit that is not valid is refused"""
+        for query in ("", "q=", "q=loft&limit=0", "q=loft&limit=x"):
+            with self.subTest(query=query):
+                response = self.client.get("/api/v1/search?" + query)
+                self.assertEqual(response.status_code, 400)
@@ -1,11 +1,16 @@
 #!/usr/bin/python3
 """
-Contains the class TestConsoleDocs
+Contains the classes TestConsoleDocs and TestConsolePiped
 """
 
 import console
 import inspect
+import json
+import os
 import pep8
+import subprocess
+import sys
+import tempfile
 import unittest
 HBNBCommand = console.HBNBCommand
 
@@ -39,3 +44,32 @@ class TestConsoleDocs(unittest.TestCase):
                          "HBNBCommand class needs a docstring")
         self.assertTrue(len(HBNBCommand.__doc__) >= 1,
                         "HBNBCommand class needs a docstring")
+
+
+class TestConsolePiped(unittest.TestCase):
+    """Test the console reading its commands from a pipe, in file storage,
+    next to a file.json of its own"""
+    def run_console(self, commands):
+        """Returns the output of the console and the objects it saved"""
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env = dict(os.environ, PYTHONPATH=root)
+        for name in ("HBNB_TYPE_STORAGE", "HBNB_FILE_JOURNAL"):
+            env.pop(name, None)
+        with tempfile.TemporaryDirectory() as cwd:
+            result = subprocess.run(
+                [sys.executable, os.path.join(root, "console.py")],
+                input=commands, env=env, cwd=cwd, capture_output=True,
+                text=True)
+            self.assertEqual(result.returncode, 0, result.stderr)
+            with open(os.path.join(cwd, "file.json")) as f:
+                return result.stdout, json.load(f)
+
+    def test_failing_command(self):
+        """Test a command that raises is reported, and the commands before
+        and after it are saved"""
+        output, objs = self.run_console('create State name="Kogi"\n'
+                                        'show State "unclosed\n'
+                                        'create State name="Edo"\n')
+        self.assertIn("** No closing quotation **", output)
+        self.assertCountEqual([obj["name"] for obj in objs.values()],
+                              ["Kogi", "Edo"])
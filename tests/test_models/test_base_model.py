@@ -2,8 +2,12 @@
 """Test BaseModel for expected behavior and documentation"""
 from datetime import datetime
 import inspect
+import json
 import models
+import os
 import pep8 as pycodestyle
+import subprocess
+import sys
 import time
 import unittest
 from unittest import mock
@@ -158,3 +162,78 @@ class TestBaseModel(unittest.TestCase):
         self.assertEqual(old_created_at, new_created_at)
         self.assertTrue(mock_storage.new.called)
         self.assertTrue(mock_storage.save.called)
+
+    def test_time_codec_matches_time_format(self):
+        """Test parse_time and format_time agree with strptime/strftime"""
+        t_format = "%Y-%m-%dT%H:%M:%S.%f"
+        for date in [datetime(2024, 1, 9, 10, 59, 22, 98861),
+                     datetime(2024, 1, 9, 10, 59, 22),
+                     datetime.now()]:
+            with self.subTest(date=date):
+                string = date.strftime(t_format)
+                self.assertEqual(models.base_model.format_time(date), string)
+                self.assertEqual(models.base_model.parse_time(string), date)
+
+    def test_kwargs_timestamps_round_trip(self):
+        """Test an instance rebuilt from to_dict has the same timestamps"""
+        inst = BaseModel()
+        inst.updated_at = datetime(2024, 1, 9, 10, 59, 22, 98861)
+        copy = BaseModel(**inst.to_dict())
+        self.assertEqual(copy.created_at, inst.created_at)
+        self.assertEqual(copy.updated_at, inst.updated_at)
+        self.assertEqual(copy.to_dict(), inst.to_dict())
+
+
+class TestCompactModels(unittest.TestCase):
+    """Test the instances of the compact layout (HBNB_COMPACT_MODELS=1)
+    behave as the default ones, each layout run in its own process as it
+    is chosen at import"""
+    # prints the to_dict() of a place built, copied, pickled and stripped
+    # of attributes, and whether its class has slots
+    script = """if True:
+        import copy, json, pickle
+        from models.place import Place
+        place = Place(id="p", created_at="2024-01-09T10:59:22.098861",
+                      updated_at="2024-01-09T11:00:00.000000", name="Loft",
+                      amenity_ids=["a"])
+        place.note = "kept"
+        place.extra = "dropped"
+        out = {"built": place.to_dict(),
+               "copy": copy.copy(place).to_dict(),
+               "deepcopy": copy.deepcopy(place).to_dict(),
+               "pickle": pickle.loads(pickle.dumps(place)).to_dict()}
+        shallow = copy.copy(place)
+        shallow.note = "changed"
+        del place.extra
+        del place.name
+        out["deleted"] = place.to_dict()
+        out["slots"] = "__slots__" in vars(Place)
+        print(json.dumps(out))
+        """
+
+    def run_layout(self, compact):
+        """Returns what script prints with the compact layout or not"""
+        env = dict(os.environ, HBNB_COMPACT_MODELS="1" if compact else "0")
+        env.pop("HBNB_TYPE_STORAGE", None)
+        result = subprocess.run([sys.executable, "-c", self.script],
+                                env=env, capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        return json.loads(result.stdout)
+
+    def test_same_to_dict(self):
+        """Test copy, deepcopy, pickle and del give the same to_dict() in
+        both layouts"""
+        default = self.run_layout(False)
+        compact = self.run_layout(True)
+        self.assertFalse(default.pop("slots"))
+        self.assertTrue(compact.pop("slots"))
+        self.assertEqual(compact, default)
+        built = compact["built"]
+        for name in ("copy", "deepcopy", "pickle"):
+            with self.subTest(name=name):
+                self.assertEqual(compact[name], built)
+        self.assertNotIn("city_id", built)
+        self.assertEqual(built["note"], "kept")
+        self.assertNotIn("extra", compact["deleted"])
+        self.assertNotIn("name", compact["deleted"])
+        self.assertEqual(compact["deleted"]["note"], "kept")
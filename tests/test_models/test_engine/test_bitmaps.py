@@ -0,0 +1,90 @@
+#!/usr/bin/python3
+"""
+Contains the TestBitmapsDocs and TestBitmaps classes
+"""
+
+import inspect
+from models.engine import bitmaps
+import pep8
+import unittest
+Bitmaps = bitmaps.Bitmaps
+
+
+class TestBitmapsDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the bitmaps module"""
+    def test_pep8_conformance_bitmaps(self):
+        """Test that models/engine/bitmaps.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/bitmaps.py',
+                                    'tests/test_models/test_engine/\
+test_bitmaps.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_bitmaps_docstrings(self):
+        """Test for the docstrings of the module, Bitmaps and its methods"""
+        self.assertTrue(len(bitmaps.__doc__) >= 1)
+        self.assertTrue(len(Bitmaps.__doc__) >= 1)
+        self.assertTrue(len(bitmaps.members.__doc__) >= 1)
+        for func in inspect.getmembers(Bitmaps, inspect.isfunction):
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestBitmaps(unittest.TestCase):
+    """Test the Bitmaps class"""
+    def setUp(self):
+        """Index 100 places, place i having amenity a<d> for each divisor
+        d of i among 2, 3 and 5"""
+        self.index = Bitmaps()
+        for i in range(100):
+            self.index.put("Place.{}".format(i),
+                           ["a{}".format(d) for d in (2, 3, 5) if i % d == 0])
+
+    def test_members(self):
+        """Test members() lists the bits set, lowest first"""
+        self.assertEqual(bitmaps.members(0), [])
+        self.assertEqual(bitmaps.members(0b100101), [0, 2, 5])
+        self.assertEqual(bitmaps.members(1 << 200), [200])
+
+    def test_select(self):
+        """Test select() returns the keys holding every value"""
+        self.assertCountEqual(self.index.select(["a2", "a3", "a5"]),
+                              ["Place.0", "Place.30", "Place.60",
+                               "Place.90"])
+        self.assertEqual(len(self.index.select(["a2"])), 50)
+        self.assertEqual(self.index.select(["a2", "nope"]), [])
+        self.assertEqual(self.index.select([]), [])
+
+    def test_select_within(self):
+        """Test select() only returns keys of within, whether it is smaller
+        or larger than the bitmaps"""
+        small = {"Place.30", "Place.31", "Place.nope"}
+        self.assertEqual(self.index.select(["a2", "a3"], small),
+                         ["Place.30"])
+        large = {"Place.{}".format(i) for i in range(50, 100)}
+        self.assertCountEqual(self.index.select(["a3", "a5"], large),
+                              ["Place.60", "Place.75", "Place.90"])
+        self.assertEqual(self.index.select(["a2", "a7"], small), [])
+
+    def test_put_replaces_and_drop_frees(self):
+        """Test put() moves a key to its new values and drop() reuses its
+        ordinal"""
+        self.index.put("Place.30", ["a7"])
+        self.assertEqual(self.index.select(["a7"]), ["Place.30"])
+        self.assertNotIn("Place.30", self.index.select(["a2", "a3", "a5"]))
+        ordinal = self.index.ordinals["Place.30"]
+        self.index.drop("Place.30")
+        self.index.drop("Place.30")
+        self.assertNotIn("a7", self.index.bitmaps)
+        self.index.put("Place.new", ["a7"])
+        self.assertEqual(self.index.ordinals["Place.new"], ordinal)
+        self.assertEqual(self.index.select(["a7"]), ["Place.new"])
+
+    def test_put_without_values(self):
+        """Test a key with no values takes no ordinal"""
+        self.index.put("Place.1", [])
+        self.index.put("Place.2", None)
+        self.assertNotIn("Place.1", self.index.ordinals)
+        self.assertNotIn("Place.2", self.index.ordinals)
+        self.assertEqual(len(self.index), 100 - 26 - 1)
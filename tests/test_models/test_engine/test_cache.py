@@ -0,0 +1,99 @@
+#!/usr/bin/python3
+"""
+Contains the TestLRUCacheDocs and TestLRUCache classes
+"""
+
+import inspect
+from models.engine import cache
+import pep8
+import unittest
+LRUCache = cache.LRUCache
+
+
+class TestLRUCacheDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the cache module"""
+    def test_pep8_conformance_cache(self):
+        """Test that models/engine/cache.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/cache.py',
+                                    'tests/test_models/test_engine/\
+test_cache.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_cache_docstrings(self):
+        """Test for the docstrings of the module, LRUCache and its
+        methods"""
+        self.assertTrue(len(cache.__doc__) >= 1)
+        self.assertTrue(len(LRUCache.__doc__) >= 1)
+        for func in inspect.getmembers(LRUCache, inspect.isfunction):
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestLRUCache(unittest.TestCase):
+    """Test the LRUCache class"""
+    def setUp(self):
+        """Create a cache of 3 entries living 10 seconds of a fake clock"""
+        self.now = 0
+        self.cache = LRUCache(3, 10, clock=lambda: self.now)
+
+    def test_get_and_put(self):
+        """Test values are found until they are popped, and counted"""
+        self.cache.put("a", 1)
+        self.assertEqual(self.cache.get("a"), 1)
+        self.assertIsNone(self.cache.get("b"))
+        self.cache.pop("a")
+        self.cache.pop("a")
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(self.cache.stats(),
+                         {"size": 0, "hits": 1, "misses": 2,
+                          "evictions": 0, "expirations": 0})
+
+    def test_lru_eviction(self):
+        """Test the least recently used entry makes room for a new one"""
+        for key in "abc":
+            self.cache.put(key, key)
+        self.cache.get("a")
+        self.cache.put("d", "d")
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual([self.cache.get(key) for key in "acd"],
+                         ["a", "c", "d"])
+        self.assertEqual(len(self.cache), 3)
+        self.assertEqual(self.cache.evictions, 1)
+
+    def test_ttl(self):
+        """Test an entry expires ttl seconds after it was put"""
+        self.cache.put("a", 1)
+        self.now = 9
+        self.assertEqual(self.cache.get("a"), 1)
+        self.cache.put("b", 2)
+        self.now = 10
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(self.cache.get("b"), 2)
+        self.assertEqual(self.cache.expirations, 1)
+
+    def test_generation(self):
+        """Test invalidate() drops its keys and the values read before it"""
+        self.cache.put("a", 1)
+        self.cache.put("b", 2)
+        generation = self.cache.generation
+        self.cache.invalidate(["a"])
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(self.cache.get("b"), 2)
+        self.cache.put("a", 0, generation)
+        self.assertIsNone(self.cache.get("a"))
+        self.cache.put("a", 1, self.cache.generation)
+        self.assertEqual(self.cache.get("a"), 1)
+
+    def test_disabled(self):
+        """Test a cache of size 0 holds and counts nothing"""
+        disabled = LRUCache(0)
+        disabled.put("a", 1)
+        self.assertIsNone(disabled.get("a"))
+        self.assertEqual(disabled.stats()["misses"], 0)
+        self.cache.put("a", 1)
+        self.cache.get("a")
+        self.cache.clear()
+        self.assertEqual(self.cache.stats()["hits"], 0)
+        self.assertEqual(len(self.cache), 0)
@@ -0,0 +1,95 @@
+#!/usr/bin/python3
+"""
+Contains the TestCodecDocs and TestCodec classes
+"""
+
+from datetime import datetime
+import inspect
+import json
+from models.base_model import format_time, parse_time
+from models.engine import codec
+from models.state import State
+import pep8
+import unittest
+from unittest import mock
+
+# the codecs installed here
+names = ["json"] + (["orjson"] if codec.orjson is not None else [])
+
+
+class TestCodecDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the codec module"""
+    def test_pep8_conformance_codec(self):
+        """Test that models/engine/codec.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/codec.py',
+                                    'tests/test_models/test_engine/\
+test_codec.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_codec_docstrings(self):
+        """Test for the docstrings of the module and its functions"""
+        self.assertTrue(len(codec.__doc__) >= 1)
+        for func in inspect.getmembers(codec, inspect.isfunction):
+            if func[1].__module__ == codec.__name__:
+                self.assertTrue(len(func[1].__doc__) >= 1,
+                                "{:s} needs a docstring".format(func[0]))
+
+
+class TestCodec(unittest.TestCase):
+    """Test the dumps() and loads() functions of every installed codec"""
+    def test_round_trip(self):
+        """Test what dumps() writes, loads() and json read back"""
+        obj = {"b": [1, 2.5, None, True], "a": "Åland", "c": {"d": "e"}}
+        for name in names:
+            with self.subTest(codec=name), \
+                    mock.patch.object(codec, "name", name):
+                text = codec.dumps(obj)
+                self.assertIsInstance(text, str)
+                self.assertEqual(codec.loads(text), obj)
+                self.assertEqual(codec.loads(text.encode()), obj)
+                self.assertEqual(json.loads(text), obj)
+
+    def test_sort_keys(self):
+        """Test sort_keys writes the keys in order"""
+        for name in names:
+            with self.subTest(codec=name), \
+                    mock.patch.object(codec, "name", name):
+                self.assertEqual(codec.dumps({"b": 1, "a": 2},
+                                             sort_keys=True),
+                                 '{"a":2,"b":1}')
+
+    def test_native_datetimes(self):
+        """Test a to_dict(native=True) encodes as to_dict() does"""
+        state = State(name="Lagos")
+        state.updated_at = datetime(2024, 1, 9, 10, 59, 22, 98861)
+        for name in names:
+            with self.subTest(codec=name), \
+                    mock.patch.object(codec, "name", name):
+                native = codec.loads(codec.dumps(state.to_dict(native=True)))
+                self.assertEqual(native, state.to_dict())
+                self.assertEqual(parse_time(native["updated_at"]),
+                                 state.updated_at)
+
+    def test_same_text_as_json(self):
+        """Test every codec writes the datetimes, whole seconds included,
+        as the json module does with format_time()"""
+        obj = {"at": [datetime(2024, 1, 9, 10, 59, 22),
+                      datetime(2024, 1, 9, 10, 59, 22, 98861),
+                      datetime(999, 1, 1)], "b": 1, "a": "x"}
+        expected = json.dumps(obj, default=format_time, sort_keys=True,
+                              separators=(",", ":"))
+        self.assertIn('"2024-01-09T10:59:22.000000"', expected)
+        for name in names:
+            with self.subTest(codec=name), \
+                    mock.patch.object(codec, "name", name):
+                self.assertEqual(codec.dumps(obj, sort_keys=True), expected)
+
+    def test_unknown_type(self):
+        """Test an object no codec encodes raises a TypeError"""
+        for name in names:
+            with self.subTest(codec=name), \
+                    mock.patch.object(codec, "name", name):
+                with self.assertRaises(TypeError):
+                    codec.dumps({"a": object()})
@@ -0,0 +1,66 @@
+#!/usr/bin/python3
+"""
+Contains the TestTableDocs and TestTable classes
+"""
+
+import inspect
+from models.engine import columns
+import pep8
+import unittest
+Table = columns.Table
+
+
+class TestTableDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the columns module"""
+    def test_pep8_conformance_columns(self):
+        """Test that models/engine/columns.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/columns.py',
+                                    'tests/test_models/test_engine/\
+test_columns.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_columns_docstrings(self):
+        """Test for the docstrings of the module, Table and its methods"""
+        self.assertTrue(len(columns.__doc__) >= 1)
+        self.assertTrue(len(Table.__doc__) >= 1)
+        for func in inspect.getmembers(Table, inspect.isfunction):
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestTable(unittest.TestCase):
+    """Test the Table class"""
+    def setUp(self):
+        """Fill a table with more rows than its first capacity"""
+        self.table = Table(("price",), ("city",))
+        for i in range(40):
+            self.table.put("Place.{}".format(i),
+                           {"price": i * 10, "city": "c{}".format(i % 3)}.get)
+
+    def test_parse_predicate(self):
+        """Test keywords are split into attribute and operator"""
+        parse = columns.parse_predicate
+        self.assertEqual(parse("price__lte", 1), ("price", "lte"))
+        self.assertEqual(parse("city_id", "x"), ("city_id", "eq"))
+        self.assertEqual(parse("city_id", ["x"]), ("city_id", "in"))
+        self.assertEqual(parse("max__guest", 1), ("max__guest", "eq"))
+
+    def test_select_numbers_and_codes(self):
+        """Test select() combines range and equality predicates"""
+        keys, rest = self.table.select({"price__gte": 100, "price__lt": 200,
+                                        "city": ["c0", "c1"], "name": "x"})
+        self.assertEqual(rest, {"name": "x"})
+        expected = ["Place.{}".format(i) for i in range(10, 20) if i % 3 < 2]
+        self.assertCountEqual(keys, expected)
+
+    def test_set_and_drop(self):
+        """Test set() updates a cell and drop() keeps the other rows"""
+        self.table.set("Place.5", "price", 1000)
+        self.table.drop("Place.0")
+        keys, rest = self.table.select({"price__gt": 350})
+        self.assertCountEqual(keys, ["Place.5", "Place.36", "Place.37",
+                                     "Place.38", "Place.39"])
+        self.assertEqual(len(self.table), 39)
+        self.assertEqual(self.table.select({"city": "nowhere"})[0], [])
@@ -17,12 +17,31 @@ from models.user import User
 import json
 import os
 import pep8
+import threading
 import unittest
+from contextlib import contextmanager
+from sqlalchemy import event, func, select, text
 DBStorage = db_storage.DBStorage
 classes = {"Amenity": Amenity, "City": City, "Place": Place,
            "Review": Review, "State": State, "User": User}
 
 
+@contextmanager
+def count_statements(storage):
+    """Collects in a list the SQL statements storage runs in the block"""
+    engine = storage._DBStorage__engine
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        """Records one statement"""
+        statements.append(statement)
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
 class TestDBStorageDocs(unittest.TestCase):
     """Tests to check the documentation and style of DBStorage class"""
     @classmethod
@@ -125,6 +144,32 @@ class TestDbStorage(unittest.TestCase):
                                         "ffffffff-ff79-dfdc-rrra-wwdqqqqcdyyc")
         self.assertTrue(cls_object is None)
 
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_get_primary_key_lookup(self):
+        """Test get() runs a single SELECT of the row of the id, and a second
+        get() of the id is answered by the identity map without a query"""
+        storage = models.storage
+        saved = storage.cache
+        storage.cache = db_storage.LRUCache(0)
+        state = State(name="Kebbi")
+        storage.new(state)
+        storage.save()
+        storage.close()
+        with count_statements(storage) as statements:
+            found = storage.get(State, state.id)
+        self.assertEqual(found.name, "Kebbi")
+        self.assertEqual(len(statements), 1)
+        self.assertRegex(statements[0], r"^SELECT [^;]*\sFROM states\s+"
+                         r"WHERE states\.id = (\?|%s)$")
+        with count_statements(storage) as statements:
+            self.assertIs(storage.get(State, state.id), found)
+            self.assertIs(storage.get("State", state.id), found)
+        self.assertEqual(statements, [])
+        storage.delete(found)
+        storage.save()
+        storage.close()
+        storage.cache = saved
+
     @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
     def test_count_all_objects_if_no_class_passed(self):
         """Test count() returns the count of all objects in storage"""
@@ -147,3 +192,445 @@ class TestDbStorage(unittest.TestCase):
         cls_count = models.storage.count(State)
         expected_count = len(models.storage.all(State))
         self.assertEqual(cls_count, expected_count)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_counts_every_class(self):
+        """Test counts() matches count() for every class"""
+        obj = State()
+        obj.name = "Ogun"
+        obj.save()
+        counts = models.storage.counts()
+        self.assertEqual(set(counts), set(classes))
+        for name, cls in classes.items():
+            self.assertEqual(counts[name], models.storage.count(cls))
+        self.assertEqual(sum(counts.values()), models.storage.count())
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_page_and_stream(self):
+        """Test page() and stream() walk the objects in id order"""
+        amenities = sorted([Amenity(name=str(i)) for i in range(5)],
+                           key=lambda amenity: amenity.id)
+        for amenity in amenities:
+            models.storage.new(amenity)
+        models.storage.save()
+        ids = sorted(obj.id for obj in models.storage.all(Amenity).values())
+        first = models.storage.page(Amenity, limit=2)
+        self.assertEqual([obj.id for obj in first], ids[:2])
+        rest = models.storage.page("Amenity", first[-1].id)
+        self.assertEqual([obj.id for obj in rest], ids[2:])
+        streamed = models.storage.stream(Amenity, size=2)
+        self.assertEqual([obj.id for obj in streamed], ids)
+
+
+class TestDBStorageLoad(unittest.TestCase):
+    """Test the load= option of the DBStorage queries against N+1 queries"""
+    def setUp(self):
+        """Store 3 states of 2 cities each, then forget the loaded objects"""
+        if models.storage_t != 'db':
+            self.skipTest("not testing db storage")
+        self.states = []
+        for i in range(3):
+            state = State(name="S{}".format(i))
+            models.storage.new(state)
+            for j in range(2):
+                models.storage.new(City(name="C{}".format(j),
+                                        state_id=state.id))
+            self.states.append(state.id)
+        models.storage.save()
+        models.storage.close()
+
+    def tearDown(self):
+        """Delete the states and their cities"""
+        models.storage.close()
+        for state_id in self.states:
+            state = models.storage.get(State, state_id)
+            for city in state.cities:
+                models.storage.delete(city)
+            models.storage.delete(state)
+        models.storage.save()
+        models.storage.close()
+
+    def walk(self, states):
+        """Touches the cities of the stored states"""
+        for state in states:
+            if state.id in self.states:
+                self.assertEqual(len(state.cities), 2)
+
+    def test_lazy_cities_query_per_state(self):
+        """Test a query per state without load, which load= avoids"""
+        with count_statements(models.storage) as statements:
+            self.walk(models.storage.all(State).values())
+        self.assertGreaterEqual(len(statements), 1 + len(self.states))
+
+    def test_selectin_cities(self):
+        """Test load= loads every state's cities with one more query"""
+        with count_statements(models.storage) as statements:
+            self.walk(models.storage.all(State, load=["cities"]).values())
+        self.assertEqual(len(statements), 2)
+
+    def test_joined_cities(self):
+        """Test a joined load= loads the states and cities in one query"""
+        with count_statements(models.storage) as statements:
+            states = models.storage.all(State, load={"cities": "joined"})
+            self.walk(states.values())
+        self.assertEqual(len(statements), 1)
+
+    def test_load_path_on_get_and_page(self):
+        """Test load= on get() and page(), with a path of relationships"""
+        with count_statements(models.storage) as statements:
+            state = models.storage.get(State, self.states[0],
+                                       load=["cities.places"])
+            for city in state.cities:
+                self.assertEqual(city.places, [])
+            self.walk(models.storage.page(State, load=["cities"]))
+        self.assertEqual(len(statements), 3 + 2)
+
+    def test_loaded_relationships_not_in_to_dict(self):
+        """Test to_dict() leaves out the relationships loaded with load="""
+        state = models.storage.get(State, self.states[0], load=["cities"])
+        self.assertNotIn("cities", state.to_dict())
+        self.assertEqual(state.to_dict()["name"], "S0")
+
+
+class TestDBStorageIndexes(unittest.TestCase):
+    """Test the hot queries use the indexes declared on the models, from
+    the query plans of SQLite standing in for MySQL"""
+    def setUp(self):
+        """Skip unless the database is SQLite"""
+        if models.storage_t != 'db':
+            self.skipTest("not testing db storage")
+        self.engine = models.storage._DBStorage__engine
+        if self.engine.dialect.name != "sqlite":
+            self.skipTest("EXPLAIN QUERY PLAN is SQLite's")
+
+    def plan(self, query):
+        """Returns the details of the EXPLAIN QUERY PLAN of query"""
+        sql = str(query.compile(self.engine,
+                                compile_kwargs={"literal_binds": True}))
+        with self.engine.connect() as connection:
+            rows = connection.execute(text("EXPLAIN QUERY PLAN " + sql))
+            return " ".join(row[-1] for row in rows)
+
+    def test_hot_queries_use_indexes(self):
+        """Test each lookup searches its index instead of scanning"""
+        place_amenity = Place.amenities.property.secondary
+        queries = [
+            (select(City).where(City.state_id == "s"), "ix_cities_state_id"),
+            (select(Place).where(Place.city_id == "c"),
+             "ix_places_city_id_price_by_night"),
+            (select(Place).where(Place.city_id.in_(["c", "d"]),
+                                 Place.price_by_night <= 100),
+             "ix_places_city_id_price_by_night"),
+            (select(Place).where(Place.user_id == "u"), "ix_places_user_id"),
+            (select(Review).where(Review.place_id == "p"),
+             "ix_reviews_place_id"),
+            (select(Review).where(Review.user_id == "u"),
+             "ix_reviews_user_id"),
+            (select(User).where(User.email == "a@b.c"), "ix_users_email"),
+            (select(func.max(State.updated_at)),
+             "COVERING INDEX ix_states_updated_at"),
+            (select(place_amenity.c.place_id).where(
+                place_amenity.c.amenity_id.in_(["a", "b"])).group_by(
+                place_amenity.c.place_id),
+             "COVERING INDEX ix_place_amenity_amenity_id_place_id")]
+        for query, index in queries:
+            with self.subTest(index=index):
+                self.assertIn(index, self.plan(query))
+
+    def test_migrate_creates_missing_indexes(self):
+        """Test migrate() adds the indexes an existing schema lacks"""
+        index = [index for index in Review.__table__.indexes
+                 if index.name == "ix_reviews_user_id"][0]
+        models.storage.close()
+        index.drop(self.engine)
+        # a new literal: the sqlite3 module caches the plans it explained
+        self.assertNotIn("ix_reviews_user_id",
+                         self.plan(select(Review).where(
+                             Review.user_id == "dropped")))
+        self.assertEqual(models.storage.migrate(), ["ix_reviews_user_id"])
+        self.assertEqual(models.storage.migrate(), [])
+
+
+class TestDBStorageCache(unittest.TestCase):
+    """Test the read-through cache of DBStorage get() and all()"""
+    def setUp(self):
+        """Enable the cache and store a state of 2 cities"""
+        if models.storage_t != 'db':
+            self.skipTest("not testing db storage")
+        storage = models.storage
+        self.saved = storage.cache
+        storage.cache = db_storage.LRUCache(100, 60)
+        self.state = State(name="Lagos")
+        self.cities = [City(name=str(i), state_id=self.state.id)
+                       for i in range(2)]
+        for obj in [self.state] + self.cities:
+            storage.new(obj)
+        storage.save()
+        storage.close()
+
+    def tearDown(self):
+        """Delete the objects and restore the cache"""
+        storage = models.storage
+        storage.close()
+        for obj in self.cities + [self.state]:
+            obj = storage.get(type(obj), obj.id)
+            if obj is not None:
+                storage.delete(obj)
+        storage.save()
+        storage.close()
+        storage.cache = self.saved
+
+    def test_get_hit_after_close(self):
+        """Test a get() after close() is a hit without any query, and its
+        relationships still load"""
+        storage = models.storage
+        storage.get(State, self.state.id)
+        storage.close()
+        with count_statements(storage) as statements:
+            state = storage.get(State, self.state.id)
+        self.assertEqual(statements, [])
+        self.assertEqual(state.name, "Lagos")
+        self.assertIsNot(state, self.state)
+        self.assertCountEqual([city.id for city in state.cities],
+                              [city.id for city in self.cities])
+        self.assertEqual(storage.cache.hits, 1)
+        self.assertEqual(storage.cache.misses, 1)
+
+    def test_all_hit_after_close(self):
+        """Test all(cls) after close() is answered without any query"""
+        storage = models.storage
+        first = storage.all(City)
+        storage.close()
+        with count_statements(storage) as statements:
+            second = storage.all(City)
+        self.assertEqual(statements, [])
+        self.assertEqual(sorted(first), sorted(second))
+
+    def test_writes_invalidate(self):
+        """Test new, changed and deleted objects are read again"""
+        storage = models.storage
+        storage.all(City)
+        state = storage.get(State, self.state.id)
+        state.name = "Abuja"
+        storage.save()
+        city = City(name="new", state_id=self.state.id)
+        storage.new(city)
+        self.cities.append(city)
+        storage.save()
+        storage.delete(storage.get(City, self.cities[0].id))
+        storage.save()
+        storage.close()
+        self.assertEqual(storage.get(State, self.state.id).name, "Abuja")
+        self.assertIsNone(storage.get(City, self.cities[0].id))
+        found = storage.all(City)
+        self.assertIn("City." + city.id, found)
+        self.assertNotIn("City." + self.cities[0].id, found)
+
+    def test_commit_invalidates_racing_reads(self):
+        """Test an object another session caches between the flush and the
+        commit of a write, or read in a transaction begun before the
+        commit, is not served once the write is committed"""
+        storage = models.storage
+        key = ("State", self.state.id)
+        storage.get(State, self.state.id)
+        generation = storage.cache.generation
+        storage.get(State, self.state.id).name = "Ibadan"
+        storage.all(City)
+        self.assertIsNone(storage.cache.get(key))
+        storage.cache.put(key, "stale", storage.cache.generation)
+        storage.save()
+        self.assertIsNone(storage.cache.get(key))
+        storage.cache.put(key, "stale", generation)
+        self.assertIsNone(storage.cache.get(key))
+        storage.close()
+        self.assertEqual(storage.get(State, self.state.id).name, "Ibadan")
+
+    def test_bypassed_with_pending_changes(self):
+        """Test the cache is not used while the session holds changes"""
+        storage = models.storage
+        storage.get(State, self.state.id)
+        storage.close()
+        storage.new(State(name="pending"))
+        storage.get(State, self.state.id)
+        storage.close()
+        self.assertEqual(storage.cache.hits, 0)
+
+
+class TestDBStorageVersion(unittest.TestCase):
+    """Test the version() method of the DBStorage class"""
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_version_changes_on_commits(self):
+        """Test the tag of a class changes when a write of its objects is
+        committed, not when it is rolled back"""
+        storage = models.storage
+        before = storage.version(State)
+        city = storage.version(City)
+        state = State(name="Ohio")
+        state_id = state.id
+        storage.new(state)
+        storage.save()
+        added = storage.version(State)
+        self.assertNotEqual(added[0], before[0])
+        self.assertGreaterEqual(added[1], before[1])
+        self.assertEqual(storage.version(City)[0], city[0])
+        storage.new(State(name="dropped"))
+        with self.assertRaises(ValueError):
+            with storage.batch():
+                storage.all(State)
+                raise ValueError
+        storage.close()
+        self.assertEqual(storage.version(State)[0], added[0])
+        storage.delete(storage.get(State, state_id))
+        storage.save()
+        self.assertNotIn(storage.version(State)[0], (before[0], added[0]))
+        storage.close()
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_version_without_scan(self):
+        """Test version() counts the objects from the counters and reads
+        only their latest updated_at, which moves when a row is saved"""
+        storage = models.storage
+        state = State(name="Iowa")
+        storage.new(state)
+        storage.save()
+        before = storage.version(State)
+        with count_statements(storage) as statements:
+            self.assertEqual(storage.version(State), before)
+        self.assertEqual(len(statements), 1)
+        self.assertIn("max(", statements[0])
+        self.assertNotIn("count(", statements[0])
+        engine = storage._DBStorage__engine
+        with engine.begin() as conn:
+            conn.execute(State.__table__.update().where(
+                State.id == state.id).values(updated_at=datetime(2100, 1, 1)))
+        after = storage.version(State)
+        self.assertNotEqual(after[0], before[0])
+        self.assertEqual(after[1], datetime(2100, 1, 1))
+        storage.delete(state)
+        storage.save()
+        storage.close()
+
+
+class TestDBStorageCounts(unittest.TestCase):
+    """Test the counters of DBStorage counts() and count()"""
+    def setUp(self):
+        """Read the counters, kept for an hour"""
+        if models.storage_t != 'db':
+            self.skipTest("not testing db storage")
+        storage = models.storage
+        self.engine = storage._DBStorage__engine
+        self.saved = storage.count_ttl
+        storage.count_ttl = 3600
+        storage.close()
+        self.before = storage.counts()["State"]
+        self.ids = []
+
+    def tearDown(self):
+        """Delete the states and read the counters again"""
+        storage = models.storage
+        storage.close()
+        with self.engine.begin() as conn:
+            conn.execute(State.__table__.delete().where(
+                State.id.in_(self.ids)))
+        storage.count_ttl = 0
+        storage.counts()
+        storage.close()
+        storage.count_ttl = self.saved
+
+    def test_counts_follow_writes(self):
+        """Test adds and deletes are counted without a query, pending ones
+        included, and rolled back ones left out"""
+        storage = models.storage
+        state = State(name="Kano")
+        self.ids.append(state.id)
+        with count_statements(storage) as statements:
+            storage.new(state)
+            self.assertEqual(storage.count(State), self.before + 1)
+        self.assertEqual(statements, [])
+        storage.save()
+        storage.close()
+        with count_statements(storage) as statements:
+            self.assertEqual(storage.counts()["State"], self.before + 1)
+        self.assertEqual(statements, [])
+        dropped = State(name="dropped")
+        storage.new(dropped)
+        with self.assertRaises(ValueError):
+            with storage.batch():
+                storage.all(State)
+                raise ValueError
+        storage.close()
+        self.assertEqual(storage.count(State), self.before + 1)
+        storage.delete(storage.get(State, self.ids[0]))
+        storage.save()
+        self.assertEqual(storage.count(State), self.before)
+
+    def test_counts_reconciled(self):
+        """Test rows written by another process are counted once the
+        counters are read again"""
+        storage = models.storage
+        self.ids.append("raw")
+        with self.engine.begin() as conn:
+            conn.execute(State.__table__.insert(),
+                         {"id": "raw", "name": "raw",
+                          "created_at": datetime.now(),
+                          "updated_at": datetime.now()})
+        self.assertEqual(storage.count(State), self.before)
+        storage.count_ttl = 0
+        self.assertEqual(storage.count(State), self.before + 1)
+
+    def test_count_unstored(self):
+        """Test a class that is not stored, or an unknown name, counts 0"""
+        storage = models.storage
+        self.assertEqual(storage.count(BaseModel), 0)
+        self.assertEqual(storage.count("BaseModel"), 0)
+        self.assertEqual(storage.count("Nope"), 0)
+        self.assertEqual(storage.count(), sum(storage.counts().values()))
+
+
+class TestDBStorageBatch(unittest.TestCase):
+    """Test the batch() context manager of the DBStorage class"""
+    def setUp(self):
+        """Skip an in-memory SQLite database, which each thread has its
+        own of"""
+        if models.storage_t != 'db':
+            self.skipTest("not testing db storage")
+        self.engine = models.storage._DBStorage__engine
+        if self.engine.url.get_backend_name() == "sqlite" and \
+                self.engine.url.database in (None, "", ":memory:"):
+            self.skipTest("each thread has its own in-memory database")
+
+    def tearDown(self):
+        """Delete the states"""
+        models.storage.close()
+        with self.engine.begin() as conn:
+            conn.execute(State.__table__.delete().where(
+                State.name.in_(["Thread", "Main"])))
+
+    def names(self):
+        """returns the names of the committed test states"""
+        with self.engine.connect() as conn:
+            return sorted(conn.execute(select(State.name).where(
+                State.name.in_(["Thread", "Main"]))).scalars())
+
+    def test_batches_of_threads_apart(self):
+        """Test a batch commits on exit while another thread is in one,
+        which commits its own changes when it leaves"""
+        storage = models.storage
+        entered, leave = threading.Event(), threading.Event()
+
+        def other():
+            """Adds a state in a batch left when told to"""
+            with storage.batch():
+                storage.new(State(name="Thread"))
+                entered.set()
+                leave.wait(5)
+            storage.close()
+        thread = threading.Thread(target=other)
+        thread.start()
+        entered.wait(5)
+        with storage.batch():
+            storage.new(State(name="Main"))
+        self.assertEqual(self.names(), ["Main"])
+        leave.set()
+        thread.join()
+        self.assertEqual(self.names(), ["Main", "Thread"])
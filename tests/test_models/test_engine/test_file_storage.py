@@ -7,6 +7,7 @@ from datetime import datetime
 import inspect
 import models
 from models.engine import file_storage
+from models.engine.search import PlaceSearch
 from models.amenity import Amenity
 from models.base_model import BaseModel
 from models.city import City
@@ -17,12 +18,28 @@ from models.user import User
 import json
 import os
 import pep8
+import threading
 import unittest
+from unittest import mock
 FileStorage = file_storage.FileStorage
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
 
 
+def clean_files():
+    """Folds the journal into file.json and removes the text index files,
+    so a test reads and writes file.json alone whatever the HBNB_FILE_*
+    settings and the tests run before"""
+    if models.storage_t == 'db':
+        return
+    FileStorage().compact()
+    for name in ("file.json.log", "file.json.text", "file.json.text.log",
+                 "file.json.text.stamp"):
+        if os.path.exists(name):
+            os.remove(name)
+    FileStorage._FileStorage__generation = None
+
+
 class TestFileStorageDocs(unittest.TestCase):
     """Tests to check the documentation and style of FileStorage class"""
     @classmethod
@@ -70,6 +87,14 @@ test_file_storage.py'])
 
 class TestFileStorage(unittest.TestCase):
     """Test the FileStorage class"""
+    def setUp(self):
+        """Start from file.json alone"""
+        clean_files()
+
+    def tearDown(self):
+        """Leave file.json alone"""
+        clean_files()
+
     @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
     def test_all_returns_dict(self):
         """Test that all returns the FileStorage.__objects attr"""
@@ -98,6 +123,7 @@ class TestFileStorage(unittest.TestCase):
     def test_save(self):
         """Test that save properly saves objects to file.json"""
         storage = FileStorage()
+        storage.journal = False
         new_dict = {}
         for key, value in classes.items():
             instance = value()
@@ -160,3 +186,606 @@ class TestFileStorage(unittest.TestCase):
         cls_count = models.storage.count(State)
         expected_count = len(models.storage.all(State))
         self.assertEqual(cls_count, expected_count)
+
+    @unittest.skipIf(models.storage_t == 'db', "testing db storage")
+    def test_all_with_class_returns_only_that_class(self):
+        """Test all(cls) only holds objects of cls, by class or name"""
+        state = State()
+        city = City()
+        models.storage.new(state)
+        models.storage.new(city)
+        states = models.storage.all(State)
+        self.assertIn("State." + state.id, states)
+        self.assertNotIn("City." + city.id, states)
+        self.assertEqual(dict(states), dict(models.storage.all("State")))
+        for obj in states.values():
+            self.assertIs(type(obj), State)
+
+    @unittest.skipIf(models.storage_t == 'db', "testing db storage")
+    def test_all_with_class_is_a_snapshot(self):
+        """Test the objects of all(cls) can be deleted while walking it,
+        and it does not follow later changes of the storage"""
+        states = [State(name=str(i)) for i in range(3)]
+        for state in states:
+            models.storage.new(state)
+        mine = {state.id for state in states}
+        found = models.storage.all(State)
+        for obj in found.values():
+            if obj.id in mine:
+                models.storage.delete(obj)
+        for state in states:
+            self.assertIn("State." + state.id, found)
+            self.assertNotIn("State." + state.id, models.storage.all(State))
+        found.clear()
+        self.assertEqual(len(models.storage.all(State)),
+                         models.storage.count(State))
+
+    @unittest.skipIf(models.storage_t == 'db', "testing db storage")
+    def test_delete_updates_class_index(self):
+        """Test delete() removes the object from get(), all(cls), count()"""
+        state = State()
+        models.storage.new(state)
+        count = models.storage.count(State)
+        self.assertIs(models.storage.get(State, state.id), state)
+        models.storage.delete(state)
+        self.assertIsNone(models.storage.get(State, state.id))
+        self.assertNotIn("State." + state.id, models.storage.all(State))
+        self.assertEqual(models.storage.count(State), count - 1)
+
+    @unittest.skipIf(models.storage_t == 'db', "testing db storage")
+    def test_related_follows_foreign_keys(self):
+        """Test related() tracks new(), attribute updates and delete()"""
+        state = State()
+        other = State()
+        city = City()
+        city.state_id = state.id
+        models.storage.new(city)
+        self.assertEqual(models.storage.related(City, "state_id", state.id),
+                         [city])
+        self.assertEqual(state.cities, [city])
+        city.state_id = other.id
+        self.assertEqual(state.cities, [])
+        self.assertEqual(other.cities, [city])
+        models.storage.delete(city)
+        self.assertEqual(other.cities, [])
+
+    @unittest.skipIf(models.storage_t == 'db', "testing db storage")
+    def test_related_reviews_of_place(self):
+        """Test Place.reviews and User.reviews use the reverse index"""
+        place = Place()
+        user = User()
+        review = Review(place_id=place.id, user_id=user.id)
+        models.storage.new(review)
+        self.assertEqual(place.reviews, [review])
+        self.assertEqual(user.reviews, [review])
+        models.storage.delete(review)
+        self.assertEqual(place.reviews, [])
+
+
+class TestFileStorageJournal(unittest.TestCase):
+    """Test the journal mode of the FileStorage class"""
+    def setUp(self):
+        """Switch a storage to journal mode on a fresh snapshot"""
+        self.storage = FileStorage()
+        self.storage.journal = True
+        self.storage.journal_limit = 100
+        self.storage.compact()
+
+    def tearDown(self):
+        """Leave journal mode, folding the journal into file.json"""
+        self.storage.compact()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_appends_only_changes(self):
+        """Test save() appends the changed objects and leaves file.json"""
+        with open("file.json", "r") as f:
+            snapshot = f.read()
+        state = State(name="Lagos")
+        self.storage.new(state)
+        self.storage.save()
+        with open("file.json", "r") as f:
+            self.assertEqual(f.read(), snapshot)
+        with open("file.json.log", "r") as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual(records, [{"key": "State." + state.id,
+                                    "obj": state.to_dict()}])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_reload_replays_journal(self):
+        """Test reload() applies journaled updates and deletions"""
+        state = State(name="Lagos")
+        gone = State(name="Kano")
+        self.storage.new(state)
+        self.storage.new(gone)
+        self.storage.save()
+        state.name = "Oyo"
+        self.storage.save()
+        self.storage.delete(gone)
+        self.storage.save()
+        state.name = "unsaved"
+        self.storage.reload()
+        self.assertEqual(self.storage.get(State, state.id).name, "Oyo")
+        self.assertIsNone(self.storage.get(State, gone.id))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_compact_after_journal_limit(self):
+        """Test save() folds the journal into file.json past the limit"""
+        self.storage.journal_limit = 2
+        states = [State(name="Ekiti"), State(name="Osun")]
+        for state in states:
+            self.storage.new(state)
+            self.storage.save()
+        self.assertFalse(os.path.exists("file.json.log"))
+        with open("file.json", "r") as f:
+            js = json.load(f)
+        for state in states:
+            self.assertEqual(js["State." + state.id], state.to_dict())
+
+
+class TestFileStorageDirty(unittest.TestCase):
+    """Test the change tracking of the FileStorage class"""
+    def setUp(self):
+        """Start from file.json alone"""
+        clean_files()
+
+    def tearDown(self):
+        """Leave file.json alone"""
+        clean_files()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_dirty_count(self):
+        """Test setting an attribute, new() and delete() mark objects"""
+        storage = FileStorage()
+        storage.save()
+        self.assertEqual(storage.dirty_count(), 0)
+        state = State()
+        storage.new(state)
+        self.assertEqual(storage.dirty_count(), 1)
+        storage.save()
+        state.name = "Enugu"
+        self.assertEqual(storage.dirty_count(), 1)
+        storage.delete(state)
+        self.assertEqual(storage.dirty_count(), 1)
+        storage.save()
+        self.assertEqual(storage.dirty_count(), 0)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_changed_only_when_stored(self):
+        """Test only the attribute changes of a stored object are passed
+        on to the storage, not those of an object being built"""
+        storage = FileStorage()
+        with mock.patch.object(FileStorage, "changed") as changed:
+            state = State(**State(name="Ogun").to_dict())
+            state.name = "Osun"
+            self.assertEqual(changed.call_count, 0)
+            storage.new(state)
+            state.name = "Oyo"
+            changed.assert_called_once_with(state, "name", "Osun")
+            storage.delete(state)
+            state.name = "Ondo"
+            self.assertEqual(changed.call_count, 1)
+        storage.save()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_encodes_only_dirty_objects(self):
+        """Test save() reuses the JSON text of unchanged objects"""
+        storage = FileStorage()
+        storage.journal = False
+        storage.lazy = False
+        states = [State(name="Abia"), State(name="Imo")]
+        for state in states:
+            storage.new(state)
+        storage.save()
+        states[0].name = "Anambra"
+        with mock.patch.object(BaseModel, "to_dict", autospec=True,
+                               side_effect=BaseModel.to_dict) as to_dict:
+            storage.save()
+        self.assertEqual(to_dict.call_count, 1)
+        with open("file.json", "r") as f:
+            js = json.load(f)
+        for state in states:
+            self.assertEqual(js["State." + state.id], state.to_dict())
+
+
+class TestFileStorageBatch(unittest.TestCase):
+    """Test the batch() context manager of the FileStorage class"""
+    def setUp(self):
+        """Start from file.json alone"""
+        clean_files()
+
+    def tearDown(self):
+        """Leave file.json alone"""
+        clean_files()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_batch_saves_once(self):
+        """Test saves inside batch() are written once, on exit"""
+        storage = FileStorage()
+        storage.journal = False
+        with mock.patch.object(FileStorage, "compact") as compact:
+            with storage.batch():
+                for name in ["Kogi", "Kwara", "Benue"]:
+                    state = State(name=name)
+                    storage.new(state)
+                    storage.save()
+                with storage.batch():
+                    storage.save()
+                self.assertEqual(compact.call_count, 0)
+            self.assertEqual(compact.call_count, 1)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_batch_does_not_save_on_error(self):
+        """Test nothing is written when the batch raises"""
+        storage = FileStorage()
+        with mock.patch.object(FileStorage, "compact") as compact:
+            with self.assertRaises(ValueError):
+                with storage.batch():
+                    storage.new(State(name="Delta"))
+                    storage.save()
+                    raise ValueError
+            self.assertEqual(compact.call_count, 0)
+        storage.save()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_batches_of_threads_apart(self):
+        """Test a batch saves on exit while another thread is in one"""
+        storage = FileStorage()
+        storage.journal = False
+        entered, leave = threading.Event(), threading.Event()
+
+        def other():
+            """Stays in a batch until told to leave"""
+            with storage.batch():
+                entered.set()
+                leave.wait(5)
+        thread = threading.Thread(target=other)
+        with mock.patch.object(FileStorage, "compact") as compact:
+            thread.start()
+            entered.wait(5)
+            with storage.batch():
+                storage.new(State(name="Edo"))
+                storage.save()
+            self.assertEqual(compact.call_count, 1)
+            leave.set()
+            thread.join()
+        storage.save()
+
+
+class TestFileStorageLazy(unittest.TestCase):
+    """Test the lazy reload mode of the FileStorage class, and the indexes
+    every reload leaves to the first query"""
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_lazy_reload_builds_objects_on_access(self):
+        """Test a lazy reload only builds the objects that are used"""
+        storage = FileStorage()
+        storage.lazy = True
+        state = State(name="Sokoto")
+        city = City(name="Wamakko", state_id=state.id)
+        storage.new(state)
+        storage.new(city)
+        storage.save()
+        count = storage.count()
+        storage._FileStorage__stamp = None
+        storage.reload()
+        objects = storage._FileStorage__objects
+        self.assertNotIn("State." + state.id, objects)
+        self.assertEqual(storage.count(), count)
+        loaded = storage.get(State, state.id)
+        self.assertIsNot(loaded, state)
+        self.assertEqual(loaded.name, "Sokoto")
+        self.assertIn("State." + state.id, objects)
+        self.assertNotIn("City." + city.id, objects)
+        self.assertEqual([c.id for c in loaded.cities], [city.id])
+        self.assertEqual(len(storage.all()), count)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_lazy_amenity_index(self):
+        """Test the amenity index covers raw records, without building the
+        places it does not return"""
+        storage = FileStorage()
+        storage.lazy = True
+        wifi = Amenity(name="Wifi")
+        with_wifi = Place(amenity_ids=[wifi.id])
+        without = Place(amenity_ids=["other"])
+        for obj in (wifi, with_wifi, without):
+            storage.new(obj)
+        storage.save()
+        storage._FileStorage__stamp = None
+        storage.reload()
+        objects = storage._FileStorage__objects
+        self.assertEqual([place.id for place in
+                          storage.related(Place, "amenity_ids", wifi.id)],
+                         [with_wifi.id])
+        self.assertNotIn("Place." + without.id, objects)
+        loaded = storage.get(Place, with_wifi.id)
+        loaded.amenity_ids = []
+        self.assertEqual(storage.related(Place, "amenity_ids", wifi.id), [])
+        storage.delete(loaded)
+        storage.delete(storage.get(Place, without.id))
+        storage.delete(storage.get(Amenity, wifi.id))
+        storage.save()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_lazy_indexes_built_on_query(self):
+        """Test a lazy reload leaves the secondary indexes to the first
+        query, which sees the objects changed in the meantime"""
+        storage = FileStorage()
+        storage.lazy = True
+        cheap = Place(name="Cheap", price_by_night=20)
+        dear = Place(name="Dear", price_by_night=300)
+        for obj in (cheap, dear):
+            storage.new(obj)
+        storage.save()
+        storage._FileStorage__stamp = None
+        with mock.patch.object(file_storage.SortedIndex, "put") as put, \
+                mock.patch.object(file_storage.Table, "put") as row:
+            storage.reload()
+        put.assert_not_called()
+        row.assert_not_called()
+        self.assertIn("Place." + cheap.id,
+                      storage._FileStorage__unindexed["Place"])
+        storage.get(Place, dear.id).price_by_night = 10
+        found = [place.id for place in
+                 storage.filter(Place, price_by_night__lt=50)]
+        self.assertIn(cheap.id, found)
+        self.assertIn(dear.id, found)
+        self.assertNotIn("Place", storage._FileStorage__unindexed)
+        search = PlaceSearch(ranges={"price_by_night": (None, 15)})
+        found = [place.id for place in storage.search(search)]
+        self.assertIn(dear.id, found)
+        self.assertNotIn(cheap.id, found)
+        storage.delete(storage.get(Place, cheap.id))
+        storage.delete(storage.get(Place, dear.id))
+        storage.save()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_eager_indexes_built_on_query(self):
+        """Test an eager reload builds the objects but leaves their Table
+        rows, Bitmaps, Grid points and words to the first query"""
+        storage = FileStorage()
+        storage.lazy = False
+        place = Place(name="Riverside", price_by_night=80, latitude=6.5,
+                      longitude=3.4, amenity_ids=["pool"])
+        storage.new(place)
+        storage.save()
+        storage._FileStorage__stamp = None
+        indexes = (file_storage.Table, file_storage.Bitmaps,
+                   file_storage.Grid, file_storage.TextIndex)
+        with mock.patch.object(indexes[0], "put") as row, \
+                mock.patch.object(indexes[1], "put") as bitmap, \
+                mock.patch.object(indexes[2], "put") as point, \
+                mock.patch.object(indexes[3], "put") as words:
+            storage.reload()
+        for put in (row, bitmap, point, words):
+            put.assert_not_called()
+        self.assertIn("Place." + place.id, storage._FileStorage__objects)
+        self.assertEqual([obj.id for obj in
+                          storage.filter(Place, price_by_night__gte=80,
+                                         name="Riverside")], [place.id])
+        self.assertEqual([obj.id for obj in
+                          storage.related(Place, "amenity_ids", "pool")],
+                         [place.id])
+        self.assertIn(place.id, [obj.id for score, obj in
+                                 storage.text_search("riverside")])
+        storage.delete(storage.get(Place, place.id))
+        storage.save()
+
+
+class TestFileStorageText(unittest.TestCase):
+    """Test the text index of the FileStorage class"""
+    def setUp(self):
+        """Start from file.json alone"""
+        clean_files()
+
+    def tearDown(self):
+        """Leave file.json alone"""
+        clean_files()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_text_index_persisted(self):
+        """Test the text index is written next to the JSON file and read
+        back by reload instead of tokenizing the texts again"""
+        storage = FileStorage()
+        storage.journal = False
+        storage.lazy = False
+        place = Place(name="Loft", description="Quiet loft by the canal")
+        review = Review(text="Canal view, canal breeze")
+        storage.new(place)
+        storage.new(review)
+        storage.save()
+        self.assertEqual([obj for score, obj in
+                          storage.text_search("canal")], [review, place])
+        with open("file.json.text.stamp", "r") as f:
+            stamp = json.load(f)
+        with open("file.json.text", "r") as f:
+            index = json.load(f)
+        self.assertEqual(index["generation"], stamp["generation"])
+        self.assertEqual(index["terms"]["Place." + place.id]["loft"], 2)
+        saved = FileStorage._FileStorage__text
+        FileStorage._FileStorage__text = file_storage.TextIndex()
+        try:
+            storage._FileStorage__stamp = None
+            with mock.patch.object(file_storage.TextIndex, "put") as put:
+                storage.reload()
+            keys = [call[0][0] for call in put.call_args_list]
+            self.assertNotIn("Place." + place.id, keys)
+            self.assertEqual([obj.id for score, obj in
+                              storage.text_search("canal")],
+                             [review.id, place.id])
+        finally:
+            FileStorage._FileStorage__text = saved
+        storage.delete(storage.get(Place, place.id))
+        storage.delete(storage.get(Review, review.id))
+        storage.save()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_text_index_journaled(self):
+        """Test a save appends the changed documents to the journal of the
+        text index instead of writing it again, until journal_limit, and
+        reload reads them back"""
+        storage = FileStorage()
+        storage.journal = False
+        storage.lazy = False
+        storage.journal_limit = 3
+        place = Place(name="Loft", description="Quiet loft")
+        storage.new(place)
+        storage.save()
+        with open("file.json.text", "r") as f:
+            written = f.read()
+        place.description = "Quiet loft by the xylophone"
+        storage.save()
+        storage.save()
+        with open("file.json.text", "r") as f:
+            self.assertEqual(f.read(), written)
+        with open("file.json.text.log", "r") as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual([record["key"] for record in records],
+                         ["Place." + place.id])
+        self.assertEqual(records[0]["terms"]["xylophone"], 1)
+        saved = FileStorage._FileStorage__text
+        FileStorage._FileStorage__text = file_storage.TextIndex()
+        try:
+            storage._FileStorage__stamp = None
+            with mock.patch.object(file_storage.TextIndex, "put") as put:
+                storage.reload()
+            keys = [call[0][0] for call in put.call_args_list]
+            self.assertNotIn("Place." + place.id, keys)
+            self.assertEqual([obj.id for score, obj in
+                              storage.text_search("xylophone")], [place.id])
+        finally:
+            FileStorage._FileStorage__text = saved
+        storage.get(Place, place.id).name = "Attic"
+        storage.save()
+        storage.delete(storage.get(Place, place.id))
+        storage.save()
+        self.assertFalse(os.path.exists("file.json.text.log"))
+        with open("file.json.text", "r") as f:
+            self.assertNotIn("Place." + place.id, json.load(f)["terms"])
+
+
+class TestFileStorageFilter(unittest.TestCase):
+    """Test the filter() method of the FileStorage class"""
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_filter_places(self):
+        """Test filter() follows new(), attribute updates and delete()"""
+        storage = FileStorage()
+        city = City()
+        cheap = Place(city_id=city.id, price_by_night=50, max_guest=2)
+        dear = Place(city_id=city.id, price_by_night=500, max_guest=6)
+        storage.new(cheap)
+        storage.new(dear)
+        self.assertCountEqual(storage.filter(Place, city_id=city.id),
+                              [cheap, dear])
+        self.assertEqual(storage.filter(Place, city_id=[city.id],
+                                        price_by_night__lte=100), [cheap])
+        dear.price_by_night = 80
+        self.assertCountEqual(storage.filter(Place, city_id=city.id,
+                                             price_by_night__lt=100),
+                              [cheap, dear])
+        self.assertEqual(storage.filter(Place, city_id=city.id,
+                                        max_guest__gte=4,
+                                        description=""), [dear])
+        storage.delete(cheap)
+        self.assertEqual(storage.filter("Place", city_id=city.id), [dear])
+        storage.delete(dear)
+
+
+class TestFileStorageCounts(unittest.TestCase):
+    """Test the counts() method of the FileStorage class"""
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_counts_every_class(self):
+        """Test counts() matches count() for every class"""
+        before = models.storage.count(State)
+        models.storage.new(State())
+        counts = models.storage.counts()
+        self.assertEqual(set(counts), set(classes))
+        for name, cls in classes.items():
+            self.assertEqual(counts[name], models.storage.count(cls))
+        self.assertEqual(counts["State"], before + 1)
+
+
+class TestFileStorageVersion(unittest.TestCase):
+    """Test the version() method of the FileStorage class"""
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_version_changes_on_writes(self):
+        """Test the tag of a class changes when one of its objects is added,
+        set or deleted, and only then"""
+        storage = models.storage
+        tags = [storage.version(State)[0]]
+        city = storage.version(City)
+        self.assertEqual(storage.version("State")[0], tags[0])
+        state = State(name="Ohio")
+        storage.new(state)
+        tags.append(storage.version(State)[0])
+        state.name = "Iowa"
+        tags.append(storage.version(State)[0])
+        storage.delete(state)
+        tags.append(storage.version(State)[0])
+        self.assertEqual(len(set(tags)), 4)
+        self.assertEqual(storage.version(City), city)
+        self.assertIsInstance(storage.version(State)[1], datetime)
+        self.assertGreaterEqual(storage.version(State)[1], city[1])
+
+
+class TestFileStoragePage(unittest.TestCase):
+    """Test the page() and stream() methods of the FileStorage class"""
+    def setUp(self):
+        """Swap in an empty storage, raw records included, with a few
+        amenities"""
+        self.saved = {name: getattr(FileStorage, "_FileStorage__" + name)
+                      for name in ("objects", "classes", "order", "raw",
+                                   "unindexed")}
+        for name in self.saved:
+            setattr(FileStorage, "_FileStorage__" + name, {})
+        self.storage = FileStorage()
+        self.storage.lazy = False
+        self.amenities = [Amenity(id="{:02d}".format(i)) for i in range(10)]
+        for amenity in reversed(self.amenities):
+            self.storage.new(amenity)
+
+    def tearDown(self):
+        """Restore the storage"""
+        for name, value in self.saved.items():
+            setattr(FileStorage, "_FileStorage__" + name, value)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_page_in_id_order(self):
+        """Test page() walks the objects by id after after_id"""
+        self.assertEqual(self.storage.page(Amenity, limit=3),
+                         self.amenities[:3])
+        self.assertEqual(self.storage.page("Amenity", "02", 3),
+                         self.amenities[3:6])
+        self.assertEqual(self.storage.page(Amenity, "08"),
+                         self.amenities[9:])
+        self.assertEqual(self.storage.page(Amenity, "09", 3), [])
+        self.assertEqual(self.storage.page(State), [])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_page_follows_changes(self):
+        """Test page() sees objects added and deleted since the last page"""
+        self.storage.page(Amenity)
+        self.storage.delete(self.amenities[3])
+        new = Amenity(id="035")
+        self.storage.new(new)
+        self.assertEqual(self.storage.page(Amenity, "02", 2),
+                         [new, self.amenities[4]])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_page_with_predicates(self):
+        """Test page() only walks the objects matching the predicates"""
+        cities = [City(id=str(i), state_id="S" if i % 2 else "T")
+                  for i in range(6)]
+        for city in cities:
+            self.storage.new(city)
+        self.assertEqual(self.storage.page(City, state_id="S"),
+                         cities[1::2])
+        self.assertEqual(self.storage.page(City, "1", 1, state_id="S"),
+                         [cities[3]])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_stream(self):
+        """Test stream() yields every object of a class in id order"""
+        self.assertEqual(list(self.storage.stream(Amenity, size=3)),
+                         self.amenities)
+        self.storage.new(State(id="00"))
+        self.assertEqual(len(list(self.storage.stream(size=4))), 11)
@@ -0,0 +1,117 @@
+#!/usr/bin/python3
+"""
+Contains the TestGeoDocs, TestGeo and TestGrid classes
+"""
+
+import inspect
+from models.engine import geo
+import pep8
+import random
+import unittest
+Grid = geo.Grid
+
+
+class TestGeoDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the geo module"""
+    def test_pep8_conformance_geo(self):
+        """Test that models/engine/geo.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/geo.py',
+                                    'tests/test_models/test_engine/\
+test_geo.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_geo_docstrings(self):
+        """Test for the docstrings of the module, its functions, Grid and
+        its methods"""
+        self.assertTrue(len(geo.__doc__) >= 1)
+        self.assertTrue(len(Grid.__doc__) >= 1)
+        for func in inspect.getmembers(geo, inspect.isfunction):
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} needs a docstring".format(func[0]))
+        for func in inspect.getmembers(Grid, inspect.isfunction):
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestGeo(unittest.TestCase):
+    """Test the functions of the geo module"""
+    def test_distance(self):
+        """Test the distance between Paris and London, and across the
+        antimeridian"""
+        self.assertAlmostEqual(geo.distance(48.8566, 2.3522,
+                                            51.5072, -0.1276), 344, delta=1)
+        self.assertAlmostEqual(geo.distance(0, 179.5, 0, -179.5),
+                               geo.degree_km, places=6)
+        self.assertEqual(geo.distance(10, 20, 10, 20), 0)
+
+    def test_circle_bounds(self):
+        """Test the box around a circle wraps and reaches the poles"""
+        south, west, north, east = geo.circle_bounds(0, 179.9, 111.2)
+        self.assertAlmostEqual(south, -1, places=2)
+        self.assertAlmostEqual(north, 1, places=2)
+        self.assertGreater(west, east)
+        self.assertEqual(geo.circle_bounds(89.5, 0, 200),
+                         (geo.circle_bounds(89.5, 0, 200)[0], -180.0,
+                          90.0, 180.0))
+
+    def test_in_bounds_and_coordinates(self):
+        """Test points in boxes and the points refused"""
+        self.assertTrue(geo.in_bounds(1, 2, 0, 0, 5, 5))
+        self.assertFalse(geo.in_bounds(1, 6, 0, 0, 5, 5))
+        self.assertTrue(geo.in_bounds(1, -179, 0, 179, 5, -178))
+        self.assertEqual(geo.coordinates("1.5", 2), (1.5, 2.0))
+        self.assertIsNone(geo.coordinates(None, 2))
+        self.assertIsNone(geo.coordinates(91, 2))
+
+
+class TestGrid(unittest.TestCase):
+    """Test the Grid class against a scan of every point"""
+    def setUp(self):
+        """Place 2000 random points, most of them around Paris"""
+        random.seed(1)
+        self.grid = Grid(0.1)
+        self.points = {}
+        for i in range(2000):
+            if i % 10:
+                point = (random.uniform(48, 50), random.uniform(1, 4))
+            else:
+                point = (random.uniform(-90, 90), random.uniform(-180, 180))
+            self.points[i] = point
+            self.grid.put(i, *point)
+
+    def scan(self, lat, lon):
+        """Returns every (distance, key), closest first"""
+        return sorted((geo.distance(lat, lon, *point), key)
+                      for key, point in self.points.items())
+
+    def test_nearest(self):
+        """Test nearest() finds the same points as a full scan"""
+        for lat, lon in [(48.9, 2.3), (0, 0), (-89, 170), (49.9, 3.99)]:
+            with self.subTest(lat=lat, lon=lon):
+                self.assertEqual(self.grid.nearest(lat, lon, 5),
+                                 self.scan(lat, lon)[:5])
+        within = [item for item in self.scan(48.9, 2.3) if item[0] <= 3]
+        self.assertEqual(self.grid.nearest(48.9, 2.3, 1000, 3), within)
+
+    def test_within(self):
+        """Test within() finds the points of the box"""
+        for box in [(48.5, 2, 49, 2.5), (48.55, 2.08, 48.95, 2.12),
+                    (-30, 170.05, 30, -170.05), (-30, 170, 30, -170),
+                    (-90, -180, 90, 180)]:
+            with self.subTest(box=box):
+                self.assertCountEqual(
+                    self.grid.within(*box),
+                    [key for key, point in self.points.items()
+                     if geo.in_bounds(*point + box)])
+
+    def test_put_moves_and_drop(self):
+        """Test put() moves a point and drop() removes it"""
+        self.grid.put(0, -45, -45)
+        self.assertEqual(self.grid.nearest(-45, -45, 1), [(0.0, 0)])
+        self.grid.put(0, None, None)
+        self.grid.drop(1)
+        self.grid.drop(1)
+        self.assertEqual(len(self.grid), 1998)
+        self.assertNotIn(0, self.grid.within(-46, -46, -44, -44))
@@ -0,0 +1,270 @@
+#!/usr/bin/python3
+"""
+Contains the TestPlaceSearchDocs, TestPlaceSearch and TestStorageSearch
+classes
+"""
+
+import inspect
+import models
+from models.amenity import Amenity
+from models.city import City
+from models.engine import search
+from models.place import Place
+from models.state import State
+from models.user import User
+import pep8
+import unittest
+PlaceSearch = search.PlaceSearch
+
+
+class TestPlaceSearchDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the search module"""
+    def test_pep8_conformance_search(self):
+        """Test that models/engine/search.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/search.py',
+                                    'tests/test_models/test_engine/\
+test_search.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_search_docstrings(self):
+        """Test for the docstrings of the module, PlaceSearch and its
+        methods"""
+        self.assertTrue(len(search.__doc__) >= 1)
+        self.assertTrue(len(PlaceSearch.__doc__) >= 1)
+        for func in inspect.getmembers(PlaceSearch, inspect.isfunction):
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestPlaceSearch(unittest.TestCase):
+    """Test the PlaceSearch class"""
+    def test_from_json(self):
+        """Test the lists of ids are read from the request body"""
+        found = PlaceSearch.from_json({"states": ["s"], "amenities": None})
+        self.assertEqual(found.states, ["s"])
+        self.assertEqual(found.cities, [])
+        self.assertEqual(found.amenities, [])
+        self.assertFalse(found.everywhere)
+        self.assertTrue(PlaceSearch.from_json({}).everywhere)
+
+    def test_from_json_rejects_non_lists(self):
+        """Test a key holding anything but a list of ids is refused"""
+        for data in [{"states": "s"}, {"cities": [1]}, {"amenities": {}}]:
+            with self.subTest(data=data):
+                with self.assertRaises(ValueError):
+                    PlaceSearch.from_json(data)
+
+    def test_from_json_area(self):
+        """Test the bbox and the circle are read and checked"""
+        found = PlaceSearch.from_json({"bbox": [1, 2, 3, 4],
+                                       "near": [5, 6], "radius_km": 7})
+        self.assertEqual(found.bbox, (1.0, 2.0, 3.0, 4.0))
+        self.assertEqual(found.near, (5.0, 6.0))
+        self.assertEqual(found.radius_km, 7.0)
+        self.assertTrue(found.located)
+        self.assertFalse(PlaceSearch.from_json({}).located)
+        for data in [{"bbox": [1, 2, 3]}, {"bbox": [3, 2, 1, 4]},
+                     {"bbox": [91, 0, 92, 1]}, {"near": [1, 2]},
+                     {"radius_km": 5}, {"near": [1, 2], "radius_km": -1},
+                     {"near": [1, "x"], "radius_km": 5}]:
+            with self.subTest(data=data):
+                with self.assertRaises(ValueError):
+                    PlaceSearch.from_json(data)
+
+    def test_from_json_ranges_and_sort(self):
+        """Test the bounds are gathered by attribute and sort is read"""
+        found = PlaceSearch.from_json({"min_price": 10, "max_price": 90.5,
+                                       "min_guests": 2, "sort": "-price"})
+        self.assertEqual(found.ranges, {"price_by_night": (10, 90.5),
+                                        "max_guest": (2, None)})
+        self.assertEqual(found.sort, "price_by_night")
+        self.assertTrue(found.descending)
+        found = PlaceSearch.from_json({"sort": "rooms"})
+        self.assertEqual(found.sort, "number_rooms")
+        self.assertFalse(found.descending)
+        self.assertEqual(PlaceSearch.from_json({}).ranges, {})
+        for data in [{"min_price": "10"}, {"max_rooms": True},
+                     {"sort": "name"}, {"sort": ["price"]}]:
+            with self.subTest(data=data):
+                with self.assertRaises(ValueError):
+                    PlaceSearch.from_json(data)
+
+    def test_contains(self):
+        """Test a point must be in the bbox and in the circle"""
+        found = PlaceSearch(bbox=(48, 2, 49, 3), near=(48.85, 2.35),
+                            radius_km=10)
+        self.assertTrue(found.contains(48.86, 2.36))
+        self.assertFalse(found.contains(48.5, 2.9))
+        self.assertFalse(found.contains(47, 2.36))
+        self.assertFalse(found.contains(None, None))
+
+
+class TestStorageSearch(unittest.TestCase):
+    """Test the search() and nearest() methods of the storage in use"""
+    # (latitude, longitude) of the places: Paris, Versailles, London and
+    # Suva, next to the antimeridian
+    points = [(48.8566, 2.3522), (48.8049, 2.1204), (51.5072, -0.1276),
+              (-18.1416, 178.4415)]
+    # (price_by_night, max_guest) of the places
+    numbers = [(100, 2), (50, 4), (200, 6), (50, 1)]
+
+    def setUp(self):
+        """Store 2 states, 3 cities, 4 places and 2 amenities"""
+        storage = models.storage
+        self.objs = []
+        user = self.store(User(email="a@b.c", password="pwd"))
+        self.states = [self.store(State(name=str(i))) for i in range(2)]
+        self.cities = [self.store(City(name=str(i), state_id=state.id))
+                       for i, state in enumerate(self.states * 2)][:3]
+        self.places = [self.store(Place(name=str(i), user_id=user.id,
+                                        city_id=self.cities[i % 3].id,
+                                        latitude=self.points[i][0],
+                                        longitude=self.points[i][1],
+                                        price_by_night=self.numbers[i][0],
+                                        max_guest=self.numbers[i][1]))
+                       for i in range(4)]
+        self.wifi = self.store(Amenity(name="wifi"))
+        self.pool = self.store(Amenity(name="pool"))
+        for place, amenities in zip(self.places, [[self.wifi, self.pool],
+                                                  [self.wifi], [],
+                                                  [self.pool]]):
+            if models.storage_t == 'db':
+                place.amenities.extend(amenities)
+            else:
+                place.amenity_ids = [amenity.id for amenity in amenities]
+        storage.save()
+
+    def tearDown(self):
+        """Delete the stored objects"""
+        for obj in reversed(self.objs):
+            models.storage.delete(obj)
+        models.storage.save()
+
+    def store(self, obj):
+        """Adds obj to the storage and returns it"""
+        models.storage.new(obj)
+        self.objs.append(obj)
+        return obj
+
+    def search(self, after_id=None, limit=None, **criteria):
+        """Returns the names of the places of the search, keeping only the
+        places of setUp"""
+        found = models.storage.search(PlaceSearch(**criteria),
+                                      after_id, limit)
+        return [place.name for place in found if place in self.places]
+
+    def test_states_and_cities(self):
+        """Test the places of the cities of states, and of cities"""
+        self.assertCountEqual(self.search(states=[self.states[0].id]),
+                              ["0", "2", "3"])
+        self.assertCountEqual(self.search(cities=[self.cities[1].id]),
+                              ["1"])
+        self.assertCountEqual(self.search(states=[self.states[1].id],
+                                          cities=[self.cities[0].id]),
+                              ["0", "1", "3"])
+        self.assertEqual(self.search(states=["nowhere"]), [])
+
+    def test_amenities(self):
+        """Test only the places with every amenity are kept"""
+        self.assertCountEqual(self.search(amenities=[self.wifi.id]),
+                              ["0", "1"])
+        self.assertCountEqual(self.search(amenities=[self.wifi.id,
+                                                     self.pool.id]),
+                              ["0"])
+        self.assertCountEqual(self.search(states=[self.states[0].id],
+                                          amenities=[self.pool.id]),
+                              ["0", "3"])
+        self.assertEqual(self.search(amenities=[self.wifi.id, "none"]), [])
+
+    def test_everywhere_in_id_order(self):
+        """Test an empty search is every place, in id order and by page"""
+        found = models.storage.search(PlaceSearch())
+        ids = [place.id for place in found]
+        self.assertEqual(ids, sorted(ids))
+        self.assertTrue(all(place in found for place in self.places))
+        state = PlaceSearch(states=[self.states[0].id])
+        mine = [place.id for place in models.storage.search(state)]
+        self.assertEqual(len(mine), 3)
+        after = models.storage.search(state, mine[0], 1)
+        self.assertEqual([place.id for place in after], mine[1:2])
+
+    def test_bbox(self):
+        """Test only the places in the box are kept, also across the
+        antimeridian"""
+        self.assertCountEqual(self.search(bbox=(48, 2, 49, 3)), ["0", "1"])
+        self.assertCountEqual(self.search(bbox=(48, -1, 52, 2.2)),
+                              ["1", "2"])
+        self.assertEqual(self.search(bbox=(-20, 178, -17, -179)), ["3"])
+        self.assertCountEqual(self.search(bbox=(40, -5, 60, 5),
+                                          states=[self.states[0].id]),
+                              ["0", "2"])
+
+    def test_near(self):
+        """Test only the places within radius_km of near are kept"""
+        paris = self.points[0]
+        self.assertEqual(self.search(near=paris, radius_km=5), ["0"])
+        self.assertCountEqual(self.search(near=paris, radius_km=20),
+                              ["0", "1"])
+        self.assertCountEqual(self.search(near=paris, radius_km=400),
+                              ["0", "1", "2"])
+        self.assertEqual(self.search(near=paris, radius_km=400,
+                                     amenities=[self.pool.id]), ["0"])
+
+    def test_nearest(self):
+        """Test nearest() returns the closest places first, with their
+        distance"""
+        found = [(d, place) for d, place in
+                 models.storage.nearest(48.85, 2.35, 3, radius_km=1000)
+                 if place in self.places]
+        self.assertEqual([place.name for d, place in found], ["0", "1", "2"])
+        self.assertLess(found[0][0], 1)
+        self.assertAlmostEqual(found[2][0], 344, delta=2)
+        suva = models.storage.nearest(-18, -179.9, 1)
+        self.assertEqual(suva[0][1], self.places[3])
+        self.assertEqual(models.storage.nearest(-60, -120, 5, 100), [])
+
+    def test_unlocated(self):
+        """Test a place never given coordinates is in no area, until it is
+        located"""
+        place = self.store(Place(name="4", city_id=self.cities[0].id,
+                                 user_id=self.places[0].user_id))
+        self.places.append(place)
+        models.storage.save()
+        self.assertEqual(self.search(bbox=(-1, -1, 1, 1)), [])
+        self.assertNotIn(place, [found for d, found in
+                                 models.storage.nearest(0, 0, 1, 100)])
+        place.latitude = 0.5
+        place.longitude = 0.5
+        place.save()
+        self.assertEqual(self.search(bbox=(-1, -1, 1, 1)), ["4"])
+
+    def test_ranges(self):
+        """Test only the places within every range are kept"""
+        self.assertCountEqual(
+            self.search(ranges={"price_by_night": (None, 100)}),
+            ["0", "1", "3"])
+        self.assertCountEqual(
+            self.search(ranges={"price_by_night": (50, 100),
+                                "max_guest": (2, None)}), ["0", "1"])
+        self.assertCountEqual(
+            self.search(ranges={"price_by_night": (None, 100)},
+                        states=[self.states[0].id],
+                        amenities=[self.pool.id]), ["0", "3"])
+        self.assertEqual(self.search(ranges={"max_guest": (7, 5)}), [])
+
+    def test_sort(self):
+        """Test the places come by value then id, or in reverse, and page
+        after the place of the cursor"""
+        by_price = sorted(self.places,
+                          key=lambda place: (place.price_by_night, place.id))
+        self.assertEqual(self.search(sort="price_by_night"),
+                         [place.name for place in by_price])
+        state = {"states": [self.states[0].id], "sort": "price_by_night",
+                 "descending": True}
+        self.assertEqual(self.search(**state), ["2", "0", "3"])
+        self.assertEqual(self.search(self.places[2].id, 1, **state), ["0"])
+        self.assertEqual(self.search(self.places[0].id, 5, **state), ["3"])
+        self.assertEqual(self.search(self.places[3].id, 5, **state), [])
+        self.assertEqual(self.search("nowhere", **state), [])
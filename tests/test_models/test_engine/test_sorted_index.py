@@ -0,0 +1,104 @@
+#!/usr/bin/python3
+"""
+Contains the TestSortedIndexDocs and TestSortedIndex classes
+"""
+
+import inspect
+from models.engine import sorted_index
+import pep8
+import unittest
+SortedIndex = sorted_index.SortedIndex
+
+
+class TestSortedIndexDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the sorted_index
+    module"""
+    def test_pep8_conformance_sorted_index(self):
+        """Test that models/engine/sorted_index.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/sorted_index.py',
+                                    'tests/test_models/test_engine/\
+test_sorted_index.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_sorted_index_docstrings(self):
+        """Test for the docstrings of the module, SortedIndex and its
+        methods"""
+        self.assertTrue(len(sorted_index.__doc__) >= 1)
+        self.assertTrue(len(SortedIndex.__doc__) >= 1)
+        for func in inspect.getmembers(SortedIndex, inspect.isfunction):
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestSortedIndex(unittest.TestCase):
+    """Test the SortedIndex class"""
+    def setUp(self):
+        """Index 20 places, place i priced 10 * (i % 5)"""
+        self.index = SortedIndex()
+        for i in reversed(range(20)):
+            self.index.put("Place.{:02d}".format(i), 10 * (i % 5))
+
+    def test_range(self):
+        """Test range() returns the keys of the values, in (value, key)
+        order"""
+        self.assertEqual(self.index.range(10, 10),
+                         ["Place.01", "Place.06", "Place.11", "Place.16"])
+        self.assertEqual(len(self.index.range(15, None)), 12)
+        self.assertEqual(len(self.index.range(None, 15)), 8)
+        self.assertEqual(self.index.range(41, None), [])
+        self.assertEqual(self.index.range(), sorted(
+            self.index.keys, key=lambda key: (self.index.of[key], key)))
+
+    def test_range_within(self):
+        """Test range() only returns keys of within, whether it is smaller
+        or larger than the range"""
+        small = {"Place.04", "Place.05", "Place.nope"}
+        self.assertEqual(self.index.range(30, 40, small), ["Place.04"])
+        large = {"Place.{:02d}".format(i) for i in range(10)}
+        self.assertCountEqual(self.index.range(None, 0, large),
+                              ["Place.00", "Place.05"])
+
+    def test_walk(self):
+        """Test walk() goes on after a key, in both orders"""
+        self.assertEqual(list(self.index.walk())[:2],
+                         ["Place.00", "Place.05"])
+        self.assertEqual(list(self.index.walk("Place.15"))[:2],
+                         ["Place.01", "Place.06"])
+        self.assertEqual(list(self.index.walk("Place.01", True))[:2],
+                         ["Place.15", "Place.10"])
+        self.assertEqual(list(self.index.walk("Place.nope")), [])
+
+    def test_put_moves_and_drop(self):
+        """Test put() moves a key, drop() removes it and values that are
+        not numbers are left out"""
+        self.index.put("Place.00", 25)
+        self.assertEqual(self.index.range(20, 30)[:3],
+                         ["Place.02", "Place.07", "Place.12"])
+        self.assertIn("Place.00", self.index.range(25, 25))
+        self.index.drop("Place.00")
+        self.index.drop("Place.00")
+        self.index.put("Place.01", None)
+        self.index.put("Place.02", "x")
+        self.assertEqual(len(self.index), 17)
+        self.assertEqual(self.index.values, sorted(self.index.values))
+
+    def test_build(self):
+        """Test build() indexes pairs as put() does, in place of the old
+        values, and drops the keys whose value is not a number"""
+        index = SortedIndex()
+        index.build(("Place.{:02d}".format(i), 10 * (i % 5))
+                    for i in range(20))
+        self.assertEqual(index.keys, self.index.keys)
+        self.assertEqual(index.values, self.index.values)
+        self.assertEqual(index.of, self.index.of)
+        index.build([("Place.00", 25), ("Place.01", None),
+                     ("Place.02", float("nan")), ("Place.20", "35")])
+        self.index.put("Place.00", 25)
+        self.index.drop("Place.01")
+        self.index.drop("Place.02")
+        self.index.put("Place.20", "35")
+        self.assertEqual(index.keys, self.index.keys)
+        self.assertEqual(index.values, self.index.values)
+        self.assertEqual(len(index), 19)
@@ -0,0 +1,151 @@
+#!/usr/bin/python3
+"""
+Contains the TestTextIndexDocs, TestTextIndex and TestStorageTextSearch
+classes
+"""
+
+import inspect
+import json
+import models
+from models.engine import text_index
+from models.place import Place
+from models.review import Review
+from models.user import User
+import pep8
+import unittest
+TextIndex = text_index.TextIndex
+
+
+class TestTextIndexDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the text_index
+    module"""
+    def test_pep8_conformance_text_index(self):
+        """Test that models/engine/text_index.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/text_index.py',
+                                    'tests/test_models/test_engine/\
+test_text_index.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_text_index_docstrings(self):
+        """Test for the docstrings of the module, TextIndex and its
+        methods"""
+        self.assertTrue(len(text_index.__doc__) >= 1)
+        self.assertTrue(len(TextIndex.__doc__) >= 1)
+        self.assertTrue(len(text_index.tokenize.__doc__) >= 1)
+        for func in inspect.getmembers(TextIndex, inspect.isfunction):
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestTextIndex(unittest.TestCase):
+    """Test the TextIndex class"""
+    def setUp(self):
+        """Index 4 short documents"""
+        self.index = TextIndex()
+        self.index.put("a", "Sunny flat, sunny terrace")
+        self.index.put("b", "Sunny room near the station")
+        self.index.put("c", "Quiet room with a garden")
+        self.index.put("d", "")
+
+    def test_tokenize(self):
+        """Test the words are lowercase runs of letters and digits"""
+        self.assertEqual(text_index.tokenize("Café, 2 rooms_ok!"),
+                         ["café", "2", "rooms", "ok"])
+        self.assertEqual(text_index.tokenize(None), [])
+
+    def test_search(self):
+        """Test the documents are ranked by BM25, best first"""
+        self.assertEqual([key for score, key in
+                          self.index.search("sunny")], ["a", "b"])
+        self.assertEqual([key for score, key in
+                          self.index.search("ROOM garden")], ["c", "b"])
+        self.assertEqual(self.index.search("sunny garden", 1)[0][1], "c")
+        self.assertEqual(self.index.search("nothing"), [])
+        self.assertEqual(len(self.index), 3)
+
+    def test_put_replaces_and_drop(self):
+        """Test put() replaces a document and drop() removes it"""
+        self.index.put("a", "garden")
+        self.assertEqual(self.index.search("terrace"), [])
+        self.index.drop("c")
+        self.index.drop("c")
+        self.assertEqual([key for score, key in
+                          self.index.search("garden")], ["a"])
+        self.assertNotIn("quiet", self.index.postings)
+        self.assertEqual(self.index.total, 1 + 5)
+
+    def test_dumps_and_load(self):
+        """Test an index loaded from dumps() ranks the same way"""
+        loaded = TextIndex()
+        for key, terms in json.loads(self.index.dumps()).items():
+            loaded.load(key, terms)
+        self.assertEqual(loaded.search("sunny room"),
+                         self.index.search("sunny room"))
+        self.index.changed = False
+        self.index.put("e", "new")
+        self.assertTrue(self.index.changed)
+
+    def test_changes_and_encode(self):
+        """Test changes holds the keys put or dropped, and encode() their
+        documents, null once dropped"""
+        self.assertEqual(self.index.changes, {"a", "b", "c"})
+        self.index.changes.clear()
+        self.index.put("a", "garden")
+        self.index.drop("b")
+        self.index.drop("z")
+        self.assertEqual(self.index.changes, {"a", "b"})
+        self.assertEqual(json.loads(self.index.encode("a")), {"garden": 1})
+        self.assertEqual(self.index.encode("b"), "null")
+
+
+class TestStorageTextSearch(unittest.TestCase):
+    """Test the text_search() method of the storage in use"""
+    def setUp(self):
+        """Store a place and 2 reviews of rare words"""
+        storage = models.storage
+        self.user = User(email="a@b.c", password="pwd")
+        self.place = Place(name="Xylocabin", user_id=self.user.id,
+                           city_id="c", description="Zorbly lake shore")
+        self.reviews = [Review(text=text, user_id=self.user.id,
+                               place_id=self.place.id)
+                        for text in ("Zorbly zorbly xylocabin",
+                                     "Plain stay")]
+        if models.storage_t == 'db':
+            from models.city import City
+            from models.state import State
+            state = State(name="S")
+            self.city = City(name="C", state_id=state.id)
+            self.place.city_id = self.city.id
+            self.objs = [state, self.city]
+        else:
+            self.objs = []
+        self.objs += [self.user, self.place] + self.reviews
+        for obj in self.objs:
+            storage.new(obj)
+        storage.save()
+
+    def tearDown(self):
+        """Delete the stored objects"""
+        for obj in reversed(self.objs):
+            models.storage.delete(obj)
+        models.storage.save()
+
+    def test_text_search(self):
+        """Test places and reviews are ranked together, best first"""
+        found = models.storage.text_search("zorbly xylocabin")
+        self.assertEqual([obj for score, obj in found],
+                         [self.reviews[0], self.place])
+        self.assertGreater(found[0][0], found[1][0])
+        self.assertEqual(len(models.storage.text_search("zorbly", 1)), 1)
+        self.assertEqual(models.storage.text_search("unheardofword"), [])
+        self.assertEqual(models.storage.text_search("  "), [])
+
+    def test_text_search_follows_changes(self):
+        """Test a changed text is searched by its new words"""
+        self.reviews[1].text = "Quixotry"
+        self.reviews[1].save()
+        found = models.storage.text_search("quixotry")
+        self.assertEqual([obj for score, obj in found], [self.reviews[1]])
+        self.assertEqual(models.storage.text_search("plain stay"), [])